@@ -0,0 +1,87 @@
+"""Add full-text search index on equipment
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexed columns as of this revision (MySQL allows at most 16)
+SEARCH_FIELDS = (
+    'equipment_id',
+    'serial_number',
+    'equipment_name',
+    'model',
+    'manufacturer',
+    'location',
+    'primary_user',
+    'cpu_model',
+    'operating_system',
+    'ram',
+    'storage',
+    'video_card',
+    'mac_address',
+    'ip_address',
+    'notes',
+)
+
+COLUMNS = ', '.join(SEARCH_FIELDS)
+NEW_VALUES = ', '.join(f'new.{field}' for field in SEARCH_FIELDS)
+OLD_VALUES = ', '.join(f'old.{field}' for field in SEARCH_FIELDS)
+
+# SQLite: an FTS5 external-content table kept in sync by triggers
+INSERT_NEW = f"INSERT INTO equipment_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});"
+DELETE_OLD = (
+    f"INSERT INTO equipment_fts(equipment_fts, rowid, {COLUMNS}) "
+    f"VALUES ('delete', old.id, {OLD_VALUES});"
+)
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS equipment_fts USING fts5("
+    f"{COLUMNS}, content='equipment', content_rowid='id')",
+    f"CREATE TRIGGER IF NOT EXISTS equipment_fts_ai AFTER INSERT ON equipment "
+    f"BEGIN {INSERT_NEW} END",
+    f"CREATE TRIGGER IF NOT EXISTS equipment_fts_ad AFTER DELETE ON equipment "
+    f"BEGIN {DELETE_OLD} END",
+    f"CREATE TRIGGER IF NOT EXISTS equipment_fts_au AFTER UPDATE OF {COLUMNS} ON equipment "
+    f"BEGIN {DELETE_OLD} {INSERT_NEW} END",
+)
+
+
+def upgrade() -> None:
+    """Create the FTS5 table (SQLite) or FULLTEXT index (MySQL)."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        exists = bind.execute(sa.text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'equipment_fts'"
+        )).first()
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        if not exists:
+            op.execute("INSERT INTO equipment_fts(equipment_fts) VALUES ('rebuild')")
+    elif bind.dialect.name == 'mysql':
+        op.create_index(
+            'ft_equipment_search', 'equipment', list(SEARCH_FIELDS),
+            mysql_prefix='FULLTEXT',
+        )
+
+
+def downgrade() -> None:
+    """Drop the full-text search index."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for suffix in ('ai', 'ad', 'au'):
+            op.execute(f"DROP TRIGGER IF EXISTS equipment_fts_{suffix}")
+        op.execute("DROP TABLE IF EXISTS equipment_fts")
+    elif bind.dialect.name == 'mysql':
+        op.drop_index('ft_equipment_search', table_name='equipment')
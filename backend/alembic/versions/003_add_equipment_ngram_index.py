@@ -0,0 +1,83 @@
+"""Add n-gram side index for substring filters
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexed fields and n-gram size as of this revision
+NGRAM_FIELDS = ('location', 'primary_user', 'model')
+NGRAM_SIZE = 3
+
+# Distinct values indexed per INSERT
+BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Create the equipment_ngram table, index it and add the model index."""
+    op.create_table(
+        'equipment_ngram',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('field', sa.String(20), nullable=False),
+        sa.Column('gram', sa.String(3), nullable=False),
+        sa.Column('value', sa.String(200), nullable=False),
+    )
+    op.create_index('ix_equipment_ngram_gram', 'equipment_ngram', ['field', 'gram', 'value'])
+    op.create_index('ix_equipment_ngram_value', 'equipment_ngram', ['field', 'value'])
+
+    with op.batch_alter_table('equipment', schema=None) as batch_op:
+        batch_op.create_index('ix_equipment_model', ['model', 'is_deleted'])
+
+    _backfill(op.get_bind())
+
+
+def downgrade() -> None:
+    """Drop the equipment_ngram table and the model index."""
+    with op.batch_alter_table('equipment', schema=None) as batch_op:
+        batch_op.drop_index('ix_equipment_model')
+
+    op.drop_index('ix_equipment_ngram_value', table_name='equipment_ngram')
+    op.drop_index('ix_equipment_ngram_gram', table_name='equipment_ngram')
+    op.drop_table('equipment_ngram')
+
+
+def _backfill(bind) -> None:
+    """Index the n-grams of the distinct non-empty values of each field."""
+    equipment = sa.table('equipment', *(sa.column(field) for field in NGRAM_FIELDS))
+    ngram = sa.table(
+        'equipment_ngram', sa.column('field'), sa.column('gram'), sa.column('value'),
+    )
+    for field in NGRAM_FIELDS:
+        column = equipment.c[field]
+        values = [
+            row[0] for row in bind.execute(
+                sa.select(column).where(column.isnot(None)).distinct()
+            )
+            if row[0]
+        ]
+        for offset in range(0, len(values), BATCH_SIZE):
+            rows = [
+                {'field': field, 'gram': gram, 'value': value}
+                for value in values[offset:offset + BATCH_SIZE]
+                for gram in _ngrams(value)
+            ]
+            if rows:
+                bind.execute(ngram.insert(), rows)
+
+
+def _ngrams(value: str) -> set:
+    """Get the distinct lowercase n-grams of a string."""
+    value = value.lower()
+    return {value[i:i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}
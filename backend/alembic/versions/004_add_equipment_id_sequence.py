@@ -0,0 +1,42 @@
+"""Add per-type equipment ID sequence table
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create equipment_id_sequence seeded from the highest existing IDs."""
+    op.create_table(
+        'equipment_id_sequence',
+        sa.Column(
+            'equipment_type',
+            sa.Enum('PC', 'MONITOR', 'SCANNER', 'PRINTER', name='equipmenttype'),
+            primary_key=True,
+        ),
+        sa.Column('last_value', sa.Integer(), nullable=False),
+    )
+
+    op.execute(
+        "INSERT INTO equipment_id_sequence (equipment_type, last_value) "
+        "SELECT equipment_type, MAX(equipment_id_num) FROM equipment "
+        "GROUP BY equipment_type"
+    )
+
+
+def downgrade() -> None:
+    """Drop the equipment_id_sequence table."""
+    op.drop_table('equipment_id_sequence')
@@ -0,0 +1,32 @@
+"""Add change generation counters
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the change_generation table."""
+    op.create_table(
+        'change_generation',
+        sa.Column('name', sa.String(50), primary_key=True),
+        sa.Column('value', sa.BigInteger(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Drop the change_generation table."""
+    op.drop_table('change_generation')
@@ -0,0 +1,95 @@
+"""Add fleet summary table
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Summary dimensions as of this revision: the enum columns store member
+# names, while the summary stores their values; location is a plain string
+SUMMARY_ENUMS = {
+    'status': {
+        'ACTIVE': 'Active',
+        'INACTIVE': 'Inactive',
+        'DECOMMISSIONED': 'Decommissioned',
+        'IN_REPAIR': 'In Repair',
+        'IN_STORAGE': 'In Storage',
+    },
+    'equipment_type': {
+        'PC': 'PC',
+        'MONITOR': 'Monitor',
+        'SCANNER': 'Scanner',
+        'PRINTER': 'Printer',
+    },
+    'location': None,
+    'usage_type': {
+        'PERSONAL': 'Personal',
+        'WORK': 'Work',
+    },
+}
+
+
+def upgrade() -> None:
+    """Create the equipment_summary table and fill it from equipment."""
+    op.create_table(
+        'equipment_summary',
+        sa.Column('dimension', sa.String(20), primary_key=True),
+        sa.Column('value', sa.String(200), primary_key=True),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.Column('total_cost', sa.Numeric(16, 2), nullable=False),
+    )
+
+    _backfill()
+
+
+def downgrade() -> None:
+    """Drop the equipment_summary table."""
+    op.drop_table('equipment_summary')
+
+
+def _backfill() -> None:
+    """Summarize the non-deleted equipment: the whole fleet, then each dimension.
+
+    NULL values are grouped as ''.
+    """
+    equipment = sa.table(
+        'equipment', sa.column('is_deleted'), sa.column('cost'),
+        *(sa.column(dimension) for dimension in SUMMARY_ENUMS),
+    )
+    summary = sa.table(
+        'equipment_summary',
+        sa.column('dimension'), sa.column('value'), sa.column('count'), sa.column('total_cost'),
+    )
+    totals = (sa.func.count(), sa.func.coalesce(sa.func.sum(equipment.c.cost), 0))
+    live = equipment.c.is_deleted == sa.false()
+
+    groups = [
+        sa.select(sa.literal('fleet'), sa.literal(''), *totals)
+        .where(live).having(sa.func.count() > 0)
+    ]
+    for dimension, names in SUMMARY_ENUMS.items():
+        column = equipment.c[dimension]
+        if names is None:
+            value = sa.func.coalesce(column, '')
+        else:
+            value = sa.case(names, value=column, else_='')
+        groups.append(
+            sa.select(sa.literal(dimension), value, *totals).where(live).group_by(value)
+        )
+
+    for group in groups:
+        op.execute(summary.insert().from_select(
+            ['dimension', 'value', 'count', 'total_cost'], group,
+        ))
@@ -0,0 +1,31 @@
+"""Add per-user assignment interval index
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Index assignment history by previous user and interval."""
+    op.create_index(
+        'ix_history_user_interval',
+        'assignment_history',
+        ['previous_user', 'end_date', 'start_date'],
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-user assignment interval index."""
+    op.drop_index('ix_history_user_interval', table_name='assignment_history')
@@ -0,0 +1,38 @@
+"""Add equipment change sequence for the changes feed
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add equipment.change_seq and index the feed order.
+
+    Existing rows start at 0, below every generation handed out from now
+    on, so the feed lists them first.
+    """
+    with op.batch_alter_table('equipment') as batch_op:
+        batch_op.add_column(
+            sa.Column('change_seq', sa.BigInteger(), nullable=False, server_default='0')
+        )
+        batch_op.create_index('ix_equipment_change_seq', ['change_seq', 'id'])
+
+
+def downgrade() -> None:
+    """Drop equipment.change_seq and its index."""
+    with op.batch_alter_table('equipment') as batch_op:
+        batch_op.drop_index('ix_equipment_change_seq')
+        batch_op.drop_column('change_seq')
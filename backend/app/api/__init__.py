@@ -3,6 +3,8 @@
 from fastapi import APIRouter
 
 from .computers import router as computers_router
+from .users import router as users_router
 
 router = APIRouter()
 router.include_router(computers_router, tags=["Computers"])
+router.include_router(users_router, tags=["Users"])
@@ -1,72 +1,407 @@
 """API routes for computer/equipment inventory management."""
 
+from datetime import date
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query, Request, Response, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..database import get_db
+from ..database import get_async_db
+from ..instrumentation import InstrumentedRoute
+from ..routing_session import read_from_replica
 from ..models import EquipmentType, Status, UsageType
 from ..schemas import (
     EquipmentCreate,
     EquipmentUpdate,
     EquipmentListItem,
     EquipmentResponse,
+    EquipmentChanges,
     AssignmentHistoryItem,
+    AssignmentPeriod,
     ImportResult,
+    ImportJobStatus,
+    BulkUpdateItem,
+    BulkIdentifiers,
+    BulkResult,
+    HistoryBatchRequest,
+    HistoryBatchResult,
+    FleetStats,
+    BULK_MAX_ITEMS,
+    LIST_BASE_FIELDS,
+    LIST_VIEW_FIELDS,
 )
-from ..services.equipment_service import EquipmentService
-from ..services.csv_service import CSVService
+from ..services.assignment_service import AsyncAssignmentService
+from ..services.equipment_service import AsyncEquipmentService
+from ..services.change_stream import StreamFullError, change_stream
+from ..services.csv_service import AsyncCSVService, EXPORT_CHUNK_ROWS
+from ..services.export_formats import (
+    ExportFormatError,
+    check_export,
+    compress_stream,
+    export_filename,
+    export_media_type,
+    stream_arrow,
+    stream_ndjson,
+    stream_parquet,
+)
+from ..services.import_jobs import FAILED, ImportJob, TooManyJobsError, import_jobs
+from ..services.pagination import InvalidCursorError, MAX_PAGE_SIZE
+from ..services.generation import get_generation
+from ..services.result_cache import list_cache
+from ..services.search_service import AsyncSearchService
+from .etag import conditional_response
+from .negotiation import list_responses, negotiate, negotiated_response
+from .serialization import LIST_FIELDS, dump_list_rows
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+# Related data the list endpoint can embed in each item
+LIST_INCLUDES = ("history",)
+
+# Seconds a client is asked to wait before retrying an import the database was too busy for
+IMPORT_RETRY_AFTER = "5"
+
+
+def _resolve_list_fields(fields: Optional[str], view: Optional[str]) -> Optional[List[str]]:
+    """Resolve the fields=/view= list parameters into the columns to load.
 
-router = APIRouter()
+    Returns None (all fields) when neither parameter is given. Both take
+    comma-separated values; the always-visible fields are always included.
+    """
+    if fields is None and view is None:
+        return None
 
+    selected = list(LIST_BASE_FIELDS)
+    for group in filter(None, (view or "").split(",")):
+        if group not in LIST_VIEW_FIELDS:
+            raise HTTPException(status_code=400, detail=f"Unknown view '{group}'")
+        selected += LIST_VIEW_FIELDS[group]
+    for field in filter(None, (fields or "").split(",")):
+        if field not in EquipmentListItem.model_fields:
+            raise HTTPException(status_code=400, detail=f"Unknown field '{field}'")
+        selected.append(field)
 
-# Export to CSV - MUST be before {serial_number} routes to avoid path collision
+    return list(dict.fromkeys(selected))
+
+
+def _resolve_list_includes(include: Optional[str]) -> bool:
+    """Resolve the include= list parameter; returns whether history is included."""
+    includes = list(filter(None, (include or "").split(",")))
+    for name in includes:
+        if name not in LIST_INCLUDES:
+            raise HTTPException(status_code=400, detail=f"Unknown include '{name}'")
+    return "history" in includes
+
+
+# Export - MUST be before {serial_number} routes to avoid path collision
 @router.get("/computers/export")
-def export_computers(
+async def export_computers(
     include_deleted: bool = False,
-    db: Session = Depends(get_db),
+    format: str = Query("csv", description="csv, ndjson, arrow (Arrow IPC stream) or parquet"),
+    compression: Optional[str] = Query(None, description="gzip or zstd"),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Export all equipment to CSV file."""
-    service = EquipmentService(db)
-    csv_service = CSVService(db)
+    """Export all equipment to a file.
+
+    Rows are read from the database in chunks and written to the response
+    as they are encoded, so the file is never held in memory. CSV and
+    NDJSON are compressed as a whole; Arrow and Parquet compress inside the
+    file. Returns 400 for a format or compression that is unknown or not
+    installed (arrow and parquet need pyarrow, zstd on CSV/NDJSON needs
+    zstandard).
+    """
+    try:
+        check_export(format, compression)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
-    equipment_list = service.get_all(include_deleted=include_deleted)
-    csv_content = csv_service.export_to_csv(equipment_list)
+    service = AsyncEquipmentService(db)
+    equipment_chunks = service.iter_chunks(
+        chunk_size=EXPORT_CHUNK_ROWS,
+        include_deleted=include_deleted,
+    )
 
-    from datetime import date
-    filename = f"equipment_export_{date.today().isoformat()}.csv"
+    if format == "arrow":
+        content = stream_arrow(equipment_chunks, compression)
+    elif format == "parquet":
+        content = stream_parquet(equipment_chunks, compression)
+    else:
+        if format == "ndjson":
+            content = stream_ndjson(equipment_chunks)
+        else:
+            content = AsyncCSVService(db).stream_csv(equipment_chunks)
+        content = compress_stream(content, compression)
+
+    filename = export_filename(f"equipment_export_{date.today().isoformat()}", format, compression)
 
     return StreamingResponse(
-        iter([csv_content]),
-        media_type="text/csv",
+        content,
+        media_type=export_media_type(format, compression),
         headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
 
 # Import from CSV - MUST be before {serial_number} routes to avoid path collision
 @router.post("/computers/import", response_model=ImportResult)
-async def import_computers(
-    file: UploadFile = File(...),
-    db: Session = Depends(get_db),
-):
-    """Import equipment records from CSV file."""
+async def import_computers(file: UploadFile = File(...)):
+    """Import equipment records from CSV file.
+
+    Runs as an import job (see POST /computers/import/jobs) and waits for
+    it; large files are better submitted as jobs directly, as this request
+    stays open until the import ends. Unlike job submissions it is never
+    refused for the number of jobs queued, but waits for a worker like them.
+    Returns 503 if the import timed out waiting for another write's lock.
+    """
+    job = await _submit_import_job(file, bounded=False)
+    await import_jobs.wait(job)
+    if job.status == FAILED:
+        if job.database_busy:
+            raise HTTPException(
+                status_code=503, detail=job.error, headers={"Retry-After": IMPORT_RETRY_AFTER}
+            )
+        raise HTTPException(status_code=400, detail=job.error)
+    return job.result
+
+
+# Background import jobs
+@router.post("/computers/import/jobs", response_model=ImportJobStatus, status_code=202)
+async def submit_import_job(request: Request, response: Response, file: UploadFile = File(...)):
+    """Queue a CSV file for import and return its job at once.
+
+    Poll GET /computers/import/jobs/{job_id} (the Location header) for
+    progress. Returns 429 when too many imports are already queued.
+    """
+    job = await _submit_import_job(file)
+    response.headers["Location"] = str(request.url_for("get_import_job", job_id=job.id))
+    return job.to_status()
+
+
+@router.get("/computers/import/jobs/{job_id}", response_model=ImportJobStatus)
+async def get_import_job(job_id: str):
+    """Get the state and live progress of an import job."""
+    job = import_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_status()
+
+
+@router.post("/computers/import/jobs/{job_id}/cancel", response_model=ImportJobStatus)
+async def cancel_import_job(job_id: str):
+    """Cancel an import job.
+
+    A queued job never starts; a running one stops after its current chunk,
+    keeping the chunks already imported.
+    """
+    job = import_jobs.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Import job not found")
+    return job.to_status()
+
+
+async def _submit_import_job(file: UploadFile, bounded: bool = True) -> ImportJob:
+    """Validate an uploaded CSV file and queue it as an import job."""
     if not file.filename or not file.filename.endswith('.csv'):
         raise HTTPException(status_code=400, detail="File must be a CSV")
+    try:
+        return await run_in_threadpool(import_jobs.submit, file.file, file.filename, bounded)
+    except TooManyJobsError as e:
+        raise HTTPException(status_code=429, detail=str(e))
+
+
+# Full-text search - MUST be before {serial_number} routes to avoid path collision
+@router.get("/computers/search", response_model=List[EquipmentListItem])
+async def search_computers(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(50, ge=1, le=MAX_PAGE_SIZE),
+    offset: int = Query(0, ge=0),
+    include_total: bool = True,
+    include_deleted: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Search equipment text fields, returning the best matches first.
+
+    Every word in ``q`` must match the start of a word in some field. The
+    total number of matches is returned in the X-Total-Count header.
+    """
+    service = AsyncSearchService(db)
+    items, total = await service.search(
+        q,
+        limit=limit,
+        offset=offset,
+        include_total=include_total,
+        include_deleted=include_deleted,
+    )
+
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return items
+
+
+# Fleet statistics - MUST be before {serial_number} routes to avoid path collision
+@router.get("/computers/stats", response_model=FleetStats)
+async def get_fleet_stats(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get equipment counts and total cost by status, type, location and usage type.
+
+    Served from a summary table kept up to date by every write, so the cost
+    does not grow with the size of the fleet. Soft-deleted equipment is not
+    counted.
+    """
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation)
+    if not_modified:
+        return not_modified
+
+    service = AsyncEquipmentService(db)
+    return await service.get_stats()
+
+
+# Bulk create - MUST be before {serial_number} routes to avoid path collision
+@router.post("/computers/bulk", response_model=BulkResult)
+async def bulk_create_computers(
+    items: List[EquipmentCreate] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Create many equipment records in one transaction.
+
+    Returns a result per item, in request order; items with a duplicate
+    serial number fail without affecting the others.
+    """
+    service = AsyncEquipmentService(db)
+    return await service.bulk_create(items)
 
-    csv_service = CSVService(db)
-    content = await file.read()
 
+# Bulk update
+@router.patch("/computers/bulk", response_model=BulkResult)
+async def bulk_update_computers(
+    items: List[BulkUpdateItem] = Body(..., min_length=1, max_length=BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Update many equipment records, each by equipment_id or serial_number.
+
+    Only the fields present in an item are changed. Returns a result per
+    item, in request order; items that match nothing, repeat a record or
+    set a serial number already in use fail without affecting the others.
+    """
+    service = AsyncEquipmentService(db)
+    return await service.bulk_update(items)
+
+
+# Bulk soft delete - MUST be before {serial_number} routes to avoid path collision
+@router.post("/computers/bulk/delete", response_model=BulkResult)
+async def bulk_delete_computers(
+    data: BulkIdentifiers,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Soft delete many equipment records by equipment_id or serial_number."""
+    service = AsyncEquipmentService(db)
+    return await service.bulk_soft_delete(data.identifiers)
+
+
+# Bulk restore - MUST be before {serial_number} routes to avoid path collision
+@router.post("/computers/bulk/restore", response_model=BulkResult)
+async def bulk_restore_computers(
+    data: BulkIdentifiers,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Restore many soft-deleted equipment records by equipment_id or serial_number."""
+    service = AsyncEquipmentService(db)
+    return await service.bulk_restore(data.identifiers)
+
+
+# Batch assignment history - MUST be before {serial_number} routes to avoid path collision
+@router.post("/computers/history", response_model=HistoryBatchResult)
+async def get_computers_history(
+    data: HistoryBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get assignment history for many records by equipment_id or serial_number.
+
+    Takes a few queries however many records are asked for, instead of
+    two or three per record with GET /computers/{identifier}/history.
+    Identifiers that match nothing are listed in not_found.
+    """
+    service = AsyncEquipmentService(db)
+    return await service.get_history_batch(data.identifiers)
+
+
+# Changes feed for incremental sync
+@router.get("/computers/changes", response_model=EquipmentChanges)
+async def get_computer_changes(
+    request: Request,
+    response: Response,
+    since: Optional[str] = Query(None, description="Cursor from the previous page (omit to start)"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get the records created, updated, soft-deleted or restored since a cursor.
+
+    Soft-deleted records are included as tombstones (is_deleted true).
+    Without since the feed starts from the beginning, so following it from
+    there gives a full copy. Keep requesting with the returned cursor
+    while has_more is true; a record written again later reappears.
+    """
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation)
+    if not_modified:
+        return not_modified
+
+    try:
+        items, cursor, has_more = await AsyncEquipmentService(db).get_changes(since, limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return EquipmentChanges(items=items, cursor=cursor, has_more=has_more)
+
+
+# Live change events
+@router.get("/computers/stream")
+async def stream_computer_changes(
+    since: Optional[str] = Query(None, description="Changes feed cursor to resume from"),
+    last_event_id: Optional[str] = Header(None),
+):
+    """Stream change events as Server-Sent Events.
+
+    Each `change` event has the record's id and equipment_id, its
+    change_seq, the op (create, update, delete or restore) and the fields
+    it changed with their new values. Event ids are changes feed cursors:
+    an EventSource reconnects from the last one it saw (Last-Event-ID), and
+    since resumes from any cursor, including one from GET
+    /computers/changes. Without either the stream starts with a `ready`
+    event carrying the current cursor and continues live.
+    """
+    cursor = last_event_id or since
     try:
-        result = csv_service.import_from_csv(content.decode('utf-8'))
-        return result
-    except Exception as e:
+        after = change_stream.parse_cursor(cursor) if cursor else None
+        events = await change_stream.open(after)
+    except InvalidCursorError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except StreamFullError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        # Disable proxy buffering so events are delivered as they happen
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # List all equipment
-@router.get("/computers", response_model=List[EquipmentListItem])
-def list_computers(
+@router.get(
+    "/computers",
+    response_class=Response,
+    responses=list_responses(EquipmentListItem),
+)
+async def list_computers(
+    request: Request,
+    response: Response,
     status: Optional[Status] = None,
     equipment_type: Optional[EquipmentType] = Query(None, alias="equipment_type"),
     usage_type: Optional[UsageType] = None,
@@ -78,11 +413,54 @@ def list_computers(
     sort_by: Optional[str] = Query("equipment_name", regex="^(equipment_id|equipment_name|computer_subtype|primary_user|status|manufacturer|model|location|cpu_model|ram|storage|operating_system|serial_number|cpu_score|score_2d|score_3d|memory_score|disk_score|overall_rating|assignment_date|usage_type|created_at)$"),
     sort_order: Optional[str] = Query("asc", regex="^(asc|desc)$"),
     include_deleted: bool = False,
-    db: Session = Depends(get_db),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = None,
+    view: Optional[str] = None,
+    include: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """List all equipment with optional filtering and sorting."""
-    service = EquipmentService(db)
-    return service.get_all(
+    """List all equipment with optional filtering and sorting.
+
+    ``fields`` (comma-separated field names) and ``view`` (comma-separated
+    view groups: summary, machineSpec, machinePerformance, assignment)
+    limit the response to those fields plus the always-visible ones (and
+    the sort field), and only those columns are read from the database.
+
+    ``include=history`` adds each item's assignment_history, loaded for the
+    whole page in batched IN queries rather than one query per item.
+
+    Passing ``limit`` (or a ``cursor`` from a previous page) switches to keyset
+    pagination. The cursor for the next page is returned in the X-Next-Cursor
+    header (absent on the last page) and the total number of matching rows in
+    X-Total-Count, unless include_total is false.
+
+    Responses carry an ETag; a request whose If-None-Match matches gets a
+    304 without the list being queried. Serialized results are cached per
+    worker (see services.result_cache) until the next write.
+
+    Items are encoded straight from column rows (see api.serialization)
+    rather than through per-row response model validation, in the format
+    negotiated through the Accept header (see api.negotiation): JSON,
+    columnar JSON or MessagePack.
+    """
+    media_type = negotiate(request, response)
+
+    # Read the generation from the same replica snapshot as the list itself
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation, media_type)
+    if not_modified:
+        return not_modified
+
+    include_history = _resolve_list_includes(include)
+    columns = _resolve_list_fields(fields, view) or LIST_FIELDS
+    if include_history:
+        # History is matched to items by primary key
+        columns = columns + ["id"]
+
+    filters = dict(
         status=status,
         equipment_type=equipment_type,
         usage_type=usage_type,
@@ -91,98 +469,264 @@ def list_computers(
         model=model,
         min_rating=min_rating,
         max_rating=max_rating,
-        sort_by=sort_by,
-        sort_order=sort_order,
         include_deleted=include_deleted,
+        # Always read column rows; see dump_list_rows
+        columns=columns,
     )
 
+    # Normalized parameters; the same list always yields the same key
+    paginated = limit is not None or cursor is not None
+    cache_key = tuple(sorted(
+        (name, tuple(value) if isinstance(value, list) else value)
+        for name, value in dict(
+            filters,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total and paginated,
+            include_history=include_history,
+            media_type=media_type,
+        ).items()
+        if value is not None
+    ))
+
+    cached = list_cache.get(generation, cache_key)
+    if cached is None:
+        cached = await _query_list(
+            AsyncEquipmentService(db),
+            limit,
+            cursor,
+            include_total,
+            include_history,
+            sort_by,
+            sort_order,
+            filters,
+            media_type,
+        )
+        list_cache.put(generation, cache_key, cached)
+
+    body, headers = cached
+    response.headers.update(headers)
+    return Response(body, media_type=media_type, headers=dict(response.headers))
+
+
+async def _query_list(
+    service: AsyncEquipmentService,
+    limit: Optional[int],
+    cursor: Optional[str],
+    include_total: bool,
+    include_history: bool,
+    sort_by: str,
+    sort_order: str,
+    filters: dict,
+    media_type: str,
+) -> tuple[bytes, dict]:
+    """Run a list query and serialize it to (body, extra headers)."""
+    headers = {}
+    if limit is None and cursor is None:
+        items = await service.get_all(sort_by=sort_by, sort_order=sort_order, **filters)
+        return await _dump_list(service, items, include_history, media_type), headers
+
+    try:
+        items, next_cursor, total = await service.get_page(
+            limit=limit,
+            cursor=cursor,
+            include_total=include_total,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            **filters,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    if total is not None:
+        headers["X-Total-Count"] = str(total)
+    return await _dump_list(service, items, include_history, media_type), headers
+
+
+async def _dump_list(
+    service: AsyncEquipmentService,
+    items: list,
+    include_history: bool,
+    media_type: str,
+) -> bytes:
+    """Serialize list rows, with their assignment history if requested."""
+    histories = None
+    if include_history:
+        histories = await service.get_histories(item.id for item in items)
+    return dump_list_rows(items, histories, media_type)
+
 
 # Get equipment by identifier (equipment_id or serial_number)
 @router.get("/computers/{identifier}", response_model=EquipmentResponse)
-def get_computer(identifier: str, db: Session = Depends(get_db)):
-    """Get full details of equipment by equipment_id (e.g., PC-0001) or serial_number."""
-    service = EquipmentService(db)
-    equipment = service.get_by_identifier(identifier)
+async def get_computer(
+    identifier: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get full details of equipment by equipment_id (e.g., PC-0001) or serial_number.
+
+    Read from a replica like the other reads; a client that has just
+    written is kept on the primary (see routing_session), so it sees its
+    own changes. Sent as JSON or MessagePack, as negotiated through the
+    Accept header.
+    """
+    media_type = negotiate(request, response)
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation, media_type)
+    if not_modified:
+        return not_modified
+
+    service = AsyncEquipmentService(db)
+    # From the generation's replica, so the cached record matches it
+    with read_from_replica(db):
+        equipment = await service.get_by_identifier(identifier, generation=generation)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
-    return equipment
+    return negotiated_response(equipment, EquipmentResponse, media_type, response)
 
 
 # Create new equipment
 @router.post("/computers", response_model=EquipmentResponse, status_code=201)
-def create_computer(data: EquipmentCreate, db: Session = Depends(get_db)):
+async def create_computer(data: EquipmentCreate, db: AsyncSession = Depends(get_async_db)):
     """Create a new equipment record."""
-    service = EquipmentService(db)
+    service = AsyncEquipmentService(db)
 
     # Check for duplicate serial number (only if serial number is provided)
     if data.serial_number:
-        existing = service.get_by_serial(data.serial_number, include_deleted=True)
+        existing = await service.get_by_serial(data.serial_number, include_deleted=True)
         if existing:
             raise HTTPException(
                 status_code=409,
                 detail=f"Serial number '{data.serial_number}' already exists"
             )
 
-    return service.create(data)
+    return await service.create(data)
 
 
 # Update equipment
 @router.put("/computers/{identifier}", response_model=EquipmentResponse)
-def update_computer(
+async def update_computer(
     identifier: str,
     data: EquipmentUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     """Update an existing equipment record by equipment_id or serial_number."""
-    service = EquipmentService(db)
-    equipment = service.get_by_identifier(identifier)
+    service = AsyncEquipmentService(db)
+    equipment = await service.get_by_identifier(identifier)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
-    return service.update(equipment, data)
+    return await service.update(equipment, data)
 
 
 # Soft delete equipment
 @router.delete("/computers/{identifier}", status_code=204)
-def delete_computer(identifier: str, db: Session = Depends(get_db)):
+async def delete_computer(identifier: str, db: AsyncSession = Depends(get_async_db)):
     """Soft delete an equipment record by equipment_id or serial_number."""
-    service = EquipmentService(db)
-    equipment = service.get_by_identifier(identifier)
+    service = AsyncEquipmentService(db)
+    equipment = await service.get_by_identifier(identifier)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
-    service.soft_delete(equipment)
+    await service.soft_delete(equipment)
 
 
 # Restore soft-deleted equipment
 @router.post("/computers/{identifier}/restore", response_model=EquipmentResponse)
-def restore_computer(identifier: str, db: Session = Depends(get_db)):
+async def restore_computer(identifier: str, db: AsyncSession = Depends(get_async_db)):
     """Restore a soft-deleted equipment record by equipment_id or serial_number."""
-    service = EquipmentService(db)
-    equipment = service.get_by_identifier(identifier, include_deleted=True)
+    service = AsyncEquipmentService(db)
+    equipment = await service.get_by_identifier(identifier, include_deleted=True)
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
     if not equipment.is_deleted:
         raise HTTPException(status_code=400, detail="Equipment is not deleted")
 
-    return service.restore(equipment)
+    return await service.restore(equipment)
 
 
 # Get assignment history
 @router.get("/computers/{identifier}/history", response_model=List[AssignmentHistoryItem])
-def get_computer_history(identifier: str, db: Session = Depends(get_db)):
-    """Get assignment history for equipment by equipment_id or serial_number."""
-    service = EquipmentService(db)
-    equipment = service.get_by_identifier(identifier, include_deleted=True)
+async def get_computer_history(
+    identifier: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get assignment history for equipment by equipment_id or serial_number.
+
+    Sent as JSON, columnar JSON or MessagePack, as negotiated through the
+    Accept header.
+    """
+    media_type = negotiate(request, response)
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation, media_type)
+    if not_modified:
+        return not_modified
+
+    service = AsyncEquipmentService(db)
+    # From the generation's replica, so the cached record matches it
+    with read_from_replica(db):
+        equipment = await service.get_by_identifier(
+            identifier, include_deleted=True, generation=generation
+        )
+    if not equipment:
+        raise HTTPException(status_code=404, detail="Equipment not found")
+
+    history = await service.get_history(equipment)
+    return negotiated_response(history, AssignmentHistoryItem, media_type, response)
+
+
+@router.get("/computers/{identifier}/assignment", response_model=AssignmentPeriod)
+async def get_computer_assignment(
+    identifier: str,
+    request: Request,
+    response: Response,
+    as_of: Optional[date] = Query(None, description="Day to look up (default: today)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get who had the equipment at the end of a day, from its assignment history.
+
+    Sent as JSON or MessagePack, as negotiated through the Accept header.
+    """
+    media_type = negotiate(request, response)
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation, media_type)
+    if not_modified:
+        return not_modified
+
+    # From the generation's replica, so the cached record matches it
+    with read_from_replica(db):
+        equipment = await AsyncEquipmentService(db).get_by_identifier(
+            identifier, include_deleted=True, generation=generation
+        )
     if not equipment:
         raise HTTPException(status_code=404, detail="Equipment not found")
 
-    return service.get_history(equipment)
+    period = await AsyncAssignmentService(db).holder_on(equipment, as_of or date.today())
+    if period is None:
+        raise HTTPException(status_code=404, detail="No known assignment on that day")
+    return negotiated_response(period, AssignmentPeriod, media_type, response)
 
 
 # List soft-deleted equipment (admin)
 @router.get("/admin/deleted", response_model=List[EquipmentListItem])
-def list_deleted_computers(db: Session = Depends(get_db)):
+async def list_deleted_computers(db: AsyncSession = Depends(get_async_db)):
     """List all soft-deleted equipment for admin recovery."""
-    service = EquipmentService(db)
-    return service.get_deleted()
+    service = AsyncEquipmentService(db)
+    return await service.get_deleted()
+
+
+# List result cache statistics (admin)
+@router.get("/admin/cache")
+async def get_cache_stats():
+    """Get hit/miss statistics for this worker's list result cache."""
+    return list_cache.stats()
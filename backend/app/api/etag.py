@@ -0,0 +1,53 @@
+"""Conditional GET support based on the equipment change generation."""
+
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+
+def compute_etag(request: Request, generation: int, variant: Optional[str] = None) -> str:
+    """Build a strong ETag for a read-only request.
+
+    Every write bumps the equipment change generation, so the response to a
+    given URL can only differ if the generation has moved. This never
+    touches the response body. variant names the representation, such as a
+    negotiated media type, when the same URL can have several.
+    """
+    url = request.url.path
+    if request.url.query:
+        url += "?" + request.url.query
+    if variant:
+        url += " " + variant
+    digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    return f'"{generation}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Check whether the request's If-None-Match header matches etag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    candidates = [c.strip() for c in header.split(",")]
+    # If-None-Match uses weak comparison, so ignore any W/ prefix
+    return "*" in candidates or etag in (c.removeprefix("W/") for c in candidates)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    generation: int,
+    variant: Optional[str] = None,
+) -> Optional[Response]:
+    """Handle If-None-Match for a read-only endpoint.
+
+    Returns a 304 response when the client's copy is current. Otherwise sets
+    the ETag header on response and returns None so the endpoint proceeds.
+    """
+    etag = compute_etag(request, generation, variant)
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return None
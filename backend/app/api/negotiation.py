@@ -0,0 +1,175 @@
+"""Content negotiation of response formats for the equipment read endpoints.
+
+Clients pick a format with the Accept header:
+
+- application/json: the default, an object or array of objects.
+- application/vnd.equipment.columns+json: a list as one object with the
+  field names once and an array of values per field,
+  {"count": n, "columns": {"equipment_id": [...], "status": [...], ...}}.
+  Single objects are sent as in JSON, as they name each field once anyway.
+- application/msgpack and application/vnd.equipment.columns+msgpack: the
+  same layouts in MessagePack. Needs msgpack, which is optional; without
+  it these types are not offered and JSON is sent instead.
+
+Values are those of the JSON API in every format: dates, datetimes and
+decimals are strings, enums their values.
+"""
+
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional, Sequence
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+try:
+    import msgpack
+except ImportError:  # MessagePack responses are unavailable without it
+    msgpack = None
+
+JSON = "application/json"
+COLUMNS_JSON = "application/vnd.equipment.columns+json"
+MSGPACK = "application/msgpack"
+COLUMNS_MSGPACK = "application/vnd.equipment.columns+msgpack"
+
+# Media types that lay lists out by column
+COLUMNAR_TYPES = (COLUMNS_JSON, COLUMNS_MSGPACK)
+
+# Media types encoded with msgpack
+MSGPACK_TYPES = (MSGPACK, COLUMNS_MSGPACK)
+
+# Accept entries that stand for one of the media types; wildcards get JSON
+MEDIA_TYPE_ALIASES = {"application/x-msgpack": MSGPACK, "*/*": JSON, "application/*": JSON}
+
+
+def available_media_types() -> List[str]:
+    """Media types that can be produced here, in order of preference."""
+    media_types = [JSON, COLUMNS_JSON]
+    if msgpack is not None:
+        media_types += [MSGPACK, COLUMNS_MSGPACK]
+    return media_types
+
+
+def negotiate(request: Request, response: Response) -> str:
+    """Pick the response media type from the request's Accept header.
+
+    Takes the acceptable type with the highest quality, the earliest listed
+    on a tie. Wildcards, a missing header and types that cannot be produced
+    fall back to JSON. Sets Vary: Accept on response.
+    """
+    response.headers["Vary"] = "Accept"
+    header = request.headers.get("accept")
+    if not header:
+        return JSON
+
+    available = available_media_types()
+    best, best_quality = JSON, 0.0
+    for entry in header.split(","):
+        media_type, _, params = entry.partition(";")
+        media_type = media_type.strip().lower()
+        media_type = MEDIA_TYPE_ALIASES.get(media_type, media_type)
+        if media_type not in available:
+            continue
+        quality = _quality(params)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+def _quality(params: str) -> float:
+    """Read the q parameter of an Accept entry (1 if absent or malformed)."""
+    for param in params.split(";"):
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value)
+            except ValueError:
+                return 1.0
+    return 1.0
+
+
+def to_columns(items: Sequence[Dict[str, Any]], fields: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """Lay a list of objects out as arrays of values by field.
+
+    fields defaults to the keys of the first item.
+    """
+    if fields is None:
+        fields = list(items[0]) if items else []
+    return {
+        "count": len(items),
+        "columns": {field: [item.get(field) for item in items] for field in fields},
+    }
+
+
+def encode(data: Any, media_type: str) -> bytes:
+    """Encode data, already laid out for media_type, as its body."""
+    if media_type in MSGPACK_TYPES:
+        return msgpack.packb(data, default=_msgpack_default)
+    return orjson.dumps(data)
+
+
+def _msgpack_default(value):
+    """Encode the values msgpack does not as the JSON API does."""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def list_responses(model: type[BaseModel]) -> Dict[int, Dict[str, Any]]:
+    """OpenAPI responses for a list endpoint that returns Response bodies.
+
+    Documents the JSON array of model items and the other formats a list
+    can be negotiated to, for a route declared with response_class=Response.
+    """
+    columns = {
+        "type": "object",
+        "properties": {
+            "count": {"type": "integer"},
+            "columns": {
+                "type": "object",
+                "additionalProperties": {"type": "array", "items": {}},
+            },
+        },
+    }
+    binary = {"schema": {"type": "string", "format": "binary"}}
+    content = {COLUMNS_JSON: {"schema": columns}}
+    if msgpack is not None:
+        content.update({MSGPACK: binary, COLUMNS_MSGPACK: binary})
+    return {
+        200: {
+            "model": List[model],
+            "description": "The items, in the format negotiated through Accept",
+            "content": content,
+        },
+    }
+
+
+def negotiated_response(
+    content: Any,
+    model: type[BaseModel],
+    media_type: str,
+    response: Response,
+):
+    """Return an endpoint's result in the negotiated format.
+
+    For JSON, returns content itself, for FastAPI to encode through the
+    route's response model as usual. Otherwise validates content (a record
+    or a list of records) through model and returns the encoded Response,
+    carrying the headers set on response.
+    """
+    if media_type == JSON:
+        return content
+
+    if isinstance(content, list):
+        data = [model.model_validate(item).model_dump(mode="json") for item in content]
+        if media_type in COLUMNAR_TYPES:
+            data = to_columns(data, list(model.model_fields))
+    else:
+        data = model.model_validate(content).model_dump(mode="json")
+    return Response(encode(data, media_type), media_type=media_type, headers=dict(response.headers))
@@ -0,0 +1,51 @@
+"""API routes for equipment assignments by user."""
+
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_async_db
+from ..instrumentation import InstrumentedRoute
+from ..routing_session import read_from_replica
+from ..schemas import AssignmentPeriod
+from ..services.assignment_service import AsyncAssignmentService
+from ..services.generation import get_generation
+from .etag import conditional_response
+
+router = APIRouter(route_class=InstrumentedRoute)
+
+
+@router.get("/users/{user}/equipment", response_model=List[AssignmentPeriod])
+async def get_user_equipment(
+    user: str,
+    request: Request,
+    response: Response,
+    as_of: Optional[date] = Query(None, description="Day to look up (default: today)"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get the equipment a user had at the end of a day."""
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation)
+    if not_modified:
+        return not_modified
+
+    return await AsyncAssignmentService(db).equipment_on(user, as_of or date.today())
+
+
+@router.get("/users/{user}/history", response_model=List[AssignmentPeriod])
+async def get_user_history(
+    user: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get every assignment a user has had, current ones first."""
+    with read_from_replica(db):
+        generation = await db.run_sync(get_generation)
+    not_modified = conditional_response(request, response, generation)
+    if not_modified:
+        return not_modified
+
+    return await AsyncAssignmentService(db).user_history(user)
@@ -0,0 +1,123 @@
+"""Response compression negotiated through Accept-Encoding.
+
+CompressionMiddleware compresses responses of at least
+COMPRESSION_MIN_BYTES with brotli, when the client accepts it and the
+brotli package (optional) is installed, or else gzip. Smaller bodies are
+sent as they are, as compressing them saves less than it costs.
+
+Only responses sent in one piece are compressed. Streamed responses are
+passed through untouched: exports compress themselves (see
+services.export_formats) and the change stream must reach clients event by
+event.
+"""
+
+import gzip
+import os
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # Only gzip is offered without it
+    brotli = None
+
+# Defaults, overridable from the environment
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+# Levels for responses compressed per request, trading ratio for speed
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header, or None for neither.
+
+    Prefers br when brotli is installed; a coding with q=0 is refused.
+    """
+    qualities = {}
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        coding = coding.strip().lower()
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                pass
+        qualities[coding] = quality
+
+    wildcard = qualities.get("*", 0.0)
+    if brotli is not None and qualities.get("br", wildcard) > 0:
+        return "br"
+    if qualities.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a response body with br or gzip."""
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses whole responses above a size threshold.
+
+    A compressed response's ETag becomes weak, as its bytes differ from
+    the uncompressed one's; conditional requests still match it, as
+    If-None-Match uses weak comparison.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passing_through = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passing_through
+            if passing_through:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                # Held until the body shows whether the response is streamed
+                start = message
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            if message.get("more_body", False) or "content-encoding" in headers:
+                passing_through = True
+                await send(start)
+                await send(message)
+                return
+
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) >= self.minimum_size:
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = "W/" + etag
+                message = {**message, "body": body}
+            await send(start)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
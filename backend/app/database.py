@@ -1,9 +1,17 @@
-"""Database connection module with SQLite/MySQL support via DATABASE_URL."""
+"""Database connection module with SQLite/MySQL support via DATABASE_URL.
+
+Read replicas can be added with DATABASE_REPLICA_URLS; see routing_session.
+"""
 
 import os
+from fastapi import Request, Response
 from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
+from .routing_session import PRIMARY_UNTIL, ON_WRITE, ReplicaSet, RoutingSession
+
 # Database URL from environment variable, default to SQLite for development
 DATABASE_URL = os.getenv(
     "DATABASE_URL",
@@ -15,8 +23,67 @@ connect_args = {}
 if DATABASE_URL.startswith("sqlite"):
     connect_args["check_same_thread"] = False
 
+# Optional comma-separated read replica URLs, in the same format as DATABASE_URL
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+
+# Seconds a client keeps reading from the primary after it writes
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+
+# Seconds a failed replica stays out of rotation
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+# Cookie carrying the read-your-writes deadline between requests
+PRIMARY_UNTIL_COOKIE = "primary_until"
+
 engine = create_engine(DATABASE_URL, connect_args=connect_args)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+replica_engines = [
+    create_engine(url, connect_args=connect_args, pool_pre_ping=True)
+    for url in DATABASE_REPLICA_URLS
+]
+SessionLocal = sessionmaker(
+    class_=RoutingSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    replicas=ReplicaSet(replica_engines, REPLICA_RETRY_SECONDS) if replica_engines else None,
+    sticky_seconds=REPLICA_STICKY_SECONDS,
+)
+
+# Async drivers used for each database backend
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Convert a sync DATABASE_URL into its async driver equivalent."""
+    scheme, rest = url.split("://", 1)
+    backend = scheme.split("+", 1)[0]
+    return f"{ASYNC_DRIVERS.get(backend, scheme)}://{rest}"
+
+
+# Async engine for the API, on the same database as the sync engine
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", async_database_url(DATABASE_URL))
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL)
+async_replica_engines = [
+    create_async_engine(async_database_url(url), pool_pre_ping=True)
+    for url in DATABASE_REPLICA_URLS
+]
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    autoflush=False,
+    expire_on_commit=False,
+    replicas=ReplicaSet(
+        [e.sync_engine for e in async_replica_engines], REPLICA_RETRY_SECONDS
+    ) if async_replica_engines else None,
+    sticky_seconds=REPLICA_STICKY_SECONDS,
+)
 
 Base = declarative_base()
 
@@ -30,6 +97,49 @@ def get_db():
         db.close()
 
 
+async def get_async_db(request: Request, response: Response):
+    """Dependency that provides an async database session.
+
+    Reads marked for a replica go to the primary for a while after the
+    client last wrote, tracked by a cookie set on the write's response.
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            db.info[PRIMARY_UNTIL] = float(request.cookies.get(PRIMARY_UNTIL_COOKIE, 0))
+        except ValueError:
+            pass
+        db.info[ON_WRITE] = lambda until: _set_primary_until_cookie(response, until)
+        yield db
+
+
+def _set_primary_until_cookie(response: Response, until: float) -> None:
+    """Set the read-your-writes cookie, replacing one set by an earlier commit."""
+    prefix = f"{PRIMARY_UNTIL_COOKIE}=".encode()
+    response.raw_headers[:] = [
+        (name, value) for name, value in response.raw_headers
+        if not (name == b"set-cookie" and value.startswith(prefix))
+    ]
+    response.set_cookie(
+        PRIMARY_UNTIL_COOKIE,
+        f"{until:.3f}",
+        max_age=int(REPLICA_STICKY_SECONDS) + 1,
+        httponly=True,
+        samesite="lax",
+    )
+
+
+def is_lock_timeout(error: BaseException) -> bool:
+    """Whether an error is a statement that gave up waiting for another writer's lock.
+
+    SQLite reports "database is locked" once its busy timeout passes, MySQL
+    "Lock wait timeout exceeded" (error 1205).
+    """
+    if not isinstance(error, OperationalError):
+        return False
+    message = str(error.orig).lower()
+    return "database is locked" in message or "lock wait timeout exceeded" in message
+
+
 def create_tables():
     """Create all tables in the database."""
     Base.metadata.create_all(bind=engine)
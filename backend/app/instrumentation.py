@@ -0,0 +1,268 @@
+"""Per-request SQL and timing instrumentation.
+
+InstrumentationMiddleware gives every HTTP request a RequestStats, which
+SQLAlchemy engine events (on every engine, including the sync engines
+behind the async ones and the replicas) fill in as statements run. When
+the response starts it gets a Server-Timing header; when it ends, the
+request is recorded in the per-route metrics served by GET /metrics.
+
+Serialization time is what the app spends encoding response bodies:
+blocks wrapped in timed_serialization() inside endpoints, plus the time
+from an endpoint returning to its response starting, during which FastAPI
+validates and encodes the response model. The latter is measured for
+routes using InstrumentedRoute.
+"""
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import QUERY_COUNT_BUCKETS, registry
+
+# Route label for requests that matched no route
+UNMATCHED_ROUTE = "<unmatched>"
+
+# connection.info key holding the start times of running statements
+QUERY_START = "instrumentation_query_start"
+
+REQUESTS = registry.counter(
+    "http_requests_total",
+    "HTTP requests by route and response status.",
+    ("method", "route", "status"),
+)
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the end of its response body.",
+    ("method", "route"),
+)
+REQUEST_QUERIES = registry.histogram(
+    "http_request_queries",
+    "SQL statements executed per request.",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_SQL_DURATION = registry.histogram(
+    "http_request_sql_duration_seconds",
+    "Time spent executing SQL statements per request.",
+    ("method", "route"),
+)
+REQUEST_SERIALIZATION_DURATION = registry.histogram(
+    "http_request_serialization_duration_seconds",
+    "Time spent encoding response bodies per request.",
+    ("method", "route"),
+)
+REQUEST_ROWS = registry.counter(
+    "http_request_rows_total",
+    "Rows fetched from, or written by, SQL statements.",
+    ("method", "route"),
+)
+
+
+class RequestStats:
+    """Counters for one request, filled in as it is handled."""
+
+    __slots__ = ("start", "queries", "sql_seconds", "rows", "serialize_seconds", "endpoint_done")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.rows = 0
+        self.serialize_seconds = 0.0
+        self.endpoint_done: Optional[float] = None
+
+    def response_started(self) -> None:
+        """Count the time since the endpoint returned as serialization."""
+        if self.endpoint_done is not None:
+            self.serialize_seconds += time.perf_counter() - self.endpoint_done
+            self.endpoint_done = None
+
+    def server_timing(self) -> str:
+        """Format the counters so far as a Server-Timing header value."""
+        elapsed = time.perf_counter() - self.start
+        return (
+            f'db;dur={self.sql_seconds * 1000:.2f};desc="{self.queries} queries, {self.rows} rows", '
+            f"serialize;dur={self.serialize_seconds * 1000:.2f}, "
+            f"total;dur={elapsed * 1000:.2f}"
+        )
+
+
+_current_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+@contextmanager
+def timed_serialization() -> Iterator[None]:
+    """Count the time spent in this block as response serialization."""
+    stats = _current_stats.get()
+    if stats is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.serialize_seconds += time.perf_counter() - start
+
+
+class InstrumentationMiddleware:
+    """ASGI middleware that records per-request SQL and timing stats.
+
+    A pure ASGI middleware rather than BaseHTTPMiddleware, so streamed
+    responses are measured to their last chunk.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _current_stats.set(stats)
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                stats.response_started()
+                MutableHeaders(scope=message).append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            record_request(scope["method"], route_template(scope), status, stats)
+
+
+def route_template(scope: Scope) -> str:
+    """Get the full path template of the route a request matched.
+
+    scope["route"] is the route as declared on its router, without the
+    prefixes it was included under; those are recovered from the request
+    path, which ends with the route's path filled in with its parameters.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    try:
+        matched = route.path_format.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return route.path_format
+    path = scope.get("path", "")
+    if not path.endswith(matched):
+        return route.path_format
+    return path[:len(path) - len(matched)] + route.path_format
+
+
+def record_request(method: str, route: str, status: int, stats: RequestStats) -> None:
+    """Add a finished request to the per-route metrics."""
+    REQUESTS.inc(method, route, str(status))
+    REQUEST_DURATION.observe(time.perf_counter() - stats.start, method, route)
+    REQUEST_QUERIES.observe(stats.queries, method, route)
+    REQUEST_SQL_DURATION.observe(stats.sql_seconds, method, route)
+    REQUEST_SERIALIZATION_DURATION.observe(stats.serialize_seconds, method, route)
+    if stats.rows:
+        REQUEST_ROWS.inc(method, route, amount=stats.rows)
+
+
+class InstrumentedRoute(APIRoute):
+    """APIRoute that notes when its endpoint returns.
+
+    The time from then until the response starts is FastAPI validating and
+    encoding the response model, counted as serialization.
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        super().__init__(path, _note_return(endpoint), **kwargs)
+
+
+def _note_return(endpoint):
+    """Wrap an endpoint to record in the request stats when it returns."""
+    def done():
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.endpoint_done = time.perf_counter()
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            result = await endpoint(*args, **kwargs)
+            done()
+            return result
+    else:
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            result = endpoint(*args, **kwargs)
+            done()
+            return result
+    return wrapper
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query(conn, cursor, statement, parameters, context, executemany):
+    """Note when a statement starts, if a request is being measured."""
+    if _current_stats.get() is not None:
+        conn.info.setdefault(QUERY_START, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _end_query(conn, cursor, statement, parameters, context, executemany):
+    """Add a finished statement to the request's stats.
+
+    Statements returning rows count them as they are fetched, through a
+    cursor proxy (drivers such as sqlite3 report no rowcount for SELECT);
+    others count the rows they wrote.
+    """
+    stats = _current_stats.get()
+    starts = conn.info.get(QUERY_START)
+    if stats is None or not starts:
+        return
+    stats.queries += 1
+    stats.sql_seconds += time.perf_counter() - starts.pop()
+    if cursor.description is not None:
+        if context is not None:
+            context.cursor = _CountingCursor(cursor, stats)
+    elif cursor.rowcount > 0:
+        stats.rows += cursor.rowcount
+
+
+class _CountingCursor:
+    """DBAPI cursor proxy that adds the rows fetched through it to a request's stats."""
+
+    __slots__ = ("_cursor", "_stats")
+
+    def __init__(self, cursor, stats: RequestStats):
+        self._cursor = cursor
+        self._stats = stats
+
+    def fetchone(self):
+        row = self._cursor.fetchone()
+        if row is not None:
+            self._stats.rows += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        self._stats.rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._cursor.fetchall()
+        self._stats.rows += len(rows)
+        return rows
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
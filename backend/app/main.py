@@ -2,9 +2,15 @@
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
+from .compression import CompressionMiddleware
 from .database import create_tables
 from .api import router as api_router
+from .instrumentation import InstrumentationMiddleware
+from .metrics import registry
+from .services.change_stream import change_stream
+from .services.import_jobs import import_jobs
 
 # Create FastAPI application
 app = FastAPI(
@@ -23,8 +29,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing", "X-Next-Cursor", "X-Total-Count"],
 )
 
+# gzip/brotli for responses above a size threshold
+app.add_middleware(CompressionMiddleware)
+
+# Per-request SQL and timing stats; outermost, so it times the whole stack
+app.add_middleware(InstrumentationMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -35,7 +48,22 @@ def on_startup():
     create_tables()
 
 
+@app.on_event("shutdown")
+async def on_shutdown():
+    """Stop the change stream poller and cancel pending import jobs."""
+    await change_stream.close()
+    import_jobs.shutdown()
+
+
 @app.get("/")
 def root():
     """Health check endpoint."""
     return {"status": "ok", "message": "Equipment Inventory Tracker API"}
+
+
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    """Per-route request metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,58 @@
+"""Maintenance commands for the inventory database.
+
+Usage (from the backend directory):
+    python -m app.manage rebuild-ngrams
+    python -m app.manage rebuild-stats
+"""
+
+import argparse
+
+from .database import SessionLocal, create_tables
+from .services.fleet_summary import FleetSummary
+from .services.generation import bump_generation
+from .services.ngram_index import NgramIndex
+
+
+def rebuild_ngrams() -> None:
+    """Rebuild the substring filter n-gram index from scratch."""
+    db = SessionLocal()
+    try:
+        indexed = NgramIndex(db).rebuild()
+        # Filtered list results cached before the rebuild are stale
+        bump_generation(db)
+        db.commit()
+        print(f"Indexed {indexed} distinct field values")
+    finally:
+        db.close()
+
+
+def rebuild_stats() -> None:
+    """Recompute the fleet summary behind /computers/stats from scratch."""
+    db = SessionLocal()
+    try:
+        groups = FleetSummary(db).rebuild()
+        # Stats responses cached or ETagged before the rebuild are stale
+        bump_generation(db)
+        db.commit()
+        print(f"Summarized equipment into {groups} groups")
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    "rebuild-ngrams": rebuild_ngrams,
+    "rebuild-stats": rebuild_stats,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inventory maintenance commands")
+    parser.add_argument("command", choices=sorted(COMMANDS))
+    args = parser.parse_args()
+
+    create_tables()
+    COMMANDS[args.command]()
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,10 @@ from .equipment import (
     EQUIPMENT_TYPE_PREFIXES,
 )
 from .assignment_history import AssignmentHistory
+from .equipment_ngram import EquipmentNgram
+from .equipment_id_sequence import EquipmentIdSequence
+from .change_generation import ChangeGeneration
+from .equipment_summary import EquipmentSummary
 
 __all__ = [
     "Equipment",
@@ -18,4 +22,8 @@ __all__ = [
     "UsageType",
     "EQUIPMENT_TYPE_PREFIXES",
     "AssignmentHistory",
+    "EquipmentNgram",
+    "EquipmentIdSequence",
+    "ChangeGeneration",
+    "EquipmentSummary",
 ]
@@ -30,5 +30,8 @@ class AssignmentHistory(Base):
 
     # Indexes for efficient history queries
     __table_args__ = (
+        # A device's periods in order; finds the first change after a date
         Index('ix_history_end_date', 'equipment_id', 'end_date'),
+        # A user's periods, covering the as-of interval test
+        Index('ix_history_user_interval', 'previous_user', 'end_date', 'start_date'),
     )
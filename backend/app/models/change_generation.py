@@ -0,0 +1,18 @@
+"""ChangeGeneration SQLAlchemy model for per-table change counters."""
+
+from sqlalchemy import BigInteger, Column, String
+
+from ..database import Base
+
+
+class ChangeGeneration(Base):
+    """Counter bumped by every transaction that changes a table's data.
+
+    Lets readers detect "nothing changed" with a single primary key lookup,
+    e.g. for ETags and cache invalidation.
+    """
+
+    __tablename__ = "change_generation"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
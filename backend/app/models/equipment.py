@@ -1,7 +1,7 @@
 """Equipment SQLAlchemy model with all fields from data-model.md."""
 
 from sqlalchemy import (
-    Column, Integer, String, Boolean, DateTime, Date,
+    Column, Integer, BigInteger, String, Boolean, DateTime, Date,
     Numeric, Enum as SQLEnum, Text, Index
 )
 from sqlalchemy.sql import func
@@ -9,6 +9,7 @@ from sqlalchemy.orm import relationship
 from enum import Enum as PyEnum
 
 from ..database import Base
+from .search_index import SEARCH_FIELDS
 
 
 class EquipmentType(str, PyEnum):
@@ -64,6 +65,8 @@ class Equipment(Base):
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     is_deleted = Column(Boolean, default=False)
     deleted_at = Column(DateTime, nullable=True)
+    # Equipment generation of the last write to this row, see generation.py
+    change_seq = Column(BigInteger, nullable=False, default=0, server_default='0')
 
     # Common equipment fields
     model = Column(String(200))
@@ -117,4 +120,11 @@ class Equipment(Base):
         Index('ix_equipment_usage_type', 'usage_type', 'is_deleted'),
         Index('ix_equipment_type', 'equipment_type', 'is_deleted'),
         Index('ix_equipment_location', 'location', 'is_deleted'),
+        Index('ix_equipment_model', 'model', 'is_deleted'),
+        # Changes feed, in change order
+        Index('ix_equipment_change_seq', 'change_seq', 'id'),
+        # Full-text search index (MySQL only; SQLite uses FTS5, see search_index.py)
+        Index(
+            'ft_equipment_search', *SEARCH_FIELDS, mysql_prefix='FULLTEXT'
+        ).ddl_if(dialect='mysql'),
     )
@@ -0,0 +1,19 @@
+"""EquipmentIdSequence SQLAlchemy model for per-type equipment ID counters."""
+
+from sqlalchemy import Column, Integer, Enum as SQLEnum
+
+from ..database import Base
+from .equipment import EquipmentType
+
+
+class EquipmentIdSequence(Base):
+    """Last allocated equipment ID number for one equipment type.
+
+    Incremented atomically by EquipmentService.reserve_equipment_ids, so
+    concurrent creates and imports never hand out the same ID.
+    """
+
+    __tablename__ = "equipment_id_sequence"
+
+    equipment_type = Column(SQLEnum(EquipmentType), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,29 @@
+"""EquipmentNgram SQLAlchemy model for the substring filter side index."""
+
+from sqlalchemy import Column, Integer, String, Index
+
+from ..database import Base
+
+
+class EquipmentNgram(Base):
+    """One n-gram of a distinct value of a filterable equipment text field.
+
+    Indexing distinct values rather than rows keeps the table small for
+    low-cardinality fields like location and model. A substring filter is
+    resolved to the set of matching values, which is then looked up through
+    the regular column index on equipment. Maintained by NgramIndex.
+    """
+
+    __tablename__ = "equipment_ngram"
+
+    id = Column(Integer, primary_key=True)
+    field = Column(String(20), nullable=False)
+    gram = Column(String(3), nullable=False)
+    value = Column(String(200), nullable=False)
+
+    # Not unique: case-insensitive collations may see a value indexed twice,
+    # which lookups tolerate since they intersect sets of values
+    __table_args__ = (
+        Index('ix_equipment_ngram_gram', 'field', 'gram', 'value'),
+        Index('ix_equipment_ngram_value', 'field', 'value'),
+    )
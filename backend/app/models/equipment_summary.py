@@ -0,0 +1,21 @@
+"""EquipmentSummary SQLAlchemy model for precomputed fleet statistics."""
+
+from sqlalchemy import BigInteger, Column, Numeric, String
+
+from ..database import Base
+
+
+class EquipmentSummary(Base):
+    """Count and total cost of non-deleted equipment per group.
+
+    One row per (dimension, value), e.g. ('status', 'Active'), plus a
+    ('fleet', '') row for the whole fleet. NULL values are stored as ''.
+    Maintained incrementally by the write paths (see FleetSummary).
+    """
+
+    __tablename__ = "equipment_summary"
+
+    dimension = Column(String(20), primary_key=True)
+    value = Column(String(200), primary_key=True)
+    count = Column(BigInteger, nullable=False, default=0)
+    total_cost = Column(Numeric(16, 2), nullable=False, default=0)
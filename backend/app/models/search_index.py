@@ -0,0 +1,92 @@
+"""Full-text search index over equipment text fields.
+
+SQLite uses an FTS5 external-content table kept in sync by triggers, so every
+write path (ORM, bulk statements, imports) updates the index. MySQL uses a
+FULLTEXT index declared on the equipment table itself (see Equipment).
+"""
+
+from sqlalchemy import event, text
+
+from ..database import Base
+
+# Text columns covered by the search index (MySQL allows at most 16)
+SEARCH_FIELDS = [
+    'equipment_id',
+    'serial_number',
+    'equipment_name',
+    'model',
+    'manufacturer',
+    'location',
+    'primary_user',
+    'cpu_model',
+    'operating_system',
+    'ram',
+    'storage',
+    'video_card',
+    'mac_address',
+    'ip_address',
+    'notes',
+]
+
+FTS_TABLE = 'equipment_fts'
+
+
+def _sqlite_search_index_ddl() -> list[str]:
+    """Build the idempotent DDL statements for the SQLite FTS5 index."""
+    columns = ', '.join(SEARCH_FIELDS)
+    new_values = ', '.join(f'new.{f}' for f in SEARCH_FIELDS)
+    old_values = ', '.join(f'old.{f}' for f in SEARCH_FIELDS)
+
+    insert_new = (
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) VALUES (new.id, {new_values});"
+    )
+    delete_old = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        f"VALUES ('delete', old.id, {old_values});"
+    )
+
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        f"{columns}, content='equipment', content_rowid='id')",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON equipment "
+        f"BEGIN {insert_new} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON equipment "
+        f"BEGIN {delete_old} END",
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {columns} ON equipment "
+        f"BEGIN {delete_old} {insert_new} END",
+    ]
+
+
+def create_sqlite_search_index(connection) -> None:
+    """Create the FTS5 table and triggers if missing, backfilling a new index."""
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": FTS_TABLE},
+    ).first()
+
+    for statement in _sqlite_search_index_ddl():
+        connection.execute(text(statement))
+
+    if not exists:
+        connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def drop_sqlite_search_index(connection) -> None:
+    """Drop the FTS5 table and its triggers."""
+    for suffix in ('ai', 'ad', 'au'):
+        connection.execute(text(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}"))
+    connection.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    """Ensure the SQLite search index exists whenever tables are created."""
+    if connection.dialect.name == "sqlite":
+        create_sqlite_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    """Drop the SQLite search index along with the tables."""
+    if connection.dialect.name == "sqlite":
+        drop_sqlite_search_index(connection)
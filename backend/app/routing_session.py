@@ -0,0 +1,188 @@
+"""Session that routes marked reads to read replicas and everything else to the primary."""
+
+import functools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+logger = logging.getLogger(__name__)
+
+# session.info keys
+REPLICA_READS = "replica_reads"
+PRIMARY_UNTIL = "primary_until"
+ON_WRITE = "on_write"
+
+
+class ReplicaSet:
+    """Round-robin choice among replica engines that are currently healthy.
+
+    A replica is taken out of rotation for retry_seconds after a connection
+    error or disconnect on it; with every replica down, reads fall back to
+    the primary.
+    """
+
+    def __init__(self, engines: List[Engine], retry_seconds: float = 30.0):
+        self.engines = engines
+        self.retry_seconds = retry_seconds
+        self._down_until = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+        for engine in engines:
+            event.listen(engine, "handle_error", self._on_error)
+
+    def choose(self) -> Optional[Engine]:
+        """Get the next healthy replica, or None if none is available."""
+        now = time.monotonic()
+        with self._lock:
+            for _ in range(len(self.engines)):
+                engine = self.engines[self._next % len(self.engines)]
+                self._next += 1
+                if self._down_until.get(engine, 0) <= now:
+                    return engine
+        return None
+
+    def mark_down(self, engine: Engine) -> None:
+        """Take a replica out of rotation for retry_seconds."""
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + self.retry_seconds
+        logger.warning("Read replica %s marked down", engine.url.render_as_string())
+
+    def _on_error(self, context) -> None:
+        """Mark a replica down when its connection drops mid-query."""
+        if context.is_disconnect:
+            self.mark_down(context.engine)
+
+
+class RoutingSession(Session):
+    """Session that can send read-only queries to a replica.
+
+    Only SELECTs issued inside read_from_replica() are routed to a replica;
+    flushes, other statements and unmarked reads use the primary bind. A
+    session keeps the replica it first picked, so all of its replica reads
+    see one snapshot. Reads go to the primary once the session has written
+    anything (read-your-writes) and while info[PRIMARY_UNTIL], a time.time()
+    deadline, has not passed; after a commit that wrote, that deadline is
+    pushed sticky_seconds ahead and info[ON_WRITE] is called with it.
+    """
+
+    def __init__(
+        self,
+        *args,
+        replicas: Optional[ReplicaSet] = None,
+        sticky_seconds: float = 5.0,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+        self.sticky_seconds = sticky_seconds
+        self._replica = None
+        self._wrote = False
+        self._wrote_in_transaction = False
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        """Pick the replica for marked reads, otherwise the primary."""
+        if self._use_replica(clause):
+            if self._replica is None:
+                self._replica = self._connect_replica()
+            if self._replica is not None:
+                return self._replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+    def _connect_replica(self) -> Optional[Engine]:
+        """Join a healthy replica to the transaction, or None to use the primary.
+
+        Connecting up front means an unreachable replica is skipped for this
+        session instead of failing the query.
+        """
+        while True:
+            engine = self.replicas.choose()
+            if engine is None:
+                return None
+            try:
+                self.connection(bind_arguments={"bind": engine})
+                return engine
+            except exc.DBAPIError:
+                self.replicas.mark_down(engine)
+
+    def _use_replica(self, clause) -> bool:
+        """Check whether a statement may be served by a replica."""
+        return (
+            self.replicas is not None
+            and self.info.get(REPLICA_READS, False)
+            and not self._wrote
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and self.info.get(PRIMARY_UNTIL, 0) <= time.time()
+        )
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _record_flush(session, flush_context):
+    """Pin the session to the primary once it has written."""
+    session._wrote = session._wrote_in_transaction = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _record_bulk_write(orm_execute_state):
+    """Pin the session to the primary on bulk INSERT/UPDATE/DELETE."""
+    if not orm_execute_state.is_select:
+        session = orm_execute_state.session
+        session._wrote = session._wrote_in_transaction = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _extend_stickiness(session):
+    """Keep reads on the primary for a while after a committed write."""
+    if session._wrote_in_transaction:
+        session._wrote_in_transaction = False
+        until = time.time() + session.sticky_seconds
+        session.info[PRIMARY_UNTIL] = until
+        if session.info.get(ON_WRITE):
+            session.info[ON_WRITE](until)
+
+
+@event.listens_for(RoutingSession, "after_rollback")
+def _reset_transaction(session):
+    """Forget writes that were rolled back."""
+    session._wrote_in_transaction = False
+
+
+@event.listens_for(RoutingSession, "after_transaction_end")
+def _release_replica(session, transaction):
+    """Let the next transaction pick a replica afresh."""
+    if transaction.parent is None:
+        session._replica = None
+
+
+@contextmanager
+def read_from_replica(db) -> Iterator[None]:
+    """Allow the SELECTs issued in this block to be served by a replica.
+
+    Accepts a Session or an AsyncSession; a no-op for sessions that have no
+    replicas configured.
+    """
+    session = getattr(db, "sync_session", db)
+    previous = session.info.get(REPLICA_READS, False)
+    session.info[REPLICA_READS] = True
+    try:
+        yield
+    finally:
+        session.info[REPLICA_READS] = previous
+
+
+def replica_read(method):
+    """Decorate a service method whose queries may be served by a replica."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with read_from_replica(self.db):
+            return method(self, *args, **kwargs)
+    return wrapper
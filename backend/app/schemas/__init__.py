@@ -6,10 +6,27 @@ from .equipment import (
     EquipmentUpdate,
     EquipmentListItem,
     EquipmentResponse,
+    EquipmentChange,
+    EquipmentChanges,
     AssignmentHistoryItem,
+    AssignmentPeriod,
     ImportError,
     ImportResult,
+    ImportJobStatus,
+    BulkUpdateItem,
+    BulkIdentifiers,
+    BulkItemResult,
+    BulkResult,
+    HistoryBatchRequest,
+    EquipmentHistory,
+    HistoryBatchResult,
+    StatsGroup,
+    FleetStats,
     ErrorResponse,
+    BULK_MAX_ITEMS,
+    HISTORY_BATCH_MAX_ITEMS,
+    LIST_BASE_FIELDS,
+    LIST_VIEW_FIELDS,
 )
 
 __all__ = [
@@ -18,8 +35,25 @@ __all__ = [
     "EquipmentUpdate",
     "EquipmentListItem",
     "EquipmentResponse",
+    "EquipmentChange",
+    "EquipmentChanges",
     "AssignmentHistoryItem",
+    "AssignmentPeriod",
     "ImportError",
     "ImportResult",
+    "ImportJobStatus",
+    "BulkUpdateItem",
+    "BulkIdentifiers",
+    "BulkItemResult",
+    "BulkResult",
+    "HistoryBatchRequest",
+    "EquipmentHistory",
+    "HistoryBatchResult",
+    "StatsGroup",
+    "FleetStats",
     "ErrorResponse",
+    "BULK_MAX_ITEMS",
+    "HISTORY_BATCH_MAX_ITEMS",
+    "LIST_BASE_FIELDS",
+    "LIST_VIEW_FIELDS",
 ]
@@ -102,6 +102,27 @@ class EquipmentListItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# Fields always included in list responses: required by EquipmentListItem
+# or shown in every list view
+LIST_BASE_FIELDS = [
+    'equipment_id',
+    'equipment_type',
+    'status',
+    'is_deleted',
+    'computer_subtype',
+    'primary_user',
+    'equipment_name',
+]
+
+# Extra list fields per frontend view group (see frontend/src/config/columns.ts)
+LIST_VIEW_FIELDS = {
+    'summary': ['manufacturer', 'model', 'location', 'notes'],
+    'machineSpec': ['cpu_model', 'ram', 'storage', 'operating_system', 'serial_number', 'mac_address'],
+    'machinePerformance': ['cpu_score', 'score_2d', 'score_3d', 'memory_score', 'disk_score', 'overall_rating'],
+    'assignment': ['assignment_date', 'usage_type', 'ip_address'],
+}
+
+
 class EquipmentResponse(EquipmentBase):
     """Full equipment record response."""
     id: int
@@ -116,6 +137,22 @@ class EquipmentResponse(EquipmentBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class EquipmentChange(EquipmentResponse):
+    """A record in the changes feed; soft-deleted records are tombstones."""
+    change_seq: int
+
+
+class EquipmentChanges(BaseModel):
+    """One page of the changes feed, in change order.
+
+    cursor resumes the feed after the last item (or where it was if there
+    are no items); it is None only while nothing has ever been written.
+    """
+    items: List[EquipmentChange]
+    cursor: Optional[str] = None
+    has_more: bool
+
+
 class AssignmentHistoryItem(BaseModel):
     """A single assignment history record."""
     id: int
@@ -129,6 +166,16 @@ class AssignmentHistoryItem(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+class AssignmentPeriod(BaseModel):
+    """A period during which a piece of equipment was assigned as described."""
+    equipment_id: str
+    user: Optional[str] = None
+    usage_type: Optional[UsageType] = None
+    equipment_name: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None  # None while the assignment is current
+
+
 class ImportError(BaseModel):
     """Details of a failed import row."""
     row: int
@@ -146,6 +193,104 @@ class ImportResult(BaseModel):
     errors: List[ImportError]
 
 
+class ImportJobStatus(BaseModel):
+    """State and live progress of a background import job.
+
+    status is queued, running, completed, failed or cancelled. The counts
+    grow as the job runs; rows_to_import is known once the file has been
+    counted, and result is set when the job ends (for a cancelled job,
+    covering the chunks imported before it stopped).
+    """
+    job_id: str
+    status: str
+    filename: str
+    submitted_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    rows_parsed: int
+    rows_to_import: Optional[int] = None
+    rows_imported: int
+    created: int
+    updated: int
+    restored: int
+    failed: int
+    error: Optional[str] = None
+    result: Optional[ImportResult] = None
+
+
+# Maximum number of items accepted by one bulk request
+BULK_MAX_ITEMS = 1000
+
+
+class BulkUpdateItem(EquipmentUpdate):
+    """One item of a bulk update: the record to change and its new values.
+
+    May also change serial_number; one already held by another record fails
+    the item.
+    """
+    identifier: str = Field(..., min_length=1)
+    serial_number: Optional[str] = Field(None, max_length=100)
+
+
+class BulkIdentifiers(BaseModel):
+    """Records to bulk soft-delete or restore, by equipment_id or serial_number."""
+    identifiers: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one item of a bulk request, in request order."""
+    index: int
+    equipment_id: Optional[str] = None
+    status: str  # created, updated, deleted, restored or failed
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    """Result of a bulk create/update/delete/restore operation."""
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+# Maximum number of identifiers accepted by one batch history request
+HISTORY_BATCH_MAX_ITEMS = 5000
+
+
+class HistoryBatchRequest(BaseModel):
+    """Records to get assignment history for, by equipment_id or serial_number."""
+    identifiers: List[str] = Field(..., min_length=1, max_length=HISTORY_BATCH_MAX_ITEMS)
+
+
+class EquipmentHistory(BaseModel):
+    """Assignment history of one record in a batch history result."""
+    identifier: str
+    equipment_id: str
+    history: List[AssignmentHistoryItem]
+
+
+class HistoryBatchResult(BaseModel):
+    """Result of a batch history request, in request order."""
+    items: List[EquipmentHistory]
+    not_found: List[str]
+
+
+class StatsGroup(BaseModel):
+    """Count and total cost of the equipment sharing one field value."""
+    value: Optional[str] = None
+    count: int
+    total_cost: Decimal
+
+
+class FleetStats(BaseModel):
+    """Fleet totals broken down by status, type, location and usage type."""
+    total: int
+    total_cost: Decimal
+    by_status: List[StatsGroup]
+    by_equipment_type: List[StatsGroup]
+    by_location: List[StatsGroup]
+    by_usage_type: List[StatsGroup]
+
+
 class ErrorResponse(BaseModel):
     """API error response."""
     detail: str
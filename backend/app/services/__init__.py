@@ -1,6 +1,17 @@
 # Services package - exports business logic services
 
-from .equipment_service import EquipmentService
-from .csv_service import CSVService
+from .equipment_service import EquipmentService, AsyncEquipmentService
+from .csv_service import CSVService, AsyncCSVService
+from .search_service import SearchService, AsyncSearchService
+from .assignment_service import AssignmentService, AsyncAssignmentService
 
-__all__ = ["EquipmentService", "CSVService"]
+__all__ = [
+    "EquipmentService",
+    "AsyncEquipmentService",
+    "CSVService",
+    "AsyncCSVService",
+    "SearchService",
+    "AsyncSearchService",
+    "AssignmentService",
+    "AsyncAssignmentService",
+]
@@ -0,0 +1,195 @@
+"""Assignment service for point-in-time and per-user assignment queries."""
+
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, exists, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from ..models import AssignmentHistory, Equipment
+from ..routing_session import replica_read
+from ..schemas import AssignmentPeriod
+
+
+def _end_of_day(on: date) -> datetime:
+    """The first moment after the given day."""
+    return datetime.combine(on + timedelta(days=1), time())
+
+
+class AssignmentService:
+    """Service class for questions about who had which equipment when.
+
+    A device's assignments are the closed periods recorded in
+    assignment_history plus the open one described by its current
+    Equipment assignment fields. A history row names the previous holder,
+    who had the device from start_date until the change on end_date. An
+    unknown start (of a history row, or the current assignment_date) reaches
+    back to the day the device was recorded, its created_at. Dates are read
+    as of the end of the day, so on the day of a change the device is
+    already with its new holder.
+
+    Every query is a few index lookups: the first change after a date per
+    device through ix_history_end_date, and a user's periods through
+    ix_history_user_interval and ix_equipment_user.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    @replica_read
+    def holder_on(self, equipment: Equipment, on: date) -> Optional[AssignmentPeriod]:
+        """Get the assignment a device was in at the end of the given day.
+
+        Returns None if no known assignment covers that day, or if the
+        device was soft-deleted by then, as equipment_on leaves it out.
+        """
+        if equipment.is_deleted and (
+            equipment.deleted_at is None or equipment.deleted_at < _end_of_day(on)
+        ):
+            return None
+
+        change = self.db.scalars(
+            select(AssignmentHistory)
+            .where(AssignmentHistory.equipment_id == equipment.id, AssignmentHistory.end_date > on)
+            .order_by(AssignmentHistory.end_date, AssignmentHistory.id)
+            .limit(1)
+        ).first()
+
+        # The first change after the day records who had the device then;
+        # without one, it has been with its current holder since
+        start = change.start_date if change is not None else equipment.assignment_date
+        if start is None and equipment.created_at is not None:
+            start = equipment.created_at.date()
+        if start is not None and start > on:
+            return None
+
+        if change is not None:
+            return self._closed_period(change, equipment.equipment_id)
+        return self._open_period(equipment)
+
+    @replica_read
+    def equipment_on(self, user: str, on: date) -> List[AssignmentPeriod]:
+        """Get the assignments a user had at the end of the given day.
+
+        Equipment soft-deleted by then is left out. Ordered by equipment_id.
+        """
+        # Still in the inventory at the end of the day
+        present = or_(Equipment.is_deleted == False, Equipment.deleted_at >= _end_of_day(on))
+        # Recorded by then, for periods whose start is unknown
+        recorded = Equipment.created_at < _end_of_day(on)
+
+        # Periods that ended after the day, where no earlier change did
+        earlier = aliased(AssignmentHistory)
+        past = self.db.execute(
+            select(AssignmentHistory, Equipment.equipment_id)
+            .join(Equipment, Equipment.id == AssignmentHistory.equipment_id)
+            .where(
+                AssignmentHistory.previous_user == user,
+                AssignmentHistory.end_date > on,
+                or_(
+                    and_(AssignmentHistory.start_date.is_(None), recorded),
+                    AssignmentHistory.start_date <= on,
+                ),
+                ~exists().where(
+                    earlier.equipment_id == AssignmentHistory.equipment_id,
+                    earlier.end_date > on,
+                    or_(
+                        earlier.end_date < AssignmentHistory.end_date,
+                        and_(
+                            earlier.end_date == AssignmentHistory.end_date,
+                            earlier.id < AssignmentHistory.id,
+                        ),
+                    ),
+                ),
+                present,
+            )
+        ).all()
+
+        # Current assignments that have not changed since the day
+        current = self.db.scalars(
+            select(Equipment).where(
+                Equipment.primary_user == user,
+                or_(
+                    and_(Equipment.assignment_date.is_(None), recorded),
+                    Equipment.assignment_date <= on,
+                ),
+                ~exists().where(
+                    AssignmentHistory.equipment_id == Equipment.id,
+                    AssignmentHistory.end_date > on,
+                ),
+                present,
+            )
+        ).all()
+
+        periods = [self._closed_period(change, equipment_id) for change, equipment_id in past]
+        periods += [self._open_period(equipment) for equipment in current]
+        return sorted(periods, key=lambda period: period.equipment_id)
+
+    @replica_read
+    def user_history(self, user: str) -> List[AssignmentPeriod]:
+        """Get every assignment a user has had, newest first.
+
+        Current assignments (of equipment not soft-deleted) come first,
+        followed by past ones ordered by end_date DESC.
+        """
+        current = self.db.scalars(
+            select(Equipment)
+            .where(Equipment.primary_user == user, Equipment.is_deleted == False)
+            .order_by(Equipment.assignment_date.desc(), Equipment.equipment_id)
+        ).all()
+
+        past = self.db.execute(
+            select(AssignmentHistory, Equipment.equipment_id)
+            .join(Equipment, Equipment.id == AssignmentHistory.equipment_id)
+            .where(AssignmentHistory.previous_user == user)
+            .order_by(AssignmentHistory.end_date.desc(), AssignmentHistory.id.desc())
+        ).all()
+
+        return (
+            [self._open_period(equipment) for equipment in current]
+            + [self._closed_period(change, equipment_id) for change, equipment_id in past]
+        )
+
+    @staticmethod
+    def _closed_period(change: AssignmentHistory, equipment_id: str) -> AssignmentPeriod:
+        """Describe the assignment a history row closed."""
+        return AssignmentPeriod(
+            equipment_id=equipment_id,
+            user=change.previous_user,
+            usage_type=change.previous_usage_type,
+            equipment_name=change.previous_equipment_name,
+            start_date=change.start_date,
+            end_date=change.end_date,
+        )
+
+    @staticmethod
+    def _open_period(equipment: Equipment) -> AssignmentPeriod:
+        """Describe a device's current assignment."""
+        return AssignmentPeriod(
+            equipment_id=equipment.equipment_id,
+            user=equipment.primary_user,
+            usage_type=equipment.usage_type,
+            equipment_name=equipment.equipment_name,
+            start_date=equipment.assignment_date,
+            end_date=None,
+        )
+
+
+class AsyncAssignmentService:
+    """Async counterpart of AssignmentService for an AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def holder_on(self, equipment: Equipment, on: date) -> Optional[AssignmentPeriod]:
+        """Get the assignment a device was in at the end of the given day."""
+        return await self.db.run_sync(lambda session: AssignmentService(session).holder_on(equipment, on))
+
+    async def equipment_on(self, user: str, on: date) -> List[AssignmentPeriod]:
+        """Get the assignments a user had at the end of the given day."""
+        return await self.db.run_sync(lambda session: AssignmentService(session).equipment_on(user, on))
+
+    async def user_history(self, user: str) -> List[AssignmentPeriod]:
+        """Get every assignment a user has had, newest first."""
+        return await self.db.run_sync(lambda session: AssignmentService(session).user_history(user))
@@ -0,0 +1,85 @@
+"""What committed writes changed, for the live change stream.
+
+The change stream (see change_stream.py) learns about writes by following
+the changes feed, which records only that a row changed and when. Write
+paths add what they know on top: the operation and the fields it set.
+Hints are kept only while a stream is listening, are bounded, and are
+purely descriptive; a write with no hint is still streamed, as an update
+(or delete) of every field.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional, Sequence, Tuple
+
+# Operations reported in change events
+CREATE = "create"
+UPDATE = "update"
+DELETE = "delete"
+RESTORE = "restore"
+
+# Fields set by a soft delete or restore
+DELETE_FIELDS = ("is_deleted", "deleted_at")
+
+# Hints kept for the stream to pick up; older ones are dropped
+MAX_HINTS = 50_000
+
+# (equipment_id, op, changed field names or None for every field)
+Change = Tuple[str, str, Optional[Iterable[str]]]
+Hint = Tuple[str, Optional[Tuple[str, ...]]]
+
+
+class ChangeHints:
+    """Thread-safe record of recent writes by (equipment_id, change_seq)."""
+
+    def __init__(self, max_hints: int = MAX_HINTS):
+        self.max_hints = max_hints
+        self._hints: "OrderedDict[Tuple[str, int], Hint]" = OrderedDict()
+        self._listener: Optional[Callable[[], None]] = None
+        self._lock = threading.Lock()
+
+    def listen(self, listener: Optional[Callable[[], None]]) -> None:
+        """Start (or with None, stop) keeping hints and calling listener on each write.
+
+        The listener may be called from any thread.
+        """
+        with self._lock:
+            self._listener = listener
+            if listener is None:
+                self._hints.clear()
+
+    def record(self, change_seq: int, changes: Iterable[Change]) -> None:
+        """Note the changes a write committed as change_seq."""
+        with self._lock:
+            listener = self._listener
+            if listener is None:
+                return
+            for equipment_id, op, fields in changes:
+                self._hints[(equipment_id, change_seq)] = (
+                    op, tuple(fields) if fields is not None else None
+                )
+            while len(self._hints) > self.max_hints:
+                self._hints.popitem(last=False)
+        listener()
+
+    def take(self, equipment_id: str, change_seq: int) -> Optional[Hint]:
+        """Remove and return the hint for one write, if there is one."""
+        with self._lock:
+            return self._hints.pop((equipment_id, change_seq), None)
+
+    def discard_through(self, change_seq: int) -> None:
+        """Drop hints for writes up to change_seq, which can no longer be matched."""
+        with self._lock:
+            while self._hints:
+                key = next(iter(self._hints))
+                if key[1] > change_seq:
+                    break
+                del self._hints[key]
+
+
+change_hints = ChangeHints()
+
+
+def field_names(values: dict, exclude: Sequence[str] = ("id",)) -> Tuple[str, ...]:
+    """Names of the fields set by a dict of column values."""
+    return tuple(name for name in values if name not in exclude)
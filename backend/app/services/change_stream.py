@@ -0,0 +1,322 @@
+"""Live equipment change events for connected clients.
+
+One poller per process follows the changes feed (EquipmentService
+.get_changes) and appends an event per changed record to a bounded
+buffer, encoded once as a Server-Sent Events frame. Every connected
+client reads the same buffer from its own position, so fanning an event
+out to hundreds of clients costs one append and one wake-up. Because the
+feed is read from the database, writes made through any worker reach the
+clients of every worker; writes made in this process also wake the poller
+at once and describe what they changed (see change_hints.py).
+
+Event ids are changes feed cursors. A client reconnecting with one, or
+one too slow to keep its place in the buffer, is caught up from the
+changes feed and then continues live, so a slow client never holds back
+the others or grows memory, and a reconnect never loses a change.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+from typing import AsyncIterator, Deque, List, Optional, Tuple
+
+import orjson
+
+from ..database import AsyncSessionLocal
+from ..metrics import registry
+from ..models import Equipment
+from ..schemas import EquipmentChange
+from .change_hints import DELETE, UPDATE, change_hints
+from .equipment_service import AsyncEquipmentService, decode_change_cursor, encode_change_cursor
+from .pagination import MAX_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Defaults, overridable from the environment
+CHANGE_STREAM_POLL_SECONDS = float(os.getenv("CHANGE_STREAM_POLL_SECONDS", "1"))
+CHANGE_STREAM_BUFFER = int(os.getenv("CHANGE_STREAM_BUFFER", "10000"))
+CHANGE_STREAM_MAX_CLIENTS = int(os.getenv("CHANGE_STREAM_MAX_CLIENTS", "1000"))
+
+# Comment sent to idle clients so proxies keep the connection open
+HEARTBEAT_SECONDS = 15.0
+
+# How long the poller keeps running with no clients connected
+IDLE_SECONDS = 60.0
+
+# Reconnect delay suggested to EventSource clients
+RETRY_MILLISECONDS = 3000
+
+# Events sent to a client per write
+MAX_BATCH_EVENTS = 500
+
+# Event fields that identify the record rather than describe the change
+EVENT_KEY_FIELDS = ("id", "equipment_id", "change_seq")
+
+# A position in the changes feed: (change_seq, id)
+Key = Tuple[int, int]
+
+
+class StreamFullError(RuntimeError):
+    """Raised when the process already serves its maximum number of clients."""
+
+
+class ChangeStream:
+    """Fans equipment change events out to the clients of one process."""
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        poll_seconds: float = CHANGE_STREAM_POLL_SECONDS,
+        buffer_size: int = CHANGE_STREAM_BUFFER,
+        max_clients: int = CHANGE_STREAM_MAX_CLIENTS,
+    ):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.max_clients = max_clients
+        self._events: Deque[Tuple[Key, bytes]] = deque(maxlen=buffer_size)
+        # Every event after this position is in the buffer (None: since the start)
+        self._floor: Optional[Key] = None
+        # Buffer position of the next event, counted since the poller started
+        self._next_index = 0
+        self._clients = 0
+        self._idle_since = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+        self._starting = asyncio.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._published: Optional[asyncio.Event] = None
+        self.events = 0
+        self.catch_ups = 0
+        self.lagged = 0
+
+    @staticmethod
+    def parse_cursor(cursor: str) -> Key:
+        """Decode a client's cursor. Raises InvalidCursorError if it is malformed."""
+        return decode_change_cursor(cursor)
+
+    async def open(self, after: Optional[Key] = None) -> AsyncIterator[bytes]:
+        """Connect a client and get its stream of SSE frames.
+
+        With after, the stream starts with every change since that feed
+        position; otherwise it starts with the changes from now on. Raises
+        StreamFullError if max_clients are already connected.
+        """
+        if self._clients >= self.max_clients:
+            raise StreamFullError("Too many clients connected to the change stream")
+        await self._ensure_running()
+        self._clients += 1
+        return self._follow(after)
+
+    async def close(self) -> None:
+        """Stop the poller."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def _ensure_running(self) -> None:
+        """Start the poller at the current end of the feed, unless it is running."""
+        async with self._starting:
+            if self._task is not None:
+                return
+            async with self.session_factory() as db:
+                cursor = await AsyncEquipmentService(db).get_change_cursor()
+            self._events.clear()
+            self._floor = decode_change_cursor(cursor) if cursor else None
+            self._next_index = 0
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._published = asyncio.Event()
+            change_hints.listen(self._wake_from_any_thread)
+            self._task = self._loop.create_task(self._run())
+
+    def _wake_from_any_thread(self) -> None:
+        """Poll right away; called by change_hints after a local write."""
+        loop, wake = self._loop, self._wake
+        if loop is not None and wake is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(wake.set)
+
+    async def _run(self) -> None:
+        """Poll the changes feed until no client has been connected for a while."""
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                if not self._clients and time.monotonic() - self._idle_since > IDLE_SECONDS:
+                    break
+                try:
+                    await self._poll()
+                except Exception:
+                    logger.exception("Polling the changes feed failed")
+        finally:
+            change_hints.listen(None)
+            self._task = None
+
+    async def _poll(self) -> None:
+        """Append an event for every change after the end of the buffer."""
+        head = self._head()
+        cursor = encode_change_cursor(head) if head else None
+        while True:
+            async with self.session_factory() as db:
+                rows, cursor, has_more = await AsyncEquipmentService(db).get_changes(
+                    cursor, MAX_PAGE_SIZE
+                )
+            if rows:
+                self._publish([
+                    self._event(row, change_hints.take(row.equipment_id, row.change_seq))
+                    for row in rows
+                ])
+                change_hints.discard_through(rows[-1].change_seq)
+            if not has_more:
+                return
+
+    def _publish(self, events: List[Tuple[Key, bytes]]) -> None:
+        """Append events to the buffer and wake every waiting client."""
+        for event in events:
+            if len(self._events) == self._events.maxlen:
+                self._floor = self._events[0][0]
+            self._events.append(event)
+        self._next_index += len(events)
+        self.events += len(events)
+        self._published.set()
+        self._published = asyncio.Event()
+
+    def _head(self) -> Optional[Key]:
+        """Feed position of the newest event seen."""
+        return self._events[-1][0] if self._events else self._floor
+
+    def _first_index(self) -> int:
+        return self._next_index - len(self._events)
+
+    def _locate(self, after: Optional[Key]) -> Optional[int]:
+        """Buffer position of the first event after a feed position.
+
+        Returns None if events after it have already left the buffer.
+        """
+        if after is None:
+            return self._first_index() if self._floor is None else None
+        if self._floor is not None and after < self._floor:
+            return None
+        keys = [key for key, _ in self._events]
+        return self._first_index() + bisect_right(keys, after)
+
+    @staticmethod
+    def _event(row: Equipment, hint=None) -> Tuple[Key, bytes]:
+        """Encode a changed record as an SSE frame.
+
+        Without a hint the event reports every field, as an update or, for
+        a soft-deleted record, a delete.
+        """
+        record = EquipmentChange.model_validate(row).model_dump(mode="json")
+        op, fields = hint or (DELETE if row.is_deleted else UPDATE, None)
+        if fields is None:
+            fields = [name for name in record if name not in EVENT_KEY_FIELDS]
+        key = (row.change_seq, row.id)
+        data = {
+            "op": op,
+            "id": row.id,
+            "equipment_id": row.equipment_id,
+            "change_seq": row.change_seq,
+            "fields": {name: record[name] for name in fields if name in record},
+        }
+        frame = (
+            f"id: {encode_change_cursor(key)}\nevent: change\ndata: ".encode()
+            + orjson.dumps(data)
+            + b"\n\n"
+        )
+        return key, frame
+
+    async def _follow(self, after: Optional[Key]) -> AsyncIterator[bytes]:
+        """Yield SSE frames for one client until it disconnects."""
+        try:
+            yield f"retry: {RETRY_MILLISECONDS}\n\n".encode()
+            if after is None:
+                # Start live, and tell the client where to reconnect from
+                after = self._head()
+                position = self._next_index
+                ready = {"cursor": encode_change_cursor(after) if after else None}
+                event_id = f"id: {ready['cursor']}\n" if after else ""
+                yield f"{event_id}event: ready\ndata: ".encode() + orjson.dumps(ready) + b"\n\n"
+            else:
+                position = self._locate(after)
+
+            while True:
+                if position is not None and position < self._first_index():
+                    # Fell out of the buffer while sending; catch up from the feed
+                    self.lagged += 1
+                    position = self._locate(after)
+
+                if position is None:
+                    self.catch_ups += 1
+                    async for frames, after in self._catch_up(after):
+                        yield frames
+                    position = self._locate(after)
+                    if position is None:
+                        # The feed read lags the poller's (another replica); retry shortly
+                        await asyncio.sleep(self.poll_seconds)
+                    continue
+
+                if position < self._next_index:
+                    start = position - self._first_index()
+                    batch = list(islice(self._events, start, start + MAX_BATCH_EVENTS))
+                    position += len(batch)
+                    frames = [frame for key, frame in batch if after is None or key > after]
+                    if frames:
+                        after = batch[-1][0]
+                        yield b"".join(frames)
+                    continue
+
+                published = self._published
+                try:
+                    await asyncio.wait_for(published.wait(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            self._clients -= 1
+            if not self._clients:
+                self._idle_since = time.monotonic()
+
+    async def _catch_up(self, after: Optional[Key]) -> AsyncIterator[Tuple[bytes, Key]]:
+        """Yield (frames, position) for the changes after a feed position, page by page.
+
+        Each page is read in its own short session, so a slow client holds
+        no connection while it drains.
+        """
+        cursor = encode_change_cursor(after) if after else None
+        while True:
+            async with self.session_factory() as db:
+                rows, cursor, has_more = await AsyncEquipmentService(db).get_changes(
+                    cursor, MAX_PAGE_SIZE
+                )
+            if rows:
+                events = [self._event(row) for row in rows]
+                yield b"".join(frame for _, frame in events), events[-1][0]
+            if not has_more:
+                return
+
+    def metric_families(self, prefix: str):
+        """Describe the stream's state as metric families for metrics.Registry."""
+        return [
+            (f"{prefix}_clients", "gauge", "Clients connected to the change stream.",
+             [({}, self._clients)]),
+            (f"{prefix}_events_total", "counter", "Change events published.",
+             [({}, self.events)]),
+            (f"{prefix}_catch_ups_total", "counter",
+             "Times a client was caught up from the changes feed.", [({}, self.catch_ups)]),
+            (f"{prefix}_lagged_total", "counter",
+             "Times a client fell behind the event buffer.", [({}, self.lagged)]),
+        ]
+
+
+change_stream = ChangeStream()
+
+registry.register_collector(lambda: change_stream.metric_families("equipment_change_stream"))
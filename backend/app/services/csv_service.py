@@ -2,15 +2,23 @@
 
 import csv
 import io
+from collections import Counter
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
-from typing import List, Dict, Any
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, TextIO
 
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from ..database import is_lock_timeout
 from ..models import Equipment, EquipmentType, ComputerSubtype, Status, UsageType
 from ..schemas import ImportResult, ImportError
 from .equipment_service import EquipmentService
+from .fleet_summary import SUMMARY_FIELDS, FleetSummary
+from .change_hints import CREATE, RESTORE, UPDATE, change_hints, field_names
+from .generation import stamp_changes
+from .ngram_index import NGRAM_FIELDS, NgramIndex, replaced_values
 
 
 # CSV column to database field mapping
@@ -61,46 +69,125 @@ EXPORT_FIELDS = [
     'assignment_date', 'primary_user', 'usage_type', 'status', 'notes',
 ]
 
+# Rows fetched per database round trip during export
+EXPORT_CHUNK_ROWS = 1000
+
+# Unique rows written per import transaction
+IMPORT_CHUNK_SIZE = 500
+
+
+class ImportProgress:
+    """Live counters of an import, reported as it advances.
+
+    CSVService.import_from_stream fills these in and calls report() every
+    chunk_size rows while counting the file and after every chunk it
+    imports. Subclasses override report() to observe the import, and can
+    stop it between chunks by raising; chunks already committed are kept.
+    """
+
+    def __init__(self):
+        self.rows_parsed = 0
+        # Unique rows to import, known once the file has been counted
+        self.rows_to_import: Optional[int] = None
+        self.rows_imported = 0
+        self.result: Optional[ImportResult] = None
+
+    def report(self) -> None:
+        """Called whenever the counters advance."""
+
+
+class EquipmentIdBlocks:
+    """Hands out new equipment IDs for one import chunk.
+
+    The first request for a type reserves one block sized to the number of
+    rows of that type in the chunk, so each type costs one round trip. IDs
+    left over once the chunk is planned are released again.
+    """
+
+    def __init__(
+        self,
+        equipment_service: EquipmentService,
+        rows: List[tuple[str, int, Dict[str, Any]]],
+    ):
+        self.equipment_service = equipment_service
+        self.rows_per_type = Counter(data.get('equipment_type') for _, _, data in rows)
+        self.blocks: Dict[EquipmentType, List[tuple[str, int]]] = {}
+        self.used: Counter = Counter()
+
+    def next(self, equipment_type: EquipmentType) -> tuple[str, int]:
+        """Get the next unused (equipment_id, equipment_id_num) for a type."""
+        if equipment_type not in self.blocks:
+            self.blocks[equipment_type] = self.equipment_service.reserve_equipment_ids(
+                equipment_type,
+                self.rows_per_type[equipment_type.value],
+            )
+        block = self.blocks[equipment_type]
+        self.used[equipment_type] += 1
+        return block[self.used[equipment_type] - 1]
+
+    def release_unused(self) -> None:
+        """Return the unused tail of every reserved block."""
+        for equipment_type, block in self.blocks.items():
+            self.equipment_service.release_equipment_ids(
+                equipment_type,
+                len(block) - self.used[equipment_type],
+            )
+
 
 class CSVService:
     """Service for CSV import/export operations."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, chunk_size: int = IMPORT_CHUNK_SIZE):
         self.db = db
+        self.chunk_size = chunk_size
         self.equipment_service = EquipmentService(db)
 
     def export_to_csv(self, equipment_list: List[Equipment]) -> str:
         """Export equipment list to CSV string."""
-        output = io.StringIO()
-        writer = csv.writer(output)
+        return ''.join(self.iter_csv(equipment_list))
+
+    def iter_csv(self, equipment_rows: Iterable[Equipment], header: bool = True) -> Iterator[str]:
+        """Yield CSV text one line at a time, starting with the header."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+
+        def take_line() -> str:
+            line = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return line
 
         # Write header
-        headers = [FIELD_CSV_MAP.get(f, f) for f in EXPORT_FIELDS]
-        writer.writerow(headers)
+        if header:
+            writer.writerow([FIELD_CSV_MAP.get(f, f) for f in EXPORT_FIELDS])
+            yield take_line()
 
         # Write data rows
-        for equipment in equipment_list:
-            row = []
-            for field in EXPORT_FIELDS:
-                value = getattr(equipment, field, None)
-
-                # Handle enum values
-                if hasattr(value, 'value'):
-                    value = value.value
-                # Handle date/datetime
-                elif isinstance(value, (date, datetime)):
-                    value = value.isoformat()
-                # Handle Decimal
-                elif isinstance(value, Decimal):
-                    value = str(value)
-                # Handle None
-                elif value is None:
-                    value = ''
-
-                row.append(value)
-            writer.writerow(row)
-
-        return output.getvalue()
+        for equipment in equipment_rows:
+            writer.writerow(self._export_row(equipment))
+            yield take_line()
+
+    def _export_row(self, equipment: Equipment) -> List[Any]:
+        """Convert an equipment record into a list of CSV cell values."""
+        row = []
+        for field in EXPORT_FIELDS:
+            value = getattr(equipment, field, None)
+
+            # Handle enum values
+            if hasattr(value, 'value'):
+                value = value.value
+            # Handle date/datetime
+            elif isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            # Handle Decimal
+            elif isinstance(value, Decimal):
+                value = str(value)
+            # Handle None
+            elif value is None:
+                value = ''
+
+            row.append(value)
+        return row
 
     def import_from_csv(self, csv_content: str) -> ImportResult:
         """Import equipment from CSV content.
@@ -108,6 +195,23 @@ class CSVService:
         Creates new records or updates existing by serial number.
         Restores soft-deleted records if serial number matches.
         """
+        return self.import_from_stream(io.StringIO(csv_content))
+
+    def import_from_stream(
+        self,
+        stream: TextIO,
+        progress: Optional[ImportProgress] = None,
+    ) -> ImportResult:
+        """Import equipment from a seekable text stream of CSV data.
+
+        The stream is read twice so that rows never need to be held in
+        memory. The first pass only records, for each unique key, the row
+        number of its last occurrence. The second pass re-parses the stream
+        and imports the surviving rows in chunks, in file order.
+
+        With progress, its counters are kept up to date as both passes
+        advance; see ImportProgress.
+        """
         result = ImportResult(
             total_rows=0,
             created=0,
@@ -116,52 +220,197 @@ class CSVService:
             failed=0,
             errors=[],
         )
+        if progress is None:
+            progress = ImportProgress()
+        progress.result = result
 
-        reader = csv.DictReader(io.StringIO(csv_content))
+        start = stream.tell()
 
-        # Track serial numbers to handle duplicates (use last occurrence)
-        rows_by_serial: Dict[str, tuple[int, Dict[str, Any]]] = {}
-
-        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
+        # Track the last occurrence of each unique key (last occurrence wins)
+        last_row_by_key: Dict[str, int] = {}
+        for row_num, data in self._iter_import_rows(stream):
             result.total_rows += 1
+            last_row_by_key[self._import_key(row_num, data)] = row_num
+            if result.total_rows % self.chunk_size == 0:
+                progress.rows_parsed = result.total_rows
+                progress.report()
+
+        progress.rows_parsed = result.total_rows
+        progress.rows_to_import = len(last_row_by_key)
+        progress.report()
+        stream.seek(start)
+
+        # Process unique rows in chunk-sized transactions
+        chunk: List[tuple[str, int, Dict[str, Any]]] = []
+        for row_num, data in self._iter_import_rows(stream):
+            key = self._import_key(row_num, data)
+            if last_row_by_key[key] != row_num:
+                continue
+
+            chunk.append((key, row_num, data))
+            if len(chunk) >= self.chunk_size:
+                self._import_chunk(chunk, result)
+                progress.rows_imported += len(chunk)
+                progress.report()
+                chunk = []
+
+        if chunk:
+            self._import_chunk(chunk, result)
+            progress.rows_imported += len(chunk)
+            progress.report()
 
+        return result
+
+    @staticmethod
+    def _iter_import_rows(stream: TextIO) -> Iterator[tuple[int, Dict[str, Any]]]:
+        """Yield (row_num, data) for each CSV row mapped to database fields."""
+        reader = csv.DictReader(stream)
+
+        for row_num, row in enumerate(reader, start=2):  # Start at 2 (header is row 1)
             # Map CSV columns to database fields
             data = {}
             for csv_col, db_field in CSV_FIELD_MAP.items():
                 if csv_col in row and row[csv_col]:
                     data[db_field] = row[csv_col]
 
-            # Use equipment_id as primary key if available, otherwise serial_number
-            equipment_id = data.get('equipment_id')
-            serial_number = data.get('serial_number')
+            yield row_num, data
 
-            # Determine unique key for deduplication (equipment_id preferred, then serial_number)
-            unique_key = equipment_id or serial_number or f"row_{row_num}"
+    @staticmethod
+    def _import_key(row_num: int, data: Dict[str, Any]) -> str:
+        """Get the unique key used to deduplicate import rows.
 
-            # Track by unique key (last occurrence wins)
-            rows_by_serial[unique_key] = (row_num, data)
+        Equipment ID is preferred, then serial number, then the row itself.
+        """
+        return data.get('equipment_id') or data.get('serial_number') or f"row_{row_num}"
 
-        # Process unique serial numbers
-        for serial_number, (row_num, data) in rows_by_serial.items():
+    def _import_chunk(
+        self,
+        rows: List[tuple[str, int, Dict[str, Any]]],
+        result: ImportResult,
+    ) -> None:
+        """Import one chunk of deduplicated rows in a single transaction.
+
+        Existing records referenced by the chunk are prefetched with IN
+        queries, new equipment IDs are reserved per type in one block, and
+        the resulting inserts and updates are executed as bulk statements.
+        If the bulk write fails, the chunk is replayed one record at a time so
+        that only the offending rows are reported as failed. A lock wait that
+        times out is raised instead, as it is no fault of the rows; earlier
+        chunks stay committed.
+        """
+        existing_by_id, existing_by_serial = self._prefetch_existing(rows)
+        # Planning mutates the prefetched state; keep the originals for the summary
+        originals = {r['id']: dict(r) for r in existing_by_id.values()}
+        id_blocks = EquipmentIdBlocks(self.equipment_service, rows)
+
+        operations: List[Dict[str, Any]] = []
+        updates_by_pk: Dict[int, Dict[str, Any]] = {}
+
+        for key, row_num, data in rows:
             try:
-                self._process_import_row(row_num, data, result)
+                self._plan_import_row(
+                    key, row_num, data,
+                    existing_by_id, existing_by_serial,
+                    operations, updates_by_pk,
+                    id_blocks.next,
+                )
             except Exception as e:
-                result.failed += 1
-                result.errors.append(ImportError(
-                    row=row_num,
-                    serial_number=serial_number,
-                    error=str(e),
-                ))
-
-        return result
+                if is_lock_timeout(e):
+                    self.db.rollback()
+                    raise
+                self._record_failure(result, row_num, key, e)
+
+        id_blocks.release_unused()
+
+        try:
+            inserts = [op['values'] for op in operations if op['kind'] == 'insert']
+            updates = [
+                op['values'] for op in operations
+                if op['kind'] == 'update' and len(op['values']) > 1
+            ]
+            if inserts:
+                self.db.execute(insert(Equipment), inserts)
+            if updates:
+                self.db.execute(update(Equipment), updates)
+            ngram_index = NgramIndex(self.db)
+            ngram_index.add_records(op['values'] for op in operations)
+            ngram_index.prune(self._replaced_values(updates, originals))
+            self._summarize(operations, originals).apply()
+            if inserts or updates:
+                change_seq = stamp_changes(
+                    self.db,
+                    ids=[values['id'] for values in updates],
+                    equipment_ids=[values['equipment_id'] for values in inserts],
+                )
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            if is_lock_timeout(e):
+                raise
+            self._replay_operations(operations, originals, result)
+            return
+
+        if inserts or updates:
+            change_hints.record(change_seq, [
+                self._change(op, originals) for op in operations
+                if op['kind'] == 'insert' or len(op['values']) > 1
+            ])
+
+        for op in operations:
+            self._record_success(result, op)
+
+    def _prefetch_existing(
+        self,
+        rows: List[tuple[str, int, Dict[str, Any]]],
+    ) -> tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """Load existing records referenced by equipment ID or serial number.
 
-    def _process_import_row(
+        Returns (by_equipment_id, by_serial_number) maps of lightweight record
+        state dicts (with the fields the fleet summary and the n-gram index
+        need), including soft-deleted records.
+        """
+        equipment_ids = {data['equipment_id'] for _, _, data in rows if data.get('equipment_id')}
+        serial_numbers = {data['serial_number'] for _, _, data in rows if data.get('serial_number')}
+
+        columns = (
+            Equipment.id,
+            Equipment.equipment_id,
+            Equipment.serial_number,
+            *(getattr(Equipment, field) for field in dict.fromkeys(SUMMARY_FIELDS + NGRAM_FIELDS)),
+        )
+        records: Dict[int, Dict[str, Any]] = {}
+        if equipment_ids:
+            for row in self.db.execute(
+                select(*columns).where(Equipment.equipment_id.in_(equipment_ids))
+            ):
+                records[row.id] = dict(row._mapping)
+        if serial_numbers:
+            for row in self.db.execute(
+                select(*columns).where(Equipment.serial_number.in_(serial_numbers))
+            ):
+                records[row.id] = dict(row._mapping)
+
+        by_id = {r['equipment_id']: r for r in records.values()}
+        by_serial = {r['serial_number']: r for r in records.values() if r['serial_number']}
+        return by_id, by_serial
+
+    def _plan_import_row(
         self,
+        key: str,
         row_num: int,
         data: Dict[str, Any],
-        result: ImportResult,
+        existing_by_id: Dict[str, Dict[str, Any]],
+        existing_by_serial: Dict[str, Dict[str, Any]],
+        operations: List[Dict[str, Any]],
+        updates_by_pk: Dict[int, Dict[str, Any]],
+        next_equipment_id: Callable[[EquipmentType], tuple[str, int]],
     ) -> None:
-        """Process a single import row."""
+        """Resolve a single row into an insert or update operation.
+
+        Rows are resolved in order against the prefetched records and the
+        operations already planned for this chunk, so a later row that
+        matches an earlier one updates it, as sequential processing would.
+        """
         equipment_id = data.get('equipment_id')
         serial_number = data.get('serial_number')
 
@@ -171,38 +420,45 @@ class CSVService:
         # Check if equipment exists - try Equipment ID first, then Serial Number
         existing = None
         if equipment_id:
-            existing = self.equipment_service.get_by_equipment_id(
-                equipment_id,
-                include_deleted=True,
-            )
+            existing = existing_by_id.get(equipment_id)
         if not existing and serial_number:
-            existing = self.equipment_service.get_by_serial(
-                serial_number,
-                include_deleted=True,
-            )
+            existing = existing_by_serial.get(serial_number)
 
         if existing:
-            # Update existing record
-            was_deleted = existing.is_deleted
-
-            # Restore if soft-deleted
-            if was_deleted:
-                existing.is_deleted = False
-                existing.deleted_at = None
-                result.restored += 1
+            claimed_by = existing_by_serial.get(serial_number) if serial_number else None
+            if claimed_by is not None and claimed_by is not existing:
+                raise ValueError(f"Serial number '{serial_number}' already exists")
+
+            if 'op' in existing:
+                # Matches a record created earlier in this chunk
+                op = existing['op']
+                outcome = 'updated'
             else:
-                result.updated += 1
+                op = updates_by_pk.get(existing['id'])
+                if op is None:
+                    op = {'kind': 'update', 'values': {'id': existing['id']}, 'rows': []}
+                    updates_by_pk[existing['id']] = op
+                    operations.append(op)
+
+                # Restore if soft-deleted
+                if existing['is_deleted']:
+                    existing['is_deleted'] = False
+                    op['values'].update(is_deleted=False, deleted_at=None)
+                    outcome = 'restored'
+                else:
+                    outcome = 'updated'
 
             # Update fields (except equipment_id which is auto-generated, and equipment_type which is immutable)
             for field, value in processed_data.items():
                 if field not in ('equipment_id', 'equipment_type'):
-                    setattr(existing, field, value)
+                    op['values'][field] = value
 
-            # Also update serial_number if provided (but not equipment_type)
-            if serial_number and existing.serial_number != serial_number:
-                existing.serial_number = serial_number
+            if serial_number and existing.get('serial_number') != serial_number:
+                existing_by_serial.pop(existing.get('serial_number'), None)
+                existing['serial_number'] = serial_number
+                existing_by_serial[serial_number] = existing
 
-            self.db.commit()
+            op['rows'].append((row_num, key, outcome))
         else:
             # Create new record
             equipment_type = processed_data.get('equipment_type')
@@ -215,23 +471,126 @@ class CSVService:
             except ValueError:
                 raise ValueError(f'Invalid Equipment Type: {equipment_type}')
 
-            new_equipment_id, equipment_id_num = self.equipment_service.generate_equipment_id(eq_type)
+            new_equipment_id, equipment_id_num = next_equipment_id(eq_type)
 
-            equipment = Equipment(
-                equipment_id=new_equipment_id,
-                equipment_id_num=equipment_id_num,
-                serial_number=serial_number if serial_number else None,
-                equipment_type=eq_type,
-            )
+            values = {
+                'equipment_id': new_equipment_id,
+                'equipment_id_num': equipment_id_num,
+                'serial_number': serial_number if serial_number else None,
+                'equipment_type': eq_type,
+            }
 
             # Set other fields
             for field, value in processed_data.items():
                 if field not in ('equipment_id', 'serial_number', 'equipment_type'):
-                    setattr(equipment, field, value)
+                    values[field] = value
 
-            self.db.add(equipment)
-            self.db.commit()
-            result.created += 1
+            op = {'kind': 'insert', 'values': values, 'rows': [(row_num, key, 'created')]}
+            operations.append(op)
+
+            state = {'op': op, 'serial_number': values['serial_number']}
+            existing_by_id[new_equipment_id] = state
+            if serial_number:
+                existing_by_serial[serial_number] = state
+
+    def _summarize(
+        self,
+        operations: List[Dict[str, Any]],
+        originals: Dict[int, Dict[str, Any]],
+    ) -> FleetSummary:
+        """Collect the fleet summary changes made by planned operations."""
+        summary = FleetSummary(self.db)
+        for op in operations:
+            if op['kind'] == 'insert':
+                summary.add(op['values'])
+            else:
+                summary.replace(originals[op['values']['id']], op['values'])
+        return summary
+
+    def _replay_operations(
+        self,
+        operations: List[Dict[str, Any]],
+        originals: Dict[int, Dict[str, Any]],
+        result: ImportResult,
+    ) -> None:
+        """Execute planned operations one at a time after a failed bulk write.
+
+        Raises a lock wait that times out rather than failing the row.
+        """
+        for op in operations:
+            statement = insert(Equipment) if op['kind'] == 'insert' else update(Equipment)
+            if op['kind'] == 'update' and len(op['values']) == 1:
+                # Nothing to change beyond matching the record
+                self._record_success(result, op)
+                continue
+            if op['kind'] == 'insert':
+                # The rollback returned the chunk's reserved IDs
+                equipment_id, equipment_id_num = self.equipment_service.generate_equipment_id(
+                    op['values']['equipment_type']
+                )
+                op['values']['equipment_id'] = equipment_id
+                op['values']['equipment_id_num'] = equipment_id_num
+            try:
+                self.db.execute(statement, [op['values']])
+                ngram_index = NgramIndex(self.db)
+                ngram_index.add_records([op['values']])
+                if op['kind'] == 'update':
+                    ngram_index.prune(self._replaced_values([op['values']], originals))
+                self._summarize([op], originals).apply()
+                if op['kind'] == 'insert':
+                    change_seq = stamp_changes(self.db, equipment_ids=[op['values']['equipment_id']])
+                else:
+                    change_seq = stamp_changes(self.db, ids=[op['values']['id']])
+                self.db.commit()
+            except Exception as e:
+                self.db.rollback()
+                if is_lock_timeout(e):
+                    raise
+                for row_num, key, _ in op['rows']:
+                    self._record_failure(result, row_num, key, e)
+            else:
+                change_hints.record(change_seq, [self._change(op, originals)])
+                self._record_success(result, op)
+
+    @staticmethod
+    def _replaced_values(
+        updates: List[Dict[str, Any]],
+        originals: Dict[int, Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Get the indexed values replaced by update operations' values."""
+        return [replaced_values(originals[values['id']], values) for values in updates]
+
+    @staticmethod
+    def _change(
+        op: Dict[str, Any],
+        originals: Dict[int, Dict[str, Any]],
+    ) -> tuple[str, str, Optional[tuple[str, ...]]]:
+        """Describe a committed operation for the change stream."""
+        if op['kind'] == 'insert':
+            return op['values']['equipment_id'], CREATE, None
+        kind = RESTORE if op['values'].get('is_deleted') is False else UPDATE
+        return originals[op['values']['id']]['equipment_id'], kind, field_names(op['values'])
+
+    @staticmethod
+    def _record_success(result: ImportResult, op: Dict[str, Any]) -> None:
+        """Count the rows of a committed operation by outcome."""
+        for _, _, outcome in op['rows']:
+            setattr(result, outcome, getattr(result, outcome) + 1)
+
+    @staticmethod
+    def _record_failure(
+        result: ImportResult,
+        row_num: int,
+        key: str,
+        error: Exception,
+    ) -> None:
+        """Count a failed row and record its error."""
+        result.failed += 1
+        result.errors.append(ImportError(
+            row=row_num,
+            serial_number=key,
+            error=str(error),
+        ))
 
     def _convert_import_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Convert CSV string values to appropriate Python types."""
@@ -284,3 +643,28 @@ class CSVService:
                 result[field] = value
 
         return result
+
+
+class AsyncCSVService:
+    """Async counterpart of CSVService for an AsyncSession.
+
+    Streams exports of rows fetched on the async driver. Imports run as
+    import jobs on their own sync sessions instead; see services.import_jobs.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.csv_service = CSVService(db.sync_session)
+
+    async def stream_csv(
+        self,
+        equipment_chunks: AsyncIterable[List[Equipment]],
+    ) -> AsyncIterator[bytes]:
+        """Yield UTF-8 encoded CSV, one chunk per list of rows.
+
+        The header is flushed on its own so the first byte goes out before
+        any data rows are fetched.
+        """
+        yield ''.join(self.csv_service.iter_csv([])).encode('utf-8')
+        async for chunk in equipment_chunks:
+            yield ''.join(self.csv_service.iter_csv(chunk, header=False)).encode('utf-8')
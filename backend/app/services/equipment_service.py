@@ -1,19 +1,72 @@
 """Equipment service for business logic and database operations."""
 
 from datetime import date, datetime
-from typing import List, Optional
-from sqlalchemy import func, desc, asc
-from sqlalchemy.orm import Session
+from collections import Counter, defaultdict
+from typing import AsyncIterator, Dict, Iterable, List, Optional
+from sqlalchemy import func, desc, asc, insert, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
 
 from ..models import (
     Equipment,
     AssignmentHistory,
+    EquipmentIdSequence,
     EquipmentType,
     Status,
     UsageType,
     EQUIPMENT_TYPE_PREFIXES,
 )
-from ..schemas import EquipmentCreate, EquipmentUpdate
+from ..routing_session import read_from_replica, replica_read
+from ..schemas import (
+    AssignmentHistoryItem,
+    EquipmentCreate,
+    EquipmentUpdate,
+    BulkUpdateItem,
+    BulkItemResult,
+    BulkResult,
+    EquipmentHistory,
+    HistoryBatchResult,
+)
+from .change_hints import CREATE, DELETE, DELETE_FIELDS, RESTORE, UPDATE, change_hints, field_names
+from .fleet_summary import FleetSummary
+from .generation import bump_generation, stamp_changes
+from .ngram_index import NgramIndex, replaced_values
+from .result_cache import identifier_cache
+from .pagination import (
+    clamp_page_size,
+    decode_cursor,
+    encode_cursor,
+    keyset_predicate,
+    row_sort_key,
+)
+
+# AssignmentHistoryItem fields, in schema (and output) order
+HISTORY_FIELDS = list(AssignmentHistoryItem.model_fields)
+
+# Records whose assignment history is loaded per IN query
+HISTORY_BATCH_SIZE = 1000
+
+# Sort name recorded in changes feed cursors
+CHANGES_SORT = "change_seq"
+
+# Order of the changes feed
+CHANGES_KEY_COLUMNS = [Equipment.change_seq, Equipment.id]
+
+
+def encode_change_cursor(key: Iterable[int]) -> str:
+    """Encode a (change_seq, id) feed position as a changes feed cursor."""
+    return encode_cursor(CHANGES_SORT, "asc", list(key))
+
+
+def decode_change_cursor(cursor: str) -> tuple[int, int]:
+    """Decode a changes feed cursor into its (change_seq, id) position.
+
+    Raises InvalidCursorError if the cursor is malformed.
+    """
+    return tuple(decode_cursor(cursor, CHANGES_SORT, "asc", CHANGES_KEY_COLUMNS))
 
 
 class EquipmentService:
@@ -28,19 +81,84 @@ class EquipmentService:
         Returns tuple of (equipment_id, equipment_id_num).
         Format: {TYPE}-NNNN (e.g., PC-0001, MON-0001)
         """
+        return self.reserve_equipment_ids(equipment_type, 1)[0]
+
+    def reserve_equipment_ids(
+        self,
+        equipment_type: EquipmentType,
+        count: int,
+    ) -> List[tuple[str, int]]:
+        """Allocate a consecutive block of equipment IDs for one type.
+
+        Advances the type's row in equipment_id_sequence by count in a single
+        statement. The row stays locked until the caller's transaction ends,
+        so concurrent allocations (including from other workers) queue up
+        instead of colliding, and a rollback returns the block.
+
+        Returns a list of (equipment_id, equipment_id_num) tuples in order.
+        """
         prefix = EQUIPMENT_TYPE_PREFIXES[equipment_type]
 
-        # Get max number for this equipment type
-        result = self.db.query(func.max(Equipment.equipment_id_num)).filter(
-            Equipment.equipment_type == equipment_type
-        ).scalar()
+        last_num = self._advance_id_sequence(equipment_type, count)
+        if last_num is None:
+            self._create_id_sequence(equipment_type)
+            last_num = self._advance_id_sequence(equipment_type, count)
 
-        next_num = (result or 0) + 1
-        equipment_id = f"{prefix}-{next_num:04d}"
+        first_num = last_num - count + 1
+        return [
+            (f"{prefix}-{num:04d}", num)
+            for num in range(first_num, last_num + 1)
+        ]
 
-        return equipment_id, next_num
+    def release_equipment_ids(self, equipment_type: EquipmentType, count: int) -> None:
+        """Give back the last count IDs of a block reserved in this transaction.
 
-    def get_all(
+        Only valid before the transaction that reserved them ends, while the
+        sequence row is still locked.
+        """
+        if count > 0:
+            self._advance_id_sequence(equipment_type, -count)
+
+    def _advance_id_sequence(self, equipment_type: EquipmentType, count: int) -> Optional[int]:
+        """Add count to a type's sequence and return the new last value.
+
+        Returns None if the type has no sequence row yet.
+        """
+        statement = (
+            update(EquipmentIdSequence)
+            .where(EquipmentIdSequence.equipment_type == equipment_type)
+            .values(last_value=EquipmentIdSequence.last_value + count)
+        )
+
+        if self.db.get_bind().dialect.update_returning:
+            return self.db.execute(
+                statement.returning(EquipmentIdSequence.last_value)
+            ).scalar_one_or_none()
+
+        if self.db.execute(statement).rowcount == 0:
+            return None
+        return self.db.execute(
+            select(EquipmentIdSequence.last_value)
+            .where(EquipmentIdSequence.equipment_type == equipment_type)
+        ).scalar_one()
+
+    def _create_id_sequence(self, equipment_type: EquipmentType) -> None:
+        """Create a type's sequence row, starting after its highest existing ID."""
+        current = self.db.query(func.max(Equipment.equipment_id_num)).filter(
+            Equipment.equipment_type == equipment_type
+        ).scalar()
+
+        try:
+            with self.db.begin_nested():
+                self.db.add(EquipmentIdSequence(
+                    equipment_type=equipment_type,
+                    last_value=current or 0,
+                ))
+        except IntegrityError:
+            # Another transaction created it first
+            pass
+
+    def _list_query(
         self,
         status: Optional[Status] = None,
         equipment_type: Optional[EquipmentType] = None,
@@ -50,12 +168,22 @@ class EquipmentService:
         model: Optional[str] = None,
         min_rating: Optional[int] = None,
         max_rating: Optional[int] = None,
-        sort_by: str = "equipment_name",
-        sort_order: str = "asc",
         include_deleted: bool = False,
-    ) -> List[Equipment]:
-        """Get all equipment with optional filtering and sorting."""
-        query = self.db.query(Equipment)
+        columns: Optional[List[str]] = None,
+        sort_by: str = "equipment_name",
+    ):
+        """Build the filtered (unsorted) equipment list query.
+
+        When columns is given, only those columns (plus the sort key columns
+        for sort_by) are selected and the query yields rows instead of
+        Equipment objects.
+        """
+        if columns is None:
+            query = self.db.query(Equipment)
+        else:
+            selected = [getattr(Equipment, c) for c in columns]
+            selected += [c for c in self.sort_key_columns(sort_by) if c.key not in columns]
+            query = self.db.query(*selected)
 
         # Exclude soft-deleted unless requested
         if not include_deleted:
@@ -68,32 +196,157 @@ class EquipmentService:
             query = query.filter(Equipment.equipment_type == equipment_type)
         if usage_type:
             query = query.filter(Equipment.usage_type == usage_type)
-        if location:
-            query = query.filter(Equipment.location.ilike(f"%{location}%"))
-        if primary_user:
-            query = query.filter(Equipment.primary_user.ilike(f"%{primary_user}%"))
-        if model:
-            query = query.filter(Equipment.model.ilike(f"%{model}%"))
+        # Substring filters go through the n-gram index when the value is long enough
+        for field, value in (
+            ('location', location),
+            ('primary_user', primary_user),
+            ('model', model),
+        ):
+            if value:
+                clause = NgramIndex.filter_clause(field, value)
+                if clause is None:
+                    clause = getattr(Equipment, field).ilike(f"%{value}%")
+                query = query.filter(clause)
         if min_rating is not None:
             query = query.filter(Equipment.overall_rating >= min_rating)
         if max_rating is not None:
             query = query.filter(Equipment.overall_rating <= max_rating)
 
-        # Apply sorting
+        return query
+
+    @staticmethod
+    def sort_key_columns(sort_by: str) -> list:
+        """Get the columns that define the list ordering for a sort field.
+
+        The primary key is always appended as a tiebreaker so the ordering is
+        total, which keyset pagination relies on.
+        """
         # Special handling for equipment_id - sort by type prefix then numeric portion
         if sort_by == "equipment_id":
-            if sort_order == "desc":
-                query = query.order_by(desc(Equipment.equipment_type), desc(Equipment.equipment_id_num))
-            else:
-                query = query.order_by(asc(Equipment.equipment_type), asc(Equipment.equipment_id_num))
-        else:
-            sort_column = getattr(Equipment, sort_by, Equipment.equipment_name)
-            if sort_order == "desc":
-                query = query.order_by(desc(sort_column))
-            else:
-                query = query.order_by(asc(sort_column))
+            return [Equipment.equipment_type, Equipment.equipment_id_num, Equipment.id]
+        return [getattr(Equipment, sort_by, Equipment.equipment_name), Equipment.id]
 
-        return query.all()
+    def _apply_sort(self, query, sort_by: str, sort_order: str):
+        """Apply ordering for the given sort field and direction."""
+        direction = desc if sort_order == "desc" else asc
+        return query.order_by(*(direction(c) for c in self.sort_key_columns(sort_by)))
+
+    @replica_read
+    def get_all(
+        self,
+        status: Optional[Status] = None,
+        equipment_type: Optional[EquipmentType] = None,
+        usage_type: Optional[UsageType] = None,
+        location: Optional[str] = None,
+        primary_user: Optional[str] = None,
+        model: Optional[str] = None,
+        min_rating: Optional[int] = None,
+        max_rating: Optional[int] = None,
+        sort_by: str = "equipment_name",
+        sort_order: str = "asc",
+        include_deleted: bool = False,
+        columns: Optional[List[str]] = None,
+    ) -> List[Equipment]:
+        """Get all equipment with optional filtering and sorting.
+
+        Pass columns to load only those fields; rows are then returned
+        instead of Equipment objects.
+        """
+        query = self._list_query(
+            status=status,
+            equipment_type=equipment_type,
+            usage_type=usage_type,
+            location=location,
+            primary_user=primary_user,
+            model=model,
+            min_rating=min_rating,
+            max_rating=max_rating,
+            include_deleted=include_deleted,
+            columns=columns,
+            sort_by=sort_by,
+        )
+        return self._apply_sort(query, sort_by, sort_order).all()
+
+    @replica_read
+    def get_changes(
+        self,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[List[Equipment], Optional[str], bool]:
+        """Get records written since a cursor, including soft-deleted ones.
+
+        Records are ordered by (change_seq, id), so a record written again
+        moves to the end of the feed. Returns a tuple of (items, cursor,
+        has_more); the cursor resumes after the last item, or stays as
+        given if there are none.
+
+        Raises InvalidCursorError if the cursor is malformed.
+        """
+        page_size = clamp_page_size(limit)
+        query = select(Equipment).order_by(*CHANGES_KEY_COLUMNS)
+        if cursor:
+            values = list(decode_change_cursor(cursor))
+            query = query.where(keyset_predicate(CHANGES_KEY_COLUMNS, values, descending=False))
+
+        rows = self.db.scalars(query.limit(page_size + 1)).all()
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if rows:
+            cursor = encode_change_cursor(row_sort_key(rows[-1], CHANGES_KEY_COLUMNS))
+        return rows, cursor, has_more
+
+    @replica_read
+    def get_change_cursor(self) -> Optional[str]:
+        """Get a changes feed cursor after the latest write (None if there is none)."""
+        latest = self.db.execute(
+            select(*CHANGES_KEY_COLUMNS)
+            .order_by(*(column.desc() for column in CHANGES_KEY_COLUMNS))
+            .limit(1)
+        ).first()
+        return encode_change_cursor(latest) if latest else None
+
+    @replica_read
+    def get_page(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
+        sort_by: str = "equipment_name",
+        sort_order: str = "asc",
+        **filters,
+    ) -> tuple[List[Equipment], Optional[str], Optional[int]]:
+        """Get one page of equipment using keyset pagination.
+
+        Accepts the same filters and columns as get_all. Returns a tuple of
+        (items, next_cursor, total). next_cursor is None on the last page and
+        total is None when include_total is False.
+
+        Raises InvalidCursorError if the cursor is malformed or was issued
+        for a different sort order.
+        """
+        page_size = clamp_page_size(limit)
+        query = self._list_query(sort_by=sort_by, **filters)
+
+        total = query.order_by(None).count() if include_total else None
+
+        key_columns = self.sort_key_columns(sort_by)
+        if cursor:
+            values = decode_cursor(cursor, sort_by, sort_order, key_columns)
+            query = query.filter(
+                keyset_predicate(key_columns, values, descending=sort_order == "desc")
+            )
+
+        # Fetch one extra row to know whether another page follows
+        rows = self._apply_sort(query, sort_by, sort_order).limit(page_size + 1).all()
+
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_cursor = encode_cursor(
+                sort_by, sort_order, row_sort_key(rows[-1], key_columns)
+            )
+
+        return rows, next_cursor, total
 
     def get_by_serial(
         self,
@@ -135,23 +388,53 @@ class EquipmentService:
         self,
         identifier: str,
         include_deleted: bool = False,
+        generation: Optional[int] = None,
     ) -> Optional[Equipment]:
         """Get equipment by identifier (equipment_id or serial_number).
 
-        Tries equipment_id first (e.g., PC-0001), then falls back to serial_number.
-        This supports both the preferred equipment_id lookup and legacy serial_number.
+        An equipment_id match (e.g., PC-0001) wins over a serial_number
+        match, which supports legacy serial_number lookups; both are tried
+        in one query (see resolve_identifiers).
+
+        Readers that already know the current change generation (see
+        services.generation) pass it to use identifier_cache: a record
+        found at that generation is served again without a query until the
+        next write bumps it. The record must then be read from the same
+        source as the generation: inside read_from_replica if it was read
+        there. Writers pass none and always read the row.
         """
         if not identifier:
             return None
 
-        # Try equipment_id first (preferred, always present)
-        equipment = self.get_by_equipment_id(identifier, include_deleted)
-        if equipment:
-            return equipment
+        key = (identifier, include_deleted)
+        if generation is not None:
+            cached = identifier_cache.get(generation, key)
+            if cached is not None:
+                return self._attach_cached(*cached)
+
+        equipment = self.resolve_identifiers([identifier], include_deleted).get(identifier)
+        if equipment is not None and generation is not None:
+            identifier_cache.put(generation, key, (equipment.id, self._cache_values(equipment)))
+        return equipment
 
-        # Fall back to serial_number (optional field)
-        return self.get_by_serial(identifier, include_deleted)
+    @staticmethod
+    def _cache_values(equipment: Equipment) -> Dict:
+        """Copy a record's column values, to cache apart from its session."""
+        return {
+            column.key: getattr(equipment, column.key)
+            for column in Equipment.__mapper__.column_attrs
+        }
+
+    def _attach_cached(self, pk: int, values: Dict) -> Equipment:
+        """Rebuild a cached record in this session, as if just loaded, without a query."""
+        equipment = self.db.identity_map.get(identity_key(Equipment, pk))
+        if equipment is not None:
+            return equipment
+        equipment = Equipment(**values)
+        make_transient_to_detached(equipment)
+        return self.db.merge(equipment, load=False)
 
+    @replica_read
     def get_deleted(self) -> List[Equipment]:
         """Get all soft-deleted equipment."""
         return self.db.query(Equipment).filter(
@@ -162,14 +445,21 @@ class EquipmentService:
         """Create a new equipment record."""
         equipment_id, equipment_id_num = self.generate_equipment_id(data.equipment_type)
 
+        # Stamped before anything flushes the row, so its INSERT carries it
         equipment = Equipment(
             equipment_id=equipment_id,
             equipment_id_num=equipment_id_num,
+            change_seq=bump_generation(self.db),
             **data.model_dump()
         )
 
         self.db.add(equipment)
+        NgramIndex(self.db).add_records([data.model_dump()])
+        summary = FleetSummary(self.db)
+        summary.add(equipment)
+        summary.apply()
         self.db.commit()
+        change_hints.record(equipment.change_seq, [(equipment.equipment_id, CREATE, None)])
         self.db.refresh(equipment)
 
         return equipment
@@ -181,50 +471,503 @@ class EquipmentService:
         """
         update_data = data.model_dump(exclude_unset=True)
 
-        # Check if assignment fields are changing
-        assignment_fields = ['primary_user', 'usage_type', 'equipment_name']
-        assignment_changed = any(
-            field in update_data and getattr(equipment, field) != update_data[field]
-            for field in assignment_fields
-        )
-
         # Create history record if assignment changed
-        if assignment_changed:
-            history = AssignmentHistory(
-                equipment_id=equipment.id,
-                previous_user=equipment.primary_user,
-                previous_usage_type=equipment.usage_type,
-                previous_equipment_name=equipment.equipment_name,
-                start_date=equipment.assignment_date,
-                end_date=date.today(),
-            )
-            self.db.add(history)
+        history = self._assignment_history(equipment, update_data)
+        if history:
+            self.db.add(AssignmentHistory(**history))
+
+        summary = FleetSummary(self.db)
+        summary.replace(equipment, update_data)
+        replaced = replaced_values(equipment, update_data)
 
         # Update equipment fields
         for field, value in update_data.items():
             setattr(equipment, field, value)
 
+        # Set before the summary's savepoint flushes, so one UPDATE carries it
+        equipment.change_seq = bump_generation(self.db)
+        ngram_index = NgramIndex(self.db)
+        ngram_index.add_records([update_data])
+        summary.apply()
+        if replaced:
+            # Written first, so the pruning sees which values are still held
+            self.db.flush()
+            ngram_index.prune([replaced])
+
         self.db.commit()
+        change_hints.record(
+            equipment.change_seq, [(equipment.equipment_id, UPDATE, field_names(update_data))]
+        )
         self.db.refresh(equipment)
 
         return equipment
 
     def soft_delete(self, equipment: Equipment) -> None:
         """Soft delete an equipment record."""
+        summary = FleetSummary(self.db)
+        summary.remove(equipment)
         equipment.is_deleted = True
         equipment.deleted_at = datetime.utcnow()
+        equipment.change_seq = bump_generation(self.db)
+        summary.apply()
         self.db.commit()
+        change_hints.record(equipment.change_seq, [(equipment.equipment_id, DELETE, DELETE_FIELDS)])
 
     def restore(self, equipment: Equipment) -> Equipment:
         """Restore a soft-deleted equipment record."""
         equipment.is_deleted = False
         equipment.deleted_at = None
+        summary = FleetSummary(self.db)
+        equipment.change_seq = bump_generation(self.db)
+        summary.add(equipment)
+        summary.apply()
         self.db.commit()
+        change_hints.record(equipment.change_seq, [(equipment.equipment_id, RESTORE, DELETE_FIELDS)])
         self.db.refresh(equipment)
         return equipment
 
+    @replica_read
     def get_history(self, equipment: Equipment) -> List[AssignmentHistory]:
-        """Get assignment history for equipment ordered by end_date DESC."""
+        """Get assignment history for equipment ordered by end_date DESC, newest first."""
         return self.db.query(AssignmentHistory).filter(
             AssignmentHistory.equipment_id == equipment.id
-        ).order_by(desc(AssignmentHistory.end_date)).all()
+        ).order_by(desc(AssignmentHistory.end_date), desc(AssignmentHistory.id)).all()
+
+    @replica_read
+    def get_histories(self, equipment_ids: Iterable[int]) -> Dict[int, List[Row]]:
+        """Get the assignment history of many records, keyed by Equipment.id.
+
+        Loads history with one IN query per HISTORY_BATCH_SIZE records, as
+        selectinload does for a relationship, instead of one query per
+        record. Each record's rows carry the AssignmentHistoryItem fields
+        and are ordered like get_history; records without history are left
+        out.
+        """
+        columns = [getattr(AssignmentHistory, field) for field in HISTORY_FIELDS]
+        ids = list(dict.fromkeys(equipment_ids))
+
+        histories = defaultdict(list)
+        for start in range(0, len(ids), HISTORY_BATCH_SIZE):
+            query = select(*columns, AssignmentHistory.equipment_id).where(
+                AssignmentHistory.equipment_id.in_(ids[start:start + HISTORY_BATCH_SIZE])
+            ).order_by(
+                AssignmentHistory.equipment_id,
+                desc(AssignmentHistory.end_date),
+                desc(AssignmentHistory.id),
+            )
+            for row in self.db.execute(query):
+                histories[row.equipment_id].append(row)
+        return dict(histories)
+
+    @replica_read
+    def get_history_batch(self, identifiers: List[str]) -> HistoryBatchResult:
+        """Get the assignment history of many records by identifier.
+
+        Identifiers are resolved like get_by_identifier (soft-deleted
+        records included, as for a single record's history) in one query,
+        and their history loaded with get_histories. Items follow request
+        order, once per distinct identifier.
+        """
+        identifiers = list(dict.fromkeys(identifiers))
+        found = self.resolve_identifiers(identifiers, include_deleted=True)
+        histories = self.get_histories(equipment.id for equipment in found.values())
+
+        return HistoryBatchResult(
+            items=[
+                EquipmentHistory(
+                    identifier=identifier,
+                    equipment_id=equipment.equipment_id,
+                    history=[
+                        AssignmentHistoryItem.model_validate(row, from_attributes=True)
+                        for row in histories.get(equipment.id, [])
+                    ],
+                )
+                for identifier, equipment in found.items()
+            ],
+            not_found=[identifier for identifier in identifiers if identifier not in found],
+        )
+
+    @replica_read
+    def get_stats(self) -> Dict:
+        """Get fleet counts and total cost, overall and per group."""
+        return FleetSummary(self.db).stats()
+
+    @staticmethod
+    def _assignment_history(equipment: Equipment, update_data: Dict) -> Optional[Dict]:
+        """Build the history row to record if an update changes the assignment.
+
+        Returns None when none of the assignment fields change.
+        """
+        assignment_fields = ['primary_user', 'usage_type', 'equipment_name']
+        assignment_changed = any(
+            field in update_data and getattr(equipment, field) != update_data[field]
+            for field in assignment_fields
+        )
+        if not assignment_changed:
+            return None
+
+        return {
+            'equipment_id': equipment.id,
+            'previous_user': equipment.primary_user,
+            'previous_usage_type': equipment.usage_type,
+            'previous_equipment_name': equipment.equipment_name,
+            'start_date': equipment.assignment_date,
+            'end_date': date.today(),
+        }
+
+    def resolve_identifiers(
+        self,
+        identifiers: List[str],
+        include_deleted: bool = False,
+    ) -> Dict[str, Equipment]:
+        """Look up many identifiers (equipment_id or serial_number) in one query.
+
+        Follows get_by_identifier: an equipment_id match wins over a serial
+        number match. Identifiers that match nothing are left out.
+        """
+        if not identifiers:
+            return {}
+
+        query = self.db.query(Equipment).filter(or_(
+            Equipment.equipment_id.in_(identifiers),
+            Equipment.serial_number.in_(identifiers),
+        ))
+        if not include_deleted:
+            query = query.filter(Equipment.is_deleted == False)
+
+        by_serial = {}
+        by_equipment_id = {}
+        for equipment in query:
+            by_equipment_id[equipment.equipment_id] = equipment
+            if equipment.serial_number:
+                by_serial[equipment.serial_number] = equipment
+
+        return {
+            identifier: by_equipment_id.get(identifier) or by_serial[identifier]
+            for identifier in identifiers
+            if identifier in by_equipment_id or identifier in by_serial
+        }
+
+    def bulk_create(self, items: List[EquipmentCreate]) -> BulkResult:
+        """Create many equipment records in one transaction.
+
+        Items whose serial number already exists (or repeats an earlier item)
+        fail individually; the rest are inserted with one multi-row INSERT
+        using IDs reserved per type in blocks.
+        """
+        results: List[BulkItemResult] = [None] * len(items)
+
+        serials = [item.serial_number for item in items if item.serial_number]
+        existing = set(self.db.execute(
+            select(Equipment.serial_number).where(Equipment.serial_number.in_(serials))
+        ).scalars()) if serials else set()
+
+        valid = []
+        for index, item in enumerate(items):
+            if item.serial_number and item.serial_number in existing:
+                results[index] = BulkItemResult(
+                    index=index,
+                    status='failed',
+                    error=f"Serial number '{item.serial_number}' already exists",
+                )
+                continue
+            if item.serial_number:
+                existing.add(item.serial_number)
+            valid.append(index)
+
+        # Reserve a block of IDs per type, handed out in request order
+        counts = Counter(items[index].equipment_type for index in valid)
+        reserved = {
+            equipment_type: iter(self.reserve_equipment_ids(equipment_type, count))
+            for equipment_type, count in counts.items()
+        }
+
+        rows = []
+        for index in valid:
+            data = items[index].model_dump()
+            equipment_id, equipment_id_num = next(reserved[data['equipment_type']])
+            rows.append(dict(data, equipment_id=equipment_id, equipment_id_num=equipment_id_num))
+            results[index] = BulkItemResult(index=index, equipment_id=equipment_id, status='created')
+
+        if rows:
+            self.db.execute(insert(Equipment), rows)
+            NgramIndex(self.db).add_records(rows)
+            summary = FleetSummary(self.db)
+            for row in rows:
+                summary.add(row)
+            summary.apply()
+            change_seq = stamp_changes(self.db, equipment_ids=[row['equipment_id'] for row in rows])
+        self.db.commit()
+        if rows:
+            change_hints.record(change_seq, [(row['equipment_id'], CREATE, None) for row in rows])
+
+        return self._bulk_result(results)
+
+    def bulk_update(self, items: List[BulkUpdateItem]) -> BulkResult:
+        """Update many equipment records in one transaction.
+
+        Targets are resolved with one query, assignment history rows are
+        written with one multi-row INSERT and the updates are applied as a
+        bulk UPDATE by primary key. Items that match nothing, repeat an
+        earlier item's record, or set a serial number held by another record
+        (or given to an earlier item) fail individually.
+        """
+        results: List[BulkItemResult] = [None] * len(items)
+        targets = self.resolve_identifiers([item.identifier for item in items])
+
+        # Owners of the serial numbers being set, checked with one query
+        serials = [item.serial_number for item in items if item.serial_number]
+        serial_owners = dict(self.db.execute(
+            select(Equipment.serial_number, Equipment.id).where(Equipment.serial_number.in_(serials))
+        ).all()) if serials else {}
+
+        seen = set()
+        history_rows = []
+        update_rows = []
+        replaced = []
+        changes = []
+        summary = FleetSummary(self.db)
+        for index, item in enumerate(items):
+            equipment = targets.get(item.identifier)
+            update_data = item.model_dump(exclude_unset=True, exclude={'identifier'})
+
+            error = None
+            if equipment is None:
+                error = "Equipment not found"
+            elif equipment.id in seen:
+                error = "Equipment appears more than once in this request"
+            elif serial_owners.get(item.serial_number, equipment.id) != equipment.id:
+                error = f"Serial number '{item.serial_number}' already exists"
+
+            if error:
+                results[index] = BulkItemResult(
+                    index=index,
+                    equipment_id=equipment.equipment_id if equipment else None,
+                    status='failed',
+                    error=error,
+                )
+                continue
+
+            seen.add(equipment.id)
+            if item.serial_number:
+                serial_owners[item.serial_number] = equipment.id
+            history = self._assignment_history(equipment, update_data)
+            if history:
+                history_rows.append(history)
+            if update_data:
+                update_rows.append(dict(update_data, id=equipment.id))
+                replaced.append(replaced_values(equipment, update_data))
+                changes.append((equipment.equipment_id, UPDATE, field_names(update_data)))
+                summary.replace(equipment, update_data)
+            results[index] = BulkItemResult(
+                index=index, equipment_id=equipment.equipment_id, status='updated'
+            )
+
+        if history_rows:
+            self.db.execute(insert(AssignmentHistory), history_rows)
+        if update_rows:
+            self.db.execute(update(Equipment), update_rows)
+            ngram_index = NgramIndex(self.db)
+            ngram_index.add_records(update_rows)
+            ngram_index.prune(replaced)
+            summary.apply()
+            change_seq = stamp_changes(self.db, ids=[row['id'] for row in update_rows])
+        self.db.commit()
+        if update_rows:
+            change_hints.record(change_seq, changes)
+
+        return self._bulk_result(results)
+
+    def bulk_soft_delete(self, identifiers: List[str]) -> BulkResult:
+        """Soft delete many equipment records with one UPDATE."""
+        return self._bulk_set_deleted(identifiers, deleted=True)
+
+    def bulk_restore(self, identifiers: List[str]) -> BulkResult:
+        """Restore many soft-deleted equipment records with one UPDATE."""
+        return self._bulk_set_deleted(identifiers, deleted=False)
+
+    def _bulk_set_deleted(self, identifiers: List[str], deleted: bool) -> BulkResult:
+        """Set is_deleted on many records; see bulk_soft_delete and bulk_restore."""
+        results: List[BulkItemResult] = []
+        targets = self.resolve_identifiers(identifiers, include_deleted=not deleted)
+
+        ids = set()
+        changes = []
+        summary = FleetSummary(self.db)
+        for index, identifier in enumerate(identifiers):
+            equipment = targets.get(identifier)
+
+            error = None
+            if equipment is None:
+                error = "Equipment not found"
+            elif equipment.id in ids:
+                error = "Equipment appears more than once in this request"
+            elif not deleted and not equipment.is_deleted:
+                error = "Equipment is not deleted"
+
+            if error:
+                results.append(BulkItemResult(
+                    index=index,
+                    equipment_id=equipment.equipment_id if equipment else None,
+                    status='failed',
+                    error=error,
+                ))
+                continue
+
+            ids.add(equipment.id)
+            changes.append((equipment.equipment_id, DELETE if deleted else RESTORE, DELETE_FIELDS))
+            summary.replace(equipment, {'is_deleted': deleted})
+            results.append(BulkItemResult(
+                index=index,
+                equipment_id=equipment.equipment_id,
+                status='deleted' if deleted else 'restored',
+            ))
+
+        if ids:
+            self.db.execute(
+                update(Equipment)
+                .where(Equipment.id.in_(ids))
+                .values(is_deleted=deleted, deleted_at=datetime.utcnow() if deleted else None)
+                .execution_options(synchronize_session=False)
+            )
+            summary.apply()
+            change_seq = stamp_changes(self.db, ids=ids)
+        self.db.commit()
+        if ids:
+            change_hints.record(change_seq, changes)
+
+        return self._bulk_result(results)
+
+    @staticmethod
+    def _bulk_result(results: List[BulkItemResult]) -> BulkResult:
+        """Summarize per-item results."""
+        failed = sum(1 for result in results if result.status == 'failed')
+        return BulkResult(succeeded=len(results) - failed, failed=failed, results=results)
+
+
+class AsyncEquipmentService:
+    """Async counterpart of EquipmentService for an AsyncSession.
+
+    Each method runs the matching EquipmentService method through
+    AsyncSession.run_sync, so the business logic is shared while every
+    database round trip is awaited on the async driver instead of blocking
+    the event loop. Returned objects belong to the async session.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: str, *args, **kwargs):
+        """Run an EquipmentService method on the session's sync facade."""
+        return await self.db.run_sync(
+            lambda session: getattr(EquipmentService(session), method)(*args, **kwargs)
+        )
+
+    async def get_all(self, **filters) -> List[Equipment]:
+        """Get all equipment; see EquipmentService.get_all."""
+        return await self._run("get_all", **filters)
+
+    async def get_changes(
+        self,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[List[Equipment], Optional[str], bool]:
+        """Get records written since a cursor; see EquipmentService.get_changes."""
+        return await self._run("get_changes", cursor, limit)
+
+    async def get_change_cursor(self) -> Optional[str]:
+        """Get a changes feed cursor after the latest write."""
+        return await self._run("get_change_cursor")
+
+    async def get_page(self, **filters) -> tuple[List[Equipment], Optional[str], Optional[int]]:
+        """Get one page of equipment; see EquipmentService.get_page."""
+        return await self._run("get_page", **filters)
+
+    async def iter_chunks(
+        self,
+        chunk_size: int = 1000,
+        sort_by: str = "equipment_name",
+        sort_order: str = "asc",
+        **filters,
+    ) -> AsyncIterator[List[Equipment]]:
+        """Stream all matching equipment in lists of up to chunk_size rows.
+
+        Accepts the same filters as get_all. Rows are fetched with yield_per
+        (a server-side cursor where the driver supports it), so memory use
+        stays bounded by chunk_size rather than the size of the fleet.
+        """
+        service = EquipmentService(self.db.sync_session)
+        query = service._apply_sort(
+            service._list_query(sort_by=sort_by, **filters), sort_by, sort_order
+        )
+        with read_from_replica(self.db):
+            result = await self.db.stream_scalars(
+                query.statement.execution_options(yield_per=chunk_size)
+            )
+            async for chunk in result.partitions():
+                yield chunk
+
+    async def get_by_serial(self, serial_number: str, include_deleted: bool = False) -> Optional[Equipment]:
+        """Get equipment by serial number."""
+        return await self._run("get_by_serial", serial_number, include_deleted)
+
+    async def get_by_identifier(
+        self,
+        identifier: str,
+        include_deleted: bool = False,
+        generation: Optional[int] = None,
+    ) -> Optional[Equipment]:
+        """Get equipment by identifier (equipment_id or serial_number); see EquipmentService."""
+        return await self._run("get_by_identifier", identifier, include_deleted, generation)
+
+    async def get_deleted(self) -> List[Equipment]:
+        """Get all soft-deleted equipment."""
+        return await self._run("get_deleted")
+
+    async def create(self, data: EquipmentCreate) -> Equipment:
+        """Create a new equipment record."""
+        return await self._run("create", data)
+
+    async def update(self, equipment: Equipment, data: EquipmentUpdate) -> Equipment:
+        """Update an existing equipment record."""
+        return await self._run("update", equipment, data)
+
+    async def soft_delete(self, equipment: Equipment) -> None:
+        """Soft delete an equipment record."""
+        await self._run("soft_delete", equipment)
+
+    async def restore(self, equipment: Equipment) -> Equipment:
+        """Restore a soft-deleted equipment record."""
+        return await self._run("restore", equipment)
+
+    async def get_history(self, equipment: Equipment) -> List[AssignmentHistory]:
+        """Get assignment history for equipment ordered by end_date DESC."""
+        return await self._run("get_history", equipment)
+
+    async def get_histories(self, equipment_ids: Iterable[int]) -> Dict[int, List[Row]]:
+        """Get the assignment history of many records, keyed by Equipment.id."""
+        return await self._run("get_histories", list(equipment_ids))
+
+    async def get_history_batch(self, identifiers: List[str]) -> HistoryBatchResult:
+        """Get the assignment history of many records by identifier."""
+        return await self._run("get_history_batch", identifiers)
+
+    async def get_stats(self) -> Dict:
+        """Get fleet counts and total cost, overall and per group."""
+        return await self._run("get_stats")
+
+    async def bulk_create(self, items: List[EquipmentCreate]) -> BulkResult:
+        """Create many equipment records in one transaction."""
+        return await self._run("bulk_create", items)
+
+    async def bulk_update(self, items: List[BulkUpdateItem]) -> BulkResult:
+        """Update many equipment records in one transaction."""
+        return await self._run("bulk_update", items)
+
+    async def bulk_soft_delete(self, identifiers: List[str]) -> BulkResult:
+        """Soft delete many equipment records in one transaction."""
+        return await self._run("bulk_soft_delete", identifiers)
+
+    async def bulk_restore(self, identifiers: List[str]) -> BulkResult:
+        """Restore many soft-deleted equipment records in one transaction."""
+        return await self._run("bulk_restore", identifiers)
@@ -0,0 +1,258 @@
+"""Export file formats beyond CSV, and compression applied while streaming.
+
+NDJSON writes one JSON object per record with typed values: numbers as
+numbers, dates as ISO strings, cost as a decimal string (as in the JSON
+API). Arrow IPC (stream format) and Parquet write typed columns, which
+loaders read without parsing; they need pyarrow, which is optional.
+
+Every format is encoded chunk by chunk as rows are read, so an export is
+never held in memory. CSV and NDJSON can be gzip- or zstd-compressed on
+the fly (zstd needs zstandard, also optional). Arrow and Parquet compress
+inside the file instead: Parquet with a gzip or zstd column codec, Arrow
+with zstd buffer compression.
+"""
+
+import zlib
+from decimal import Decimal
+from enum import Enum
+from typing import AsyncIterable, AsyncIterator, List, Optional
+
+import orjson
+from sqlalchemy import BigInteger, Boolean, Date, DateTime, Integer, Numeric
+
+from ..models import Equipment
+from .csv_service import EXPORT_FIELDS
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # Arrow and Parquet exports are unavailable without it
+    pyarrow = None
+
+try:
+    import zstandard
+except ImportError:  # zstd compression of CSV and NDJSON is unavailable without it
+    zstandard = None
+
+# Export formats: media type and file extension
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Formats written with pyarrow
+COLUMNAR_FORMATS = ("arrow", "parquet")
+
+# Compressions of a whole file: media type and file extension suffix
+EXPORT_COMPRESSIONS = {
+    "gzip": ("application/gzip", "gz"),
+    "zstd": ("application/zstd", "zst"),
+}
+
+# Codecs the columnar formats can compress with internally
+COLUMNAR_CODECS = {
+    "arrow": ("zstd",),
+    "parquet": ("gzip", "zstd"),
+}
+
+
+class ExportFormatError(ValueError):
+    """Raised for an unknown export format or compression, or one not installed."""
+
+
+def check_export(format: str, compression: Optional[str]) -> None:
+    """Check that an export format and compression can be produced here.
+
+    Raises ExportFormatError if either is unknown, the combination is not
+    supported, or it needs a library that is not installed.
+    """
+    if format not in EXPORT_FORMATS:
+        raise ExportFormatError(
+            f"Unknown export format '{format}'; expected one of {', '.join(EXPORT_FORMATS)}"
+        )
+    if compression is not None and compression not in EXPORT_COMPRESSIONS:
+        raise ExportFormatError(
+            f"Unknown compression '{compression}'; "
+            f"expected one of {', '.join(EXPORT_COMPRESSIONS)}"
+        )
+
+    if format in COLUMNAR_FORMATS:
+        if pyarrow is None:
+            raise ExportFormatError(f"The {format} export format requires pyarrow")
+        if compression is not None and compression not in COLUMNAR_CODECS[format]:
+            raise ExportFormatError(
+                f"The {format} export format supports "
+                f"{', '.join(COLUMNAR_CODECS[format])} compression only"
+            )
+    elif compression == "zstd" and zstandard is None:
+        raise ExportFormatError("zstd compression requires zstandard")
+
+
+def export_media_type(format: str, compression: Optional[str]) -> str:
+    """Media type of an export file."""
+    if compression is not None and format not in COLUMNAR_FORMATS:
+        return EXPORT_COMPRESSIONS[compression][0]
+    return EXPORT_FORMATS[format][0]
+
+
+def export_filename(stem: str, format: str, compression: Optional[str]) -> str:
+    """File name of an export, with the format's extension."""
+    filename = f"{stem}.{EXPORT_FORMATS[format][1]}"
+    if compression is not None and format not in COLUMNAR_FORMATS:
+        filename += f".{EXPORT_COMPRESSIONS[compression][1]}"
+    return filename
+
+
+async def stream_ndjson(equipment_chunks: AsyncIterable[List[Equipment]]) -> AsyncIterator[bytes]:
+    """Yield NDJSON, one chunk per list of rows."""
+    async for chunk in equipment_chunks:
+        yield b"".join(
+            orjson.dumps(
+                {field: getattr(equipment, field) for field in EXPORT_FIELDS},
+                default=_json_default,
+                option=orjson.OPT_APPEND_NEWLINE,
+            )
+            for equipment in chunk
+        )
+
+
+async def stream_arrow(
+    equipment_chunks: AsyncIterable[List[Equipment]],
+    compression: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """Yield an Arrow IPC stream, one record batch per list of rows."""
+    schema = arrow_schema()
+    sink = _ByteSink()
+    options = pyarrow.ipc.IpcWriteOptions(compression=compression)
+    with pyarrow.ipc.new_stream(pyarrow.PythonFile(sink, mode="w"), schema, options=options) as writer:
+        # The schema message, sent before any rows are fetched
+        yield sink.take()
+        async for chunk in equipment_chunks:
+            writer.write_batch(_record_batch(chunk, schema))
+            yield sink.take()
+    yield sink.take()
+
+
+async def stream_parquet(
+    equipment_chunks: AsyncIterable[List[Equipment]],
+    compression: Optional[str] = None,
+) -> AsyncIterator[bytes]:
+    """Yield a Parquet file, one row group per list of rows.
+
+    The file's footer, which readers need first, is written at the end.
+    """
+    schema = arrow_schema()
+    sink = _ByteSink()
+    with pyarrow.parquet.ParquetWriter(
+        pyarrow.PythonFile(sink, mode="w"), schema, compression=compression or "snappy"
+    ) as writer:
+        async for chunk in equipment_chunks:
+            writer.write_batch(_record_batch(chunk, schema))
+            yield sink.take()
+    yield sink.take()
+
+
+async def compress_stream(
+    stream: AsyncIterable[bytes],
+    compression: Optional[str],
+) -> AsyncIterator[bytes]:
+    """Compress a stream of bytes as it is produced, or pass it through."""
+    if compression is None:
+        async for data in stream:
+            yield data
+        return
+
+    if compression == "gzip":
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    else:
+        compressor = zstandard.ZstdCompressor().compressobj()
+    async for data in stream:
+        compressed = compressor.compress(data)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def arrow_schema():
+    """Arrow schema of the exported fields, typed from the Equipment columns."""
+    columns = Equipment.__table__.columns
+    return pyarrow.schema([
+        pyarrow.field(field, _arrow_type(columns[field].type), nullable=columns[field].nullable)
+        for field in EXPORT_FIELDS
+    ])
+
+
+def _arrow_type(column_type):
+    """Arrow type holding the values of a column type."""
+    if isinstance(column_type, BigInteger):
+        return pyarrow.int64()
+    if isinstance(column_type, Integer):
+        return pyarrow.int32()
+    if isinstance(column_type, Numeric):
+        return pyarrow.decimal128(column_type.precision, column_type.scale)
+    if isinstance(column_type, DateTime):
+        return pyarrow.timestamp("us")
+    if isinstance(column_type, Date):
+        return pyarrow.date32()
+    if isinstance(column_type, Boolean):
+        return pyarrow.bool_()
+    # Strings, text and enums
+    return pyarrow.string()
+
+
+def _record_batch(equipment_rows: List[Equipment], schema):
+    """Build an Arrow record batch from equipment rows."""
+    columns = {field: [] for field in EXPORT_FIELDS}
+    for equipment in equipment_rows:
+        for field, values in columns.items():
+            value = getattr(equipment, field)
+            values.append(value.value if isinstance(value, Enum) else value)
+    return pyarrow.RecordBatch.from_pydict(columns, schema=schema)
+
+
+def _json_default(value):
+    """Encode the values orjson does not: decimals, as strings like the JSON API."""
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+class _ByteSink:
+    """Write-only file that keeps what is written until it is taken.
+
+    Lets a pyarrow writer stream: its output is taken after each write and
+    sent, while tell() still counts every byte written, which the Parquet
+    writer uses for the offsets in its footer.
+    """
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._parts.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def writable(self) -> bool:
+        return True
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def take(self) -> bytes:
+        """Remove and return everything written since the last take."""
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
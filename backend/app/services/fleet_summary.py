@@ -0,0 +1,166 @@
+"""Incrementally maintained fleet statistics."""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List
+
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+
+from ..models import Equipment, EquipmentSummary, Status
+
+# Equipment fields the fleet is broken down by
+SUMMARY_DIMENSIONS = ('status', 'equipment_type', 'location', 'usage_type')
+
+# Dimension of the single whole-fleet row
+FLEET_DIMENSION = 'fleet'
+
+# Fields a record needs for its summary contribution
+SUMMARY_FIELDS = SUMMARY_DIMENSIONS + ('cost', 'is_deleted')
+
+# Column defaults applied when an inserted row omits the field
+INSERT_DEFAULTS = {'status': Status.ACTIVE, 'is_deleted': False}
+
+
+def _group_value(value: Any) -> str:
+    """Convert a field value into its summary group key."""
+    if value is None:
+        return ''
+    return getattr(value, 'value', value)
+
+
+class FleetSummary:
+    """Maintains and reads the equipment_summary table.
+
+    Write paths describe each change with remove() (state before) and add()
+    (state after), then call apply() within the same transaction. Changes
+    are netted per group first, so apply() issues one statement per group
+    touched however many records changed. Works with either a Session or a
+    Connection, like NgramIndex.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._deltas: Dict[tuple[str, str], List] = defaultdict(lambda: [0, Decimal(0)])
+
+    def add(self, record) -> None:
+        """Count a record (an Equipment or a dict of column values)."""
+        self._count(record, 1)
+
+    def remove(self, record) -> None:
+        """Uncount a record in the state it had before the change."""
+        self._count(record, -1)
+
+    def replace(self, record, changes: Dict[str, Any]) -> None:
+        """Recount a record whose fields are being changed to changes."""
+        self.remove(record)
+        self.add({**self._state(record), **changes})
+
+    def apply(self) -> None:
+        """Write the accumulated changes. Call before committing."""
+        # Lock rows in a consistent order so concurrent writers cannot deadlock
+        for (dimension, value), (count, cost) in sorted(self._deltas.items()):
+            if count or cost:
+                self._apply_delta(dimension, value, count, cost)
+        self._deltas.clear()
+
+    def rebuild(self) -> int:
+        """Recompute the whole summary from the equipment table.
+
+        Returns the number of groups written.
+        """
+        self.db.execute(delete(EquipmentSummary))
+
+        rows = []
+        live = Equipment.is_deleted == False
+        for dimension in (FLEET_DIMENSION,) + SUMMARY_DIMENSIONS:
+            columns = [] if dimension == FLEET_DIMENSION else [getattr(Equipment, dimension)]
+            query = select(
+                *columns, func.count(), func.coalesce(func.sum(Equipment.cost), 0)
+            ).where(live).group_by(*columns)
+            for row in self.db.execute(query):
+                if row[-2]:
+                    rows.append({
+                        'dimension': dimension,
+                        'value': _group_value(row[0]) if columns else '',
+                        'count': row[-2],
+                        'total_cost': row[-1],
+                    })
+
+        if rows:
+            self.db.execute(insert(EquipmentSummary), rows)
+        return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        """Read the summary: fleet totals plus groups for each dimension."""
+        result: Dict[str, Any] = {'total': 0, 'total_cost': Decimal(0)}
+        for dimension in SUMMARY_DIMENSIONS:
+            result[f'by_{dimension}'] = []
+
+        for row in self.db.execute(
+            select(EquipmentSummary).where(EquipmentSummary.count > 0)
+            .order_by(EquipmentSummary.dimension, EquipmentSummary.value)
+        ).scalars():
+            if row.dimension == FLEET_DIMENSION:
+                result['total'] = row.count
+                result['total_cost'] = row.total_cost
+            elif row.dimension in SUMMARY_DIMENSIONS:
+                result[f'by_{row.dimension}'].append({
+                    'value': row.value or None,
+                    'count': row.count,
+                    'total_cost': row.total_cost,
+                })
+        return result
+
+    @staticmethod
+    def _state(record) -> Dict[str, Any]:
+        """Get the summary fields of an Equipment or a dict of column values."""
+        if isinstance(record, dict):
+            return {
+                field: record[field] if field in record else INSERT_DEFAULTS.get(field)
+                for field in SUMMARY_FIELDS
+            }
+        return {field: getattr(record, field) for field in SUMMARY_FIELDS}
+
+    def _count(self, record, sign: int) -> None:
+        """Add a record's contribution, times sign, to the pending deltas."""
+        state = self._state(record)
+        if state['is_deleted']:
+            return
+
+        cost = Decimal(state['cost'] or 0) * sign
+        groups = [(FLEET_DIMENSION, '')] + [
+            (dimension, _group_value(state[dimension])) for dimension in SUMMARY_DIMENSIONS
+        ]
+        for group in groups:
+            delta = self._deltas[group]
+            delta[0] += sign
+            delta[1] += cost
+
+    def _apply_delta(self, dimension: str, value: str, count: int, cost: Decimal) -> None:
+        """Add a delta to one group's row, creating the row if needed."""
+        updated = self.db.execute(
+            update(EquipmentSummary)
+            .where(EquipmentSummary.dimension == dimension, EquipmentSummary.value == value)
+            .values(
+                count=EquipmentSummary.count + count,
+                total_cost=EquipmentSummary.total_cost + cost,
+            )
+        ).rowcount
+        if updated:
+            return
+
+        try:
+            with self.db.begin_nested():
+                self.db.execute(insert(EquipmentSummary).values(
+                    dimension=dimension, value=value, count=count, total_cost=cost,
+                ))
+        except IntegrityError:
+            # Another transaction created the row first
+            self._apply_delta(dimension, value, count, cost)
+
+
+@event.listens_for(EquipmentSummary.__table__, "after_create")
+def _backfill_summary(target, connection, **kw):
+    """Summarize existing equipment when the summary table is first created."""
+    FleetSummary(connection).rebuild()
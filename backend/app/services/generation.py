@@ -0,0 +1,76 @@
+"""Change generation counters for cheap change detection."""
+
+from typing import Iterable
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import ChangeGeneration, Equipment
+
+# Generation covering equipment and its assignment history
+EQUIPMENT_GENERATION = "equipment"
+
+
+def get_generation(db: Session, name: str = EQUIPMENT_GENERATION) -> int:
+    """Get the current generation of a table (0 if it was never changed)."""
+    value = db.execute(
+        select(ChangeGeneration.value).where(ChangeGeneration.name == name)
+    ).scalar_one_or_none()
+    return value or 0
+
+
+def bump_generation(db: Session, name: str = EQUIPMENT_GENERATION) -> int:
+    """Increment a table's generation within the current transaction.
+
+    Call from every write path before committing, and record the result
+    as the change_seq of the rows written (see stamp_changes). The counter
+    row stays locked until the transaction ends, so generations are handed
+    out in commit order. Returns the new generation.
+    """
+    statement = (
+        update(ChangeGeneration)
+        .where(ChangeGeneration.name == name)
+        .values(value=ChangeGeneration.value + 1)
+    )
+
+    if db.get_bind().dialect.update_returning:
+        value = db.execute(statement.returning(ChangeGeneration.value)).scalar_one_or_none()
+        if value is not None:
+            return value
+    elif db.execute(statement).rowcount:
+        return get_generation(db, name)
+
+    try:
+        with db.begin_nested():
+            db.add(ChangeGeneration(name=name, value=1))
+        return 1
+    except IntegrityError:
+        # Another transaction created it first
+        return bump_generation(db, name)
+
+
+def stamp_changes(
+    db: Session,
+    ids: Iterable[int] = (),
+    equipment_ids: Iterable[str] = (),
+) -> int:
+    """Bump the equipment generation and stamp it on the changed rows.
+
+    Rows are given by primary key or, for rows inserted in bulk whose keys
+    are unknown, by equipment_id. Each row's change_seq becomes the new
+    generation; as generations are handed out in commit order, a reader
+    that has seen every change up to some change_seq will only ever find
+    later commits above it, whatever the server clocks say. Returns the
+    new generation.
+    """
+    generation = bump_generation(db)
+    for column, keys in ((Equipment.id, list(ids)), (Equipment.equipment_id, list(equipment_ids))):
+        if keys:
+            db.execute(
+                update(Equipment)
+                .where(column.in_(keys))
+                .values(change_seq=generation)
+                .execution_options(synchronize_session=False)
+            )
+    return generation
@@ -0,0 +1,266 @@
+"""Background CSV import jobs on an in-process worker pool.
+
+A submitted upload is copied to a temporary file and imported by one of a
+few worker threads with its own synchronous session, so a large import
+neither holds its HTTP request open nor runs on the event loop. The
+worker count bounds how many imports write at once, and the sync engine's
+connection pool is separate from the async one, so interactive requests
+keep their connections. Submissions beyond max_pending are refused,
+except those made with bounded=False.
+
+An import that waits too long on another writer's lock (on SQLite, any
+other write) fails with a plain message and database_busy set; the chunks
+it committed before are kept, so submitting the file again completes it.
+
+Jobs live in the memory of the process that accepted them; query and
+cancel them through the same worker, e.g. with a sticky load balancer
+when running several.
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import BinaryIO, Dict, Optional
+
+from ..database import SessionLocal, is_lock_timeout
+from ..metrics import registry
+from ..schemas import ImportJobStatus
+from .csv_service import CSVService, ImportProgress
+
+# Defaults, overridable from the environment
+IMPORT_JOB_WORKERS = int(os.getenv("IMPORT_JOB_WORKERS", "2"))
+IMPORT_JOB_MAX_PENDING = int(os.getenv("IMPORT_JOB_MAX_PENDING", "20"))
+IMPORT_JOB_RETENTION_SECONDS = float(os.getenv("IMPORT_JOB_RETENTION_SECONDS", "3600"))
+
+# Finished jobs kept for status queries, beyond which the oldest are dropped
+MAX_FINISHED_JOBS = 100
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+# Error of an import stopped by a lock wait timeout
+DATABASE_BUSY_ERROR = (
+    "The database was busy with other writes; rows imported before then are kept. "
+    "Try the import again."
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ImportCancelledError(Exception):
+    """Raised inside a running import to stop it after a cancel request."""
+
+
+class TooManyJobsError(RuntimeError):
+    """Raised when max_pending jobs are already queued or running."""
+
+
+class ImportJob(ImportProgress):
+    """One import, from submission until it finishes."""
+
+    def __init__(self, path: str, filename: str):
+        super().__init__()
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.filename = filename
+        self.status = QUEUED
+        self.submitted_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self.finished_monotonic: Optional[float] = None
+        self.error: Optional[str] = None
+        self.database_busy = False
+        self.cancel_requested = False
+        self.future: Optional[Future] = None
+
+    def report(self) -> None:
+        """Stop between chunks once cancellation has been requested."""
+        if self.cancel_requested:
+            raise ImportCancelledError()
+
+    def to_status(self) -> ImportJobStatus:
+        """Snapshot the job's state and progress."""
+        result = self.result
+        finished = self.status in FINISHED
+        return ImportJobStatus(
+            job_id=self.id,
+            status=self.status,
+            filename=self.filename,
+            submitted_at=self.submitted_at,
+            started_at=self.started_at,
+            finished_at=self.finished_at,
+            rows_parsed=self.rows_parsed,
+            rows_to_import=self.rows_to_import,
+            rows_imported=self.rows_imported,
+            created=result.created if result else 0,
+            updated=result.updated if result else 0,
+            restored=result.restored if result else 0,
+            failed=result.failed if result else 0,
+            error=self.error,
+            # Errors are appended while the job runs; expose them once it stops
+            result=result if finished else None,
+        )
+
+
+class ImportJobs:
+    """Queue of import jobs run by a bounded pool of worker threads."""
+
+    def __init__(
+        self,
+        workers: int = IMPORT_JOB_WORKERS,
+        max_pending: int = IMPORT_JOB_MAX_PENDING,
+        retention_seconds: float = IMPORT_JOB_RETENTION_SECONDS,
+        session_factory=SessionLocal,
+    ):
+        self.max_pending = max_pending
+        self.retention_seconds = retention_seconds
+        self.session_factory = session_factory
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-job")
+        self._jobs: Dict[str, ImportJob] = {}
+        self._lock = threading.Lock()
+        self.finished = {status: 0 for status in FINISHED}
+
+    def submit(self, upload: BinaryIO, filename: str, bounded: bool = True) -> ImportJob:
+        """Queue an uploaded CSV file for import.
+
+        Blocking: copies the upload to a temporary file. Raises
+        TooManyJobsError if max_pending jobs are already queued or running,
+        unless bounded is False.
+        """
+        if bounded:
+            with self._lock:
+                self._check_capacity()
+        fd, path = tempfile.mkstemp(prefix="import-", suffix=".csv")
+        with os.fdopen(fd, "wb") as copy:
+            shutil.copyfileobj(upload, copy)
+
+        job = ImportJob(path, filename)
+        try:
+            with self._lock:
+                if bounded:
+                    self._check_capacity()
+                self._jobs[job.id] = job
+                job.future = self._executor.submit(self._run, job)
+        except Exception:
+            os.unlink(path)
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """Get a job by id, or None if it is unknown or has expired."""
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[ImportJob]:
+        """Cancel a job, or None if it is unknown.
+
+        A queued job never starts. A running job stops after the chunk it
+        is importing; chunks already imported are kept. Finished jobs are
+        left as they are.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status in FINISHED:
+                return job
+            job.cancel_requested = True
+            if job.future.cancel():
+                self._finish(job, CANCELLED)
+                os.unlink(job.path)
+        return job
+
+    async def wait(self, job: ImportJob) -> None:
+        """Wait for a job to finish, without cancelling it if the caller is."""
+        if not job.future.cancelled():
+            await asyncio.shield(asyncio.wrap_future(job.future))
+
+    def shutdown(self) -> None:
+        """Cancel every pending job and stop the workers."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            self.cancel(job.id)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _check_capacity(self) -> None:
+        pending = sum(1 for job in self._jobs.values() if job.status not in FINISHED)
+        if pending >= self.max_pending:
+            raise TooManyJobsError("Too many import jobs are queued; try again later")
+
+    def _run(self, job: ImportJob) -> None:
+        """Import a job's file on a worker thread."""
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = datetime.utcnow()
+        try:
+            with open(job.path, encoding="utf-8", newline="") as stream, \
+                    self.session_factory() as db:
+                CSVService(db).import_from_stream(stream, job)
+        except ImportCancelledError:
+            status, error = CANCELLED, None
+        except Exception as e:
+            logger.warning("Import job %s failed: %s", job.id, e)
+            if is_lock_timeout(e):
+                job.database_busy = True
+                status, error = FAILED, DATABASE_BUSY_ERROR
+            else:
+                status, error = FAILED, str(e)
+        else:
+            status, error = COMPLETED, None
+        finally:
+            os.unlink(job.path)
+
+        with self._lock:
+            self._finish(job, status, error)
+
+    def _finish(self, job: ImportJob, status: str, error: Optional[str] = None) -> None:
+        """Record how a job ended; call with the lock held."""
+        job.status = status
+        job.error = error
+        job.finished_at = datetime.utcnow()
+        job.finished_monotonic = time.monotonic()
+        self.finished[status] += 1
+
+    def _prune(self) -> None:
+        """Forget finished jobs past their retention, and the oldest beyond the cap."""
+        now = time.monotonic()
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_monotonic is not None),
+            key=lambda job: job.finished_monotonic,
+        )
+        for index, job in enumerate(finished):
+            expired = now - job.finished_monotonic > self.retention_seconds
+            if expired or len(finished) - index > MAX_FINISHED_JOBS:
+                del self._jobs[job.id]
+
+    def metric_families(self, prefix: str):
+        """Describe the jobs as metric families for metrics.Registry."""
+        with self._lock:
+            active = {QUEUED: 0, RUNNING: 0}
+            for job in self._jobs.values():
+                if job.status in active:
+                    active[job.status] += 1
+            finished = dict(self.finished)
+        return [
+            (prefix, "gauge", "Import jobs queued or running.",
+             [({"status": status}, count) for status, count in active.items()]),
+            (f"{prefix}_finished_total", "counter", "Import jobs finished, by outcome.",
+             [({"status": status}, count) for status, count in finished.items()]),
+        ]
+
+
+import_jobs = ImportJobs()
+
+registry.register_collector(lambda: import_jobs.metric_families("equipment_import_jobs"))
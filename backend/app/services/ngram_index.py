@@ -0,0 +1,180 @@
+"""Trigram side index for substring filters on equipment text fields."""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, distinct, event, exists, func, insert, or_, select
+
+from ..models import Equipment, EquipmentNgram
+
+# Fields whose substring filters are served by the n-gram index
+NGRAM_FIELDS = ('location', 'primary_user', 'model')
+
+NGRAM_SIZE = 3
+
+# Distinct values indexed per batch
+BATCH_SIZE = 500
+
+
+def ngrams(value: Optional[str]) -> Set[str]:
+    """Get the distinct lowercase n-grams of a string."""
+    if not value:
+        return set()
+    value = value.lower()
+    return {value[i:i + NGRAM_SIZE] for i in range(len(value) - NGRAM_SIZE + 1)}
+
+
+def replaced_values(previous, changes: Dict) -> Dict:
+    """Get the filterable field values a write replaces, for NgramIndex.prune.
+
+    previous is the record before the write, as an Equipment or a dict of
+    its values; changes are the values written.
+    """
+    if isinstance(previous, dict):
+        old_value = previous.get
+    else:
+        old_value = lambda field: getattr(previous, field)
+    return {
+        field: old_value(field)
+        for field in NGRAM_FIELDS
+        if field in changes and changes[field] != old_value(field)
+    }
+
+
+class NgramIndex:
+    """Maintains and queries the equipment_ngram table.
+
+    Works with either a Session or a Connection, so it can run inside a
+    service transaction as well as in DDL event handlers and migrations.
+    Writes index the values they set (add_records) and drop those they
+    replace once no equipment holds them any more (prune); soft-deleted
+    equipment still holds its values, so a restore finds them indexed.
+    """
+
+    def __init__(self, db):
+        self.db = db
+
+    def add_records(self, records: Iterable[Dict]) -> None:
+        """Index the filterable field values of written equipment records.
+
+        Accepts dicts of column values, which may omit unchanged fields.
+        Call within the same transaction as the write. Values already
+        indexed are found with one query per batch, across all fields.
+        """
+        pairs = self._field_values(records)
+        for offset in range(0, len(pairs), BATCH_SIZE):
+            self._add_values(pairs[offset:offset + BATCH_SIZE])
+
+    def prune(self, records: Iterable[Dict]) -> None:
+        """Drop the n-grams of replaced values that no equipment holds any more.
+
+        Accepts the values written records held before the write, as dicts
+        like add_records; pass only the fields the write changed. Call after
+        the write has been executed (flushed), within the same transaction.
+        """
+        pairs = self._field_values(records)
+        for offset in range(0, len(pairs), BATCH_SIZE):
+            batch = pairs[offset:offset + BATCH_SIZE]
+            self.db.execute(delete(EquipmentNgram).where(or_(*(
+                and_(
+                    EquipmentNgram.field == field,
+                    EquipmentNgram.value.in_(values),
+                    ~exists().where(getattr(Equipment, field) == EquipmentNgram.value),
+                )
+                for field, values in self._group_by_field(batch).items()
+            ))))
+
+    def rebuild(self) -> int:
+        """Rebuild the whole index from the equipment table.
+
+        Returns the number of distinct values indexed.
+        """
+        self.db.execute(delete(EquipmentNgram))
+
+        indexed = 0
+        for field in NGRAM_FIELDS:
+            column = getattr(Equipment, field)
+            pairs = [
+                (field, row[0]) for row in self.db.execute(
+                    select(column).where(column.isnot(None)).distinct()
+                )
+            ]
+            for offset in range(0, len(pairs), BATCH_SIZE):
+                self._insert_grams(pairs[offset:offset + BATCH_SIZE])
+            indexed += len(pairs)
+
+        return indexed
+
+    @staticmethod
+    def _field_values(records: Iterable[Dict]) -> List[Tuple[str, str]]:
+        """Collect the distinct non-empty (field, value) pairs of records."""
+        pairs = {
+            (field, record[field])
+            for record in records
+            for field in NGRAM_FIELDS
+            if record.get(field)
+        }
+        return sorted(pairs)
+
+    @staticmethod
+    def _group_by_field(pairs: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+        """Group (field, value) pairs into the values of each field."""
+        values_by_field: Dict[str, List[str]] = {}
+        for field, value in pairs:
+            values_by_field.setdefault(field, []).append(value)
+        return values_by_field
+
+    def _add_values(self, pairs: List[Tuple[str, str]]) -> None:
+        """Index the (field, value) pairs that are not indexed yet."""
+        indexed = {
+            (field, value) for field, value in self.db.execute(
+                select(EquipmentNgram.field, EquipmentNgram.value).where(or_(*(
+                    and_(EquipmentNgram.field == field, EquipmentNgram.value.in_(values))
+                    for field, values in self._group_by_field(pairs).items()
+                ))).distinct()
+            )
+        }
+        self._insert_grams([pair for pair in pairs if pair not in indexed])
+
+    def _insert_grams(self, pairs: List[Tuple[str, str]]) -> None:
+        """Insert the n-grams of (field, value) pairs that are not indexed yet."""
+        rows = [
+            {'field': field, 'gram': gram, 'value': value}
+            for field, value in pairs
+            for gram in ngrams(value)
+        ]
+        if rows:
+            self.db.execute(insert(EquipmentNgram), rows)
+
+    @staticmethod
+    def filter_clause(field: str, value: str):
+        """Build an indexed substring filter on an equipment field.
+
+        The n-gram table narrows the field's distinct values down to those
+        containing every n-gram of value, and equipment is then matched on
+        the field with an IN lookup that can use the column's index; the
+        substring match is re-checked on those rows only. Returns None when
+        value is shorter than an n-gram, in which case the index cannot help.
+        """
+        grams = ngrams(value)
+        if not grams:
+            return None
+
+        # Values having every gram, from one IN lookup on the gram index;
+        # grouped rather than INTERSECTed, which MySQL lacks before 8.0.31
+        column = getattr(Equipment, field)
+        matching_values = (
+            select(EquipmentNgram.value)
+            .where(
+                EquipmentNgram.field == field,
+                EquipmentNgram.gram.in_(sorted(grams)),
+            )
+            .group_by(EquipmentNgram.value)
+            .having(func.count(distinct(EquipmentNgram.gram)) == len(grams))
+        )
+        return and_(column.in_(matching_values), column.ilike(f"%{value}%"))
+
+
+@event.listens_for(EquipmentNgram.__table__, "after_create")
+def _backfill_ngram_index(target, connection, **kw):
+    """Index existing equipment when the n-gram table is first created."""
+    NgramIndex(connection).rebuild()
@@ -0,0 +1,126 @@
+"""Opaque cursor encoding and keyset predicates for paginated list queries."""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, List, Optional
+
+from sqlalchemy import String, and_, or_, false, type_coerce
+from sqlalchemy.orm import InstrumentedAttribute
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded or does not match the query."""
+
+
+def _to_json_value(value: Any) -> Any:
+    """Convert a sort key value into a JSON-safe representation."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def _from_json_value(column: InstrumentedAttribute, value: Any) -> Any:
+    """Convert a JSON cursor value back into the column's Python type."""
+    if value is None:
+        return None
+
+    python_type = column.type.python_type
+    if issubclass(python_type, Enum):
+        return python_type(value)
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    return python_type(value)
+
+
+def encode_cursor(sort_by: str, sort_order: str, values: List[Any]) -> str:
+    """Encode the sort key of the last row of a page as an opaque cursor."""
+    payload = {
+        "s": sort_by,
+        "o": sort_order,
+        "k": [_to_json_value(v) for v in values],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(
+    cursor: str,
+    sort_by: str,
+    sort_order: str,
+    columns: List[InstrumentedAttribute],
+) -> List[Any]:
+    """Decode a cursor into typed sort key values for the given key columns.
+
+    The cursor must have been issued for the same sort field and direction.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        keys = payload["k"]
+        if payload["s"] != sort_by or payload["o"] != sort_order:
+            raise InvalidCursorError("Cursor does not match the requested sort order")
+        if len(keys) != len(columns):
+            raise InvalidCursorError("Malformed cursor")
+        return [_from_json_value(col, v) for col, v in zip(columns, keys)]
+    except InvalidCursorError:
+        raise
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeError) as e:
+        raise InvalidCursorError("Malformed cursor") from e
+
+
+def keyset_predicate(
+    columns: List[InstrumentedAttribute],
+    values: List[Any],
+    descending: bool,
+):
+    """Build a WHERE clause selecting rows strictly after the given sort key.
+
+    Rows are compared lexicographically over ``columns``. NULLs sort first in
+    ascending order and last in descending order, which matches both SQLite
+    and MySQL, so nullable sort columns page correctly without NULLS FIRST.
+    """
+    clauses = []
+    equal_prefix = []
+
+    for column, value in zip(columns, values):
+        if isinstance(value, datetime):
+            # Compare as text: SQLite keeps server-default timestamps without
+            # microseconds, which never equal a bound DATETIME parameter
+            column, value = type_coerce(column, String), str(value)
+
+        if value is None:
+            after = None if descending else column.isnot(None)
+            equal = column.is_(None)
+        else:
+            after = or_(column < value, column.is_(None)) if descending else column > value
+            equal = column == value
+
+        if after is not None:
+            clauses.append(and_(*equal_prefix, after))
+        equal_prefix.append(equal)
+
+    if not clauses:
+        return false()
+    return or_(*clauses)
+
+
+def row_sort_key(row: Any, columns: List[InstrumentedAttribute]) -> List[Any]:
+    """Extract the sort key values of ``columns`` from an ORM row."""
+    return [getattr(row, column.key) for column in columns]
+
+
+def clamp_page_size(limit: Optional[int]) -> int:
+    """Return a page size within the allowed bounds."""
+    if not limit:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(limit, MAX_PAGE_SIZE))
@@ -0,0 +1,132 @@
+"""In-process LRU cache for serialized query results."""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from ..metrics import registry
+
+# Defaults for the equipment list cache, overridable from the environment
+LIST_CACHE_SIZE = int(os.getenv("LIST_CACHE_SIZE", "256"))
+LIST_CACHE_TTL = float(os.getenv("LIST_CACHE_TTL", "60"))
+
+# Defaults for the equipment identifier cache, overridable from the environment
+IDENTIFIER_CACHE_SIZE = int(os.getenv("IDENTIFIER_CACHE_SIZE", "2048"))
+IDENTIFIER_CACHE_TTL = float(os.getenv("IDENTIFIER_CACHE_TTL", "300"))
+
+
+class ResultCache:
+    """Bounded, thread-safe LRU cache keyed by change generation.
+
+    Every lookup passes the current change generation (see
+    services.generation), which is read from the database. Entries cached
+    under an older generation are never returned, and the whole cache is
+    dropped as soon as a newer generation is seen. Because the generation
+    lives in the database, each uvicorn worker can keep its own cache and
+    still observe writes made through any other worker.
+
+    Entries are also evicted least-recently-used beyond max_entries and
+    after ttl_seconds. A max_entries of 0 disables the cache.
+    """
+
+    def __init__(self, max_entries: int = LIST_CACHE_SIZE, ttl_seconds: float = LIST_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, generation: int, key: Hashable) -> Optional[Any]:
+        """Get the value cached for key at generation, or None."""
+        with self._lock:
+            self._advance(generation)
+            entry = self._entries.get(key) if generation == self._generation else None
+
+            if entry is not None and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                self.evictions += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, generation: int, key: Hashable, value: Any) -> None:
+        """Cache value for key, computed at generation."""
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._advance(generation)
+            if generation != self._generation:
+                # Computed from data that has already changed
+                return
+
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get cache counters and configuration."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "generation": self._generation,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def metric_families(self, prefix: str) -> list:
+        """Get the counters as metric families for the metrics registry."""
+        stats = self.stats()
+        families = [
+            (f"{prefix}_entries", "gauge", "Entries currently cached.", [({}, stats["entries"])]),
+        ]
+        for counter, help in (
+            ("hits", "Lookups answered from the cache."),
+            ("misses", "Lookups not answered from the cache."),
+            ("evictions", "Entries evicted by size or age."),
+            ("invalidations", "Times the cache was dropped after a write."),
+        ):
+            families.append((f"{prefix}_{counter}_total", "counter", help, [({}, stats[counter])]))
+        return families
+
+    def _advance(self, generation: int) -> None:
+        """Drop all entries once a newer generation is seen. Caller holds the lock."""
+        if generation > self._generation:
+            if self._entries:
+                self._entries.clear()
+                self.invalidations += 1
+            self._generation = generation
+
+
+# Serialized GET /computers responses
+list_cache = ResultCache()
+registry.register_collector(lambda: list_cache.metric_families("equipment_list_cache"))
+
+# Equipment records by identifier, see EquipmentService.get_by_identifier
+identifier_cache = ResultCache(IDENTIFIER_CACHE_SIZE, IDENTIFIER_CACHE_TTL)
+registry.register_collector(lambda: identifier_cache.metric_families("equipment_identifier_cache"))
@@ -0,0 +1,103 @@
+"""Search service for ranked full-text equipment search."""
+
+import re
+from typing import List, Optional
+
+from sqlalchemy import column, desc, literal_column, or_, table
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..models import Equipment
+from ..models.search_index import FTS_TABLE, SEARCH_FIELDS
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a free-text query into lowercase word tokens."""
+    return re.findall(r"\w+", query.lower())
+
+
+class SearchService:
+    """Service class for full-text search over equipment.
+
+    Uses the SQLite FTS5 index or the MySQL FULLTEXT index depending on the
+    database in use, and falls back to a substring scan on other databases.
+    Every term must match (as a word prefix) for a record to be returned.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def search(
+        self,
+        query: str,
+        limit: int = 50,
+        offset: int = 0,
+        include_total: bool = True,
+        include_deleted: bool = False,
+    ) -> tuple[List[Equipment], Optional[int]]:
+        """Search equipment by free text, best matches first.
+
+        Returns a tuple of (items, total). total is None when include_total
+        is False.
+        """
+        terms = search_terms(query)
+        if not terms:
+            return [], 0 if include_total else None
+
+        if self.dialect == "sqlite":
+            results, rank = self._sqlite_query(terms)
+        elif self.dialect == "mysql":
+            results, rank = self._mysql_query(terms)
+        else:
+            results, rank = self._fallback_query(terms)
+
+        # Exclude soft-deleted unless requested
+        if not include_deleted:
+            results = results.filter(Equipment.is_deleted == False)
+
+        total = results.order_by(None).count() if include_total else None
+        items = results.order_by(rank, Equipment.id).offset(offset).limit(limit).all()
+        return items, total
+
+    def _sqlite_query(self, terms: List[str]):
+        """Match against the FTS5 index, ordered by bm25 rank."""
+        fts = table(FTS_TABLE, column("rowid"), column("rank"))
+        expression = " ".join(f'"{term}"*' for term in terms)
+
+        query = self.db.query(Equipment).join(
+            fts, fts.c.rowid == Equipment.id
+        ).filter(literal_column(FTS_TABLE).op("MATCH")(expression))
+        return query, fts.c.rank
+
+    def _mysql_query(self, terms: List[str]):
+        """Match against the FULLTEXT index in boolean mode, by relevance."""
+        columns = [getattr(Equipment, f) for f in SEARCH_FIELDS]
+        expression = " ".join(f"+{term}*" for term in terms)
+        relevance = match(*columns, against=expression).in_boolean_mode()
+
+        query = self.db.query(Equipment).filter(relevance)
+        return query, desc(relevance)
+
+    def _fallback_query(self, terms: List[str]):
+        """Scan text columns for every term when no full-text index exists."""
+        query = self.db.query(Equipment)
+        for term in terms:
+            query = query.filter(or_(
+                *(getattr(Equipment, f).ilike(f"%{term}%") for f in SEARCH_FIELDS)
+            ))
+        return query, Equipment.equipment_name
+
+
+class AsyncSearchService:
+    """Async counterpart of SearchService for an AsyncSession."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def search(self, query: str, **options) -> tuple[List[Equipment], Optional[int]]:
+        """Search equipment by free text; see SearchService.search."""
+        return await self.db.run_sync(
+            lambda session: SearchService(session).search(query, **options)
+        )
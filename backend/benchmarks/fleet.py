@@ -0,0 +1,246 @@
+"""Synthetic equipment fleet for benchmarks.
+
+seed_fleet() fills an empty database with a deterministic, realistically
+shaped fleet: a mix of equipment types with type-specific fields, skewed
+status and usage distributions, a few thousand locations, users shared
+between machines, a small share of soft-deleted rows, and an assignment
+history of history_depth previous assignments per machine on average.
+The n-gram index and fleet summary are rebuilt afterwards, as a migration
+would, so every read path sees the same state it would in production.
+"""
+
+import random
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List
+
+from sqlalchemy import insert
+
+from app.models import (
+    EQUIPMENT_TYPE_PREFIXES,
+    AssignmentHistory,
+    ComputerSubtype,
+    Equipment,
+    EquipmentType,
+    Status,
+    UsageType,
+)
+from app.services.fleet_summary import FleetSummary
+from app.services.ngram_index import NgramIndex
+
+# Average number of previous assignments per machine
+DEFAULT_HISTORY_DEPTH = 3
+
+# Rows inserted per statement while seeding
+SEED_BATCH_SIZE = 10_000
+
+TYPE_WEIGHTS = {
+    EquipmentType.PC: 60,
+    EquipmentType.MONITOR: 25,
+    EquipmentType.PRINTER: 8,
+    EquipmentType.SCANNER: 7,
+}
+STATUS_WEIGHTS = {
+    Status.ACTIVE: 75,
+    Status.IN_STORAGE: 8,
+    Status.INACTIVE: 7,
+    Status.IN_REPAIR: 5,
+    Status.DECOMMISSIONED: 5,
+}
+DELETED_SHARE = 0.02
+
+MODELS = {
+    EquipmentType.PC: [
+        ("Dell", "OptiPlex 7090"), ("Dell", "Latitude 5420"), ("Lenovo", "ThinkPad X1 Carbon"),
+        ("Lenovo", "ThinkCentre M70q"), ("HP", "EliteBook 840"), ("HP", "ProDesk 400"),
+        ("Apple", "MacBook Pro"), ("Apple", "iMac 24"),
+    ],
+    EquipmentType.MONITOR: [
+        ("Dell", "UltraSharp U2723QE"), ("LG", "27UK850"), ("Samsung", "S24R650"),
+        ("HP", "E24 G5"), ("BenQ", "PD2705Q"),
+    ],
+    EquipmentType.PRINTER: [
+        ("HP", "LaserJet Pro M404"), ("Brother", "HL-L2350DW"), ("Canon", "imageCLASS MF445"),
+    ],
+    EquipmentType.SCANNER: [
+        ("Fujitsu", "ScanSnap iX1600"), ("Epson", "WorkForce ES-500W"), ("Canon", "DR-C225"),
+    ],
+}
+CPUS = [
+    ("Intel Core i5-1145G7", "2.6 GHz"), ("Intel Core i7-11700", "2.5 GHz"),
+    ("AMD Ryzen 5 5600G", "3.9 GHz"), ("AMD Ryzen 7 5800U", "1.9 GHz"), ("Apple M2", "3.5 GHz"),
+]
+OPERATING_SYSTEMS = ["Windows 11 Pro", "Windows 10 Pro", "macOS Sonoma", "Ubuntu 22.04"]
+RAM_SIZES = ["8 GB", "16 GB", "32 GB", "64 GB"]
+STORAGE_SIZES = ["256 GB SSD", "512 GB SSD", "1 TB SSD", "2 TB HDD"]
+VIDEO_CARDS = ["Intel Iris Xe", "AMD Radeon Graphics", "NVIDIA RTX A2000", "Apple GPU"]
+RESOLUTIONS = ["1920x1080", "2560x1440", "3840x2160"]
+
+CITIES = [
+    "New York", "London", "Berlin", "Tokyo", "Sydney", "Toronto", "Madrid", "Seoul",
+    "Chicago", "Paris", "Singapore", "Dublin",
+]
+SITES = ["HQ", "Office", "Warehouse", "Lab", "Branch"]
+FLOORS = 40
+FIRST_NAMES = [
+    "alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi", "ivan", "judy",
+    "mallory", "niaj", "olivia", "peggy", "rupert", "sybil", "trent", "victor", "walter", "zoe",
+]
+
+# Days a previous assignment lasted
+ASSIGNMENT_DAYS = (60, 720)
+
+
+def seed_fleet(
+    session,
+    count: int,
+    history_depth: float = DEFAULT_HISTORY_DEPTH,
+    seed: int = 0,
+    batch_size: int = SEED_BATCH_SIZE,
+) -> int:
+    """Insert count equipment rows with assignment history and commit.
+
+    Expects an empty database with the schema created. The same count,
+    history_depth and seed always produce the same fleet. Returns the
+    number of history rows inserted.
+    """
+    rng = random.Random(seed)
+    users = max(count // 2, 1)
+    next_num = {equipment_type: 0 for equipment_type in TYPE_WEIGHTS}
+    history_rows = 0
+
+    for start in range(1, count + 1, batch_size):
+        equipment: List[Dict[str, Any]] = []
+        history: List[Dict[str, Any]] = []
+        for pk in range(start, min(start + batch_size, count + 1)):
+            record = _equipment_row(rng, pk, next_num, users)
+            equipment.append(record)
+            history.extend(_history_rows(rng, record, history_depth, users))
+
+        session.execute(insert(Equipment), equipment)
+        if history:
+            session.execute(insert(AssignmentHistory), history)
+        history_rows += len(history)
+
+    NgramIndex(session).rebuild()
+    FleetSummary(session).rebuild()
+    session.commit()
+    return history_rows
+
+
+def _choice(rng: random.Random, weights: Dict[Any, int]) -> Any:
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _user(rng: random.Random, users: int) -> str:
+    return f"{rng.choice(FIRST_NAMES)}.{rng.randint(1, users)}"
+
+
+def _equipment_row(
+    rng: random.Random,
+    pk: int,
+    next_num: Dict[EquipmentType, int],
+    users: int,
+) -> Dict[str, Any]:
+    """Build the column values of one synthetic machine."""
+    equipment_type = _choice(rng, TYPE_WEIGHTS)
+    next_num[equipment_type] += 1
+    num = next_num[equipment_type]
+    manufacturer, model = rng.choice(MODELS[equipment_type])
+
+    acquisition_date = date(2016, 1, 1) + timedelta(days=rng.randint(0, 3000))
+    deleted = rng.random() < DELETED_SHARE
+    row: Dict[str, Any] = {
+        "id": pk,
+        "equipment_id": f"{EQUIPMENT_TYPE_PREFIXES[equipment_type]}-{num:04d}",
+        "equipment_id_num": num,
+        "equipment_type": equipment_type,
+        "serial_number": f"SN{pk:09d}",
+        "is_deleted": deleted,
+        "deleted_at": None,
+        "model": model,
+        "manufacturer": manufacturer,
+        "manufacturing_date": acquisition_date - timedelta(days=rng.randint(30, 365)),
+        "acquisition_date": acquisition_date,
+        "location": f"{rng.choice(CITIES)} {rng.choice(SITES)} {rng.randint(1, FLOORS)}",
+        "cost": Decimal(rng.randint(8_000, 350_000)) / 100,
+        "status": _choice(rng, STATUS_WEIGHTS),
+        "notes": "Replaced battery" if rng.random() < 0.05 else None,
+        "computer_subtype": None,
+        "cpu_model": None,
+        "cpu_speed": None,
+        "operating_system": None,
+        "ram": None,
+        "storage": None,
+        "video_card": None,
+        "display_resolution": None,
+        "mac_address": None,
+        "cpu_score": None,
+        "score_2d": None,
+        "score_3d": None,
+        "memory_score": None,
+        "disk_score": None,
+        "overall_rating": None,
+        "equipment_name": None,
+        "ip_address": None,
+        "assignment_date": None,
+        "primary_user": None,
+        "usage_type": None,
+    }
+    if deleted:
+        row["deleted_at"] = datetime.combine(acquisition_date, datetime.min.time()) + timedelta(
+            days=rng.randint(100, 2000)
+        )
+
+    if equipment_type == EquipmentType.PC:
+        cpu_model, cpu_speed = rng.choice(CPUS)
+        row.update(
+            computer_subtype=rng.choice(list(ComputerSubtype)),
+            cpu_model=cpu_model,
+            cpu_speed=cpu_speed,
+            operating_system=rng.choice(OPERATING_SYSTEMS),
+            ram=rng.choice(RAM_SIZES),
+            storage=rng.choice(STORAGE_SIZES),
+            video_card=rng.choice(VIDEO_CARDS),
+            display_resolution=rng.choice(RESOLUTIONS),
+            mac_address=":".join(f"{rng.randint(0, 255):02X}" for _ in range(6)),
+            cpu_score=rng.randint(8_000, 30_000),
+            score_2d=rng.randint(300, 1_200),
+            score_3d=rng.randint(1_000, 20_000),
+            memory_score=rng.randint(1_500, 3_500),
+            disk_score=rng.randint(2_000, 40_000),
+            overall_rating=rng.randint(1, 5),
+        )
+
+    # Most machines are assigned; spares sit in storage without a user
+    if equipment_type != EquipmentType.SCANNER and row["status"] != Status.IN_STORAGE:
+        row.update(
+            equipment_name=f"{row['equipment_id']}-{rng.choice(SITES).upper()}",
+            ip_address=f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+            assignment_date=acquisition_date + timedelta(days=rng.randint(0, 900)),
+            primary_user=_user(rng, users),
+            usage_type=UsageType.WORK if rng.random() < 0.9 else UsageType.PERSONAL,
+        )
+    return row
+
+
+def _history_rows(
+    rng: random.Random,
+    record: Dict[str, Any],
+    history_depth: float,
+    users: int,
+) -> Iterator[Dict[str, Any]]:
+    """Generate previous assignments, newest first, ending where the next began."""
+    depth = rng.randint(0, round(2 * history_depth)) if history_depth else 0
+    end_date = record["assignment_date"] or record["acquisition_date"] + timedelta(days=900)
+    for _ in range(depth):
+        start_date = end_date - timedelta(days=rng.randint(*ASSIGNMENT_DAYS))
+        yield {
+            "equipment_id": record["id"],
+            "previous_user": _user(rng, users),
+            "previous_usage_type": UsageType.WORK if rng.random() < 0.9 else UsageType.PERSONAL,
+            "previous_equipment_name": record["equipment_name"] or record["equipment_id"],
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+        end_date = start_date
@@ -0,0 +1,93 @@
+"""Benchmark the list endpoint's fast serialization path against the ORM path.
+
+Seeds a throwaway SQLite database at each fleet size and times an unfiltered
+list both ways:
+
+- orm: Equipment objects validated through EquipmentListItem and encoded
+  with the stdlib json module, as FastAPI does for a response_model.
+- fast: column rows encoded directly with orjson (api.serialization).
+
+Both outputs are checked to be byte-identical.
+
+Usage (from the backend directory):
+    python -m benchmarks.list_serialization [ROW_COUNT ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.serialization import LIST_FIELDS, dump_list_rows
+from app.database import Base
+from app.schemas import EquipmentListItem
+from app.services.equipment_service import EquipmentService
+from benchmarks.ngram_filter import median_ms, seed
+
+DEFAULT_ROW_COUNTS = [1_000, 10_000, 100_000]
+
+list_adapter = TypeAdapter(List[EquipmentListItem])
+
+
+def orm_path(service: EquipmentService) -> bytes:
+    """Load Equipment objects and serialize them like a FastAPI response_model."""
+    items = service.get_all()
+    content = list_adapter.dump_python(
+        list_adapter.validate_python(items, from_attributes=True),
+        mode="json",
+        exclude_unset=True,
+    )
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def fast_path(service: EquipmentService) -> bytes:
+    """Load column rows and encode them with orjson."""
+    return dump_list_rows(service.get_all(columns=LIST_FIELDS))
+
+
+def run(count: int) -> None:
+    """Seed a database of count rows and print list timings for both paths."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        seed(session, count)
+
+        service = EquipmentService(session)
+
+        def orm():
+            # A fresh identity map each time, as for a new request
+            session.expunge_all()
+            return orm_path(service)
+
+        expected = orm()
+        actual = fast_path(service)
+        assert actual == expected, "fast path output differs from the ORM path"
+
+        orm_ms = median_ms(orm)
+        fast_ms = median_ms(lambda: fast_path(service))
+        print(
+            f"{count:>9} {len(actual) / 1e6:>9.1f} "
+            f"{orm_ms:>10.1f} {fast_ms:>10.1f} {orm_ms / fast_ms:>8.1f}x"
+        )
+
+        session.close()
+        engine.dispose()
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    print(f"{'rows':>9} {'MB':>9} {'orm ms':>10} {'fast ms':>10} {'speedup':>9}")
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
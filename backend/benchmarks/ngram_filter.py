@@ -0,0 +1,108 @@
+"""Benchmark substring filter latency with and without the n-gram index.
+
+Seeds a throwaway SQLite database at each fleet size and times the list
+filters on location, primary_user and model, comparing the indexed path used
+by EquipmentService with a plain ILIKE scan.
+
+Usage (from the backend directory):
+    python -m benchmarks.ngram_filter [ROW_COUNT ...]
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Equipment, EquipmentType
+from app.services.equipment_service import EquipmentService
+from app.services.ngram_index import NgramIndex
+
+DEFAULT_ROW_COUNTS = [1_000, 10_000, 100_000]
+REPEATS = 7
+
+CITIES = ["New York", "London", "Berlin", "Tokyo", "Sydney", "Toronto", "Madrid", "Seoul"]
+SITES = ["HQ", "Office", "Warehouse", "Lab", "Branch"]
+FIRST_NAMES = ["alice", "bob", "carol", "dave", "erin", "frank", "grace", "heidi"]
+MODELS = ["OptiPlex 7090", "ThinkPad X1 Carbon", "EliteBook 840", "Latitude 5420", "MacBook Pro"]
+
+# (field, filter value) pairs timed at each size
+FILTERS = [
+    ("location", "okyo lab 4"),
+    ("primary_user", "grace.12"),
+    ("model", "thinkpad"),
+]
+
+
+def seed(session, count: int) -> None:
+    """Insert count synthetic equipment rows and build the n-gram index."""
+    rng = random.Random(count)
+    rows = [
+        {
+            "equipment_id": f"PC-{i:04d}",
+            "equipment_id_num": i,
+            "equipment_type": EquipmentType.PC,
+            "serial_number": f"SN{i:08d}",
+            "location": f"{rng.choice(CITIES)} {rng.choice(SITES)} {rng.randint(1, 50)}",
+            "primary_user": f"{rng.choice(FIRST_NAMES)}.{rng.randint(1, count // 10 + 1)}",
+            "model": rng.choice(MODELS),
+            "is_deleted": False,
+        }
+        for i in range(1, count + 1)
+    ]
+    session.execute(insert(Equipment), rows)
+    NgramIndex(session).rebuild()
+    session.commit()
+
+
+def median_ms(fn) -> float:
+    """Run fn REPEATS times and return the median wall time in milliseconds."""
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(count: int) -> None:
+    """Seed a database of count rows and print filter timings."""
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        session = sessionmaker(bind=engine)()
+        seed(session, count)
+
+        service = EquipmentService(session)
+        for field, value in FILTERS:
+            column = getattr(Equipment, field)
+            scan = session.query(Equipment).filter(
+                Equipment.is_deleted == False, column.ilike(f"%{value}%")
+            )
+            matches = scan.count()
+
+            indexed_ms = median_ms(lambda: service.get_all(**{field: value}))
+            scan_ms = median_ms(lambda: scan.all())
+            print(
+                f"{count:>9} {field:<13} {value!r:<12} {matches:>7} "
+                f"{scan_ms:>10.2f} {indexed_ms:>10.2f}"
+            )
+
+        session.close()
+        engine.dispose()
+
+
+def main() -> None:
+    counts = [int(arg) for arg in sys.argv[1:]] or DEFAULT_ROW_COUNTS
+    print(f"{'rows':>9} {'field':<13} {'value':<12} {'matches':>7} {'scan ms':>10} {'ngram ms':>10}")
+    for count in counts:
+        run(count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,466 @@
+"""Benchmark suite for the main API paths at several fleet sizes.
+
+Seeds a synthetic fleet (see benchmarks.fleet) into a SQLite database per
+size and measures:
+
+- list: the first page of GET /computers for every sort field and order
+  under each filter in LIST_FILTERS, plus the unpaginated list per filter
+  for fleets up to FULL_LIST_MAX_ROWS
+- detail: GET /computers/{identifier} by equipment ID and by serial number
+- history: GET /computers/{identifier}/history
+- export: the CSV export stream, read to the end
+- import: a CSV import of IMPORT_ROWS rows, half updates and half new
+  machines, run as an import job (as POST /computers/import does) into a
+  fresh copy of the database each run
+
+Each size runs in its own process, configured through the environment
+like a deployment (DATABASE_URL, with the list result and identifier
+caches disabled), so every request does its full work. List, detail and
+history requests go through the ASGI app. Export calls the async services
+the route uses and import submits to an ImportJobs queue, so their memory
+figures are not inflated by the test client buffering the whole body.
+
+Every scenario reports median, p95 and min latency and the peak Python
+heap allocation during one run (tracemalloc; memory allocated inside
+SQLite itself is not included). Results are written as JSON, and a run can
+be compared with an earlier one: a scenario regresses when its median
+latency or peak memory grows by more than --threshold percent and by more
+than MIN_REGRESSION_MS / MIN_REGRESSION_KIB.
+
+Usage (from the backend directory):
+    python -m benchmarks.suite [--rows N ...] [--history-depth D] [--repeats R]
+        [--only PREFIX ...] [--db-dir DIR] [--output FILE]
+        [--baseline FILE] [--threshold PERCENT]
+    python -m benchmarks.suite --compare FILE --baseline FILE
+"""
+
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+import sqlalchemy
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models import Equipment
+from benchmarks.fleet import DEFAULT_HISTORY_DEPTH, seed_fleet
+
+DEFAULT_ROW_COUNTS = [10_000, 100_000, 1_000_000]
+DEFAULT_REPEATS = 5
+
+# Page size of the paginated list scenarios
+PAGE_SIZE = 100
+
+# Largest fleet the unpaginated list is measured at
+FULL_LIST_MAX_ROWS = 100_000
+
+# Machines sampled for the detail and history scenarios
+SAMPLE_SIZE = 20
+
+# Rows in the imported file
+IMPORT_ROWS = 2_000
+
+# Regression thresholds used when comparing with a baseline
+DEFAULT_THRESHOLD = 20.0
+MIN_REGRESSION_MS = 1.0
+MIN_REGRESSION_KIB = 64.0
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Accepted values of the list endpoint's sort_by parameter
+SORT_FIELDS = (
+    "equipment_id", "equipment_name", "computer_subtype", "primary_user", "status",
+    "manufacturer", "model", "location", "cpu_model", "ram", "storage", "operating_system",
+    "serial_number", "cpu_score", "score_2d", "score_3d", "memory_score", "disk_score",
+    "overall_rating", "assignment_date", "usage_type", "created_at",
+)
+SORT_ORDERS = ("asc", "desc")
+
+# List filters by scenario name, as query parameters
+LIST_FILTERS = {
+    "all": {},
+    "status": {"status": "Active"},
+    "type": {"equipment_type": "PC"},
+    "usage": {"usage_type": "Personal"},
+    "location": {"location": "lab 1"},
+    "user": {"primary_user": "grace.1"},
+    "model": {"model": "thinkpad"},
+    "rating": {"min_rating": 4, "max_rating": 5},
+    "deleted": {"include_deleted": "true"},
+}
+
+
+def measure(
+    fn: Callable[[], Optional[int]],
+    repeats: int,
+    setup: Optional[Callable[[], None]] = None,
+    operations: int = 1,
+) -> Dict[str, float]:
+    """Measure fn: peak memory over one traced warm-up run, then latency.
+
+    fn may return a size in bytes, which is reported as "bytes". setup, if
+    given, runs untimed before every run. Latencies are divided by
+    operations, for functions that issue several requests.
+    """
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        size = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeats):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000 / operations)
+    timings.sort()
+
+    result = {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[math.ceil(0.95 * len(timings)) - 1], 3),
+        "min_ms": round(timings[0], 3),
+        "peak_kib": round(peak / 1024, 1),
+    }
+    if size is not None:
+        result["bytes"] = size
+    return result
+
+
+def fleet_database(db_dir: str, count: int, history_depth: float, seed: int) -> str:
+    """Get the path of a seeded fleet database, seeding it if not cached."""
+    path = os.path.join(db_dir, f"fleet-{count}-h{history_depth:g}-s{seed}.db")
+    if os.path.exists(path):
+        return path
+
+    # Seed under a temporary name so an interrupted run leaves no partial cache
+    partial = path + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    engine = create_engine(f"sqlite:///{partial}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    start = time.perf_counter()
+    history_rows = seed_fleet(session, count, history_depth=history_depth, seed=seed)
+    session.close()
+    engine.dispose()
+    os.replace(partial, path)
+    log(f"seeded {count} machines, {history_rows} history rows in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def log(message: str) -> None:
+    print(message, file=sys.stderr, flush=True)
+
+
+def run_size(database: str, count: int, repeats: int, only: List[str]) -> Dict[str, Any]:
+    """Measure every scenario against one seeded database.
+
+    Runs in the worker process, whose DATABASE_URL points at database.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.database import SessionLocal, connect_args
+    from app.main import app
+    from app.models import AssignmentHistory
+    from app.services.csv_service import AsyncCSVService, CSVService, EXPORT_CHUNK_ROWS
+    from app.services.equipment_service import AsyncEquipmentService
+    from app.services.import_jobs import COMPLETED, ImportJobs
+
+    def wanted(name: str) -> bool:
+        return not only or any(name.startswith(prefix) for prefix in only)
+
+    scenarios: Dict[str, Dict[str, float]] = {}
+    rng = random.Random(count)
+
+    with SessionLocal() as session:
+        sample = session.execute(
+            select(Equipment.equipment_id, Equipment.serial_number)
+            .where(Equipment.id.in_(rng.sample(range(1, count + 1), min(SAMPLE_SIZE, count))))
+            .where(Equipment.is_deleted == False)
+        ).all()
+        history_rows = session.query(AssignmentHistory).count()
+
+        import_ids = rng.sample(range(1, count + 1), min(IMPORT_ROWS, count))
+        import_csv = _import_file(
+            CSVService(session),
+            session.scalars(select(Equipment).where(Equipment.id.in_(import_ids))).all(),
+        )
+
+    with TestClient(app) as client:
+        def get(path: str, params: Optional[dict] = None) -> int:
+            response = client.get(f"/api/v1{path}", params=params)
+            response.raise_for_status()
+            return len(response.content)
+
+        # List: every sort under every filter, then the whole list per filter
+        for filter_name, params in LIST_FILTERS.items():
+            for sort_by in SORT_FIELDS:
+                for sort_order in SORT_ORDERS:
+                    name = f"list/{filter_name}/{sort_by}/{sort_order}"
+                    if wanted(name):
+                        query = dict(params, sort_by=sort_by, sort_order=sort_order, limit=PAGE_SIZE)
+                        scenarios[name] = measure(lambda: get("/computers", query), repeats)
+            name = f"list_full/{filter_name}"
+            if count <= FULL_LIST_MAX_ROWS and wanted(name):
+                scenarios[name] = measure(lambda: get("/computers", params), repeats)
+            log(f"{count:>9} list/{filter_name} done")
+
+        # Detail and history over the sampled machines
+        for name, paths in (
+            ("detail/equipment_id", [f"/computers/{row.equipment_id}" for row in sample]),
+            ("detail/serial_number", [f"/computers/{row.serial_number}" for row in sample]),
+            ("history", [f"/computers/{row.equipment_id}/history" for row in sample]),
+        ):
+            if wanted(name) and paths:
+                scenarios[name] = measure(
+                    lambda: sum(get(path) for path in paths), repeats, operations=len(paths)
+                )
+
+        # Export: the whole CSV stream, as the export route produces it
+        async def export() -> int:
+            from app.database import AsyncSessionLocal
+
+            size = 0
+            async with AsyncSessionLocal() as db:
+                chunks = AsyncEquipmentService(db).iter_chunks(chunk_size=EXPORT_CHUNK_ROWS)
+                async for chunk in AsyncCSVService(db).stream_csv(chunks):
+                    size += len(chunk)
+            return size
+
+        if wanted("export"):
+            scenarios["export"] = measure(lambda: client.portal.call(export), repeats)
+
+        # Import: as a job, on sessions configured like the app's, into a
+        # fresh copy of the fleet each run
+        with tempfile.TemporaryDirectory() as scratch:
+            target = os.path.join(scratch, "import.db")
+            import_engine = create_engine(f"sqlite:///{target}", connect_args=connect_args)
+            import_jobs = ImportJobs(
+                workers=1,
+                session_factory=sessionmaker(
+                    class_=SessionLocal.class_, **dict(SessionLocal.kw, bind=import_engine)
+                ),
+            )
+
+            def fresh_copy() -> None:
+                import_engine.dispose()
+                shutil.copyfile(database, target)
+
+            def import_file() -> None:
+                job = import_jobs.submit(io.BytesIO(import_csv.encode("utf-8")), "import.csv")
+                job.future.result()
+                assert job.status == COMPLETED, job.error
+                assert not job.result.failed, job.result.errors[:5]
+
+            try:
+                if wanted("import"):
+                    scenarios["import"] = measure(import_file, repeats, setup=fresh_copy)
+            finally:
+                import_jobs.shutdown()
+                import_engine.dispose()
+        log(f"{count:>9} detail, history, export, import done")
+
+    return {"rows": count, "history_rows": history_rows, "scenarios": scenarios}
+
+
+def _import_file(csv_service, equipment: List[Equipment]) -> str:
+    """Build an import file from exported machines.
+
+    The first half are updates of the machines with a new location; the
+    second half become new machines, with no equipment ID and new serials.
+    """
+    reader = csv.DictReader(io.StringIO("".join(csv_service.iter_csv(equipment))))
+    output = io.StringIO()
+    writer = csv.DictWriter(output, fieldnames=reader.fieldnames)
+    writer.writeheader()
+    half = len(equipment) // 2
+    for index, row in enumerate(reader):
+        if index < half:
+            row["Location"] = f"Relocated {index % 10}"
+        else:
+            row["Equipment ID"] = ""
+            row["Serial Number"] = f"NEW{index:09d}"
+        writer.writerow(row)
+    return output.getvalue()
+
+
+def run_worker(database: str, count: int, repeats: int, only: List[str]) -> Dict[str, Any]:
+    """Run one size's scenarios in a fresh process configured for database."""
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{database}",
+        LIST_CACHE_SIZE="0",
+        IDENTIFIER_CACHE_SIZE="0",
+    )
+    for name in ("ASYNC_DATABASE_URL", "DATABASE_REPLICA_URLS"):
+        env.pop(name, None)
+
+    with tempfile.NamedTemporaryFile(suffix=".json") as output:
+        command = [
+            sys.executable, "-m", "benchmarks.suite",
+            "--worker", database, "--rows", str(count), "--repeats", str(repeats),
+            "--output", output.name,
+        ]
+        for prefix in only:
+            command += ["--only", prefix]
+        subprocess.run(command, env=env, check=True, cwd=os.path.dirname(os.path.dirname(__file__)))
+        with open(output.name) as f:
+            return json.load(f)
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the code and machine the results were measured on."""
+    try:
+        commit = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[tuple]:
+    """Find scenarios whose latency or memory grew beyond threshold percent.
+
+    Returns (rows, scenario, metric, baseline value, current value) tuples.
+    """
+    regressions = []
+    for rows, run in current["sizes"].items():
+        before_run = baseline["sizes"].get(rows)
+        if before_run is None:
+            continue
+        for name, now in sorted(run["scenarios"].items()):
+            before = before_run["scenarios"].get(name)
+            if before is None:
+                continue
+            for metric, floor in (("median_ms", MIN_REGRESSION_MS), ("peak_kib", MIN_REGRESSION_KIB)):
+                old, new = before[metric], now[metric]
+                if new - old > floor and new > old * (1 + threshold / 100):
+                    regressions.append((rows, name, metric, old, new))
+    return regressions
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    """Print list scenarios in aggregate and every other scenario in full."""
+    print(f"{'rows':>9} {'scenario':<28} {'median ms':>10} {'p95 ms':>10} {'peak KiB':>10} {'MB':>8}")
+    for rows, run in results["sizes"].items():
+        scenarios = run["scenarios"]
+        pages = {name: s for name, s in scenarios.items() if name.startswith("list/")}
+        if pages:
+            medians = [s["median_ms"] for s in pages.values()]
+            slowest = max(pages, key=lambda name: pages[name]["median_ms"])
+            print(
+                f"{rows:>9} {f'list pages ({len(pages)})':<28} {statistics.median(medians):>10.2f} "
+                f"{max(medians):>10.2f} {max(s['peak_kib'] for s in pages.values()):>10.1f}"
+                f"   slowest: {slowest}"
+            )
+        for name, s in scenarios.items():
+            if name not in pages:
+                megabytes = f"{s['bytes'] / 1e6:>8.1f}" if "bytes" in s else ""
+                print(
+                    f"{rows:>9} {name:<28} {s['median_ms']:>10.2f} {s['p95_ms']:>10.2f} "
+                    f"{s['peak_kib']:>10.1f} {megabytes}"
+                )
+
+
+def print_regressions(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> bool:
+    """Print the comparison with a baseline; returns whether anything regressed."""
+    fleet = ("history_depth", "seed")
+    if any(results["fleet"].get(key) != baseline.get("fleet", {}).get(key) for key in fleet):
+        print("warning: baseline was measured on a different synthetic fleet")
+
+    regressions = compare(results, baseline, threshold)
+    base = baseline["environment"]
+    print(f"\nCompared with {base.get('commit')} ({base.get('timestamp')}), threshold {threshold:g}%")
+    for rows, name, metric, old, new in regressions:
+        print(f"{rows:>9} {name:<40} {metric:<10} {old:>10.2f} -> {new:>10.2f} (+{(new / old - 1) * 100:.0f}%)")
+    print(f"{len(regressions)} regression(s)")
+    return bool(regressions)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROW_COUNTS)
+    parser.add_argument("--history-depth", type=float, default=DEFAULT_HISTORY_DEPTH)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--only", action="append", default=[], help="scenario name prefix")
+    parser.add_argument("--db-dir", help="keep seeded databases here and reuse them")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/)")
+    parser.add_argument("--baseline", help="earlier results file to compare with")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--compare", help="compare this results file instead of running")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        results = run_size(args.worker, args.rows[0], args.repeats, args.only)
+        with open(args.output, "w") as f:
+            json.dump(results, f)
+        return
+
+    if args.compare:
+        with open(args.compare) as f:
+            results = json.load(f)
+    else:
+        results = {
+            "environment": environment(),
+            "fleet": {"history_depth": args.history_depth, "seed": args.seed},
+            "repeats": args.repeats,
+            "sizes": {},
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            db_dir = args.db_dir or tmp
+            os.makedirs(db_dir, exist_ok=True)
+            for count in args.rows:
+                database = fleet_database(db_dir, count, args.history_depth, args.seed)
+                results["sizes"][str(count)] = run_worker(database, count, args.repeats, args.only)
+
+        output = args.output or os.path.join(
+            RESULTS_DIR, f"suite-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        print_summary(results)
+        print(f"\nResults written to {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if print_regressions(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
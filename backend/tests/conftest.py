@@ -0,0 +1,63 @@
+"""Shared fixtures: a fresh SQLite database per test, and an API client on it."""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.database import AsyncSessionLocal, Base, SessionLocal, async_database_url
+from app.routing_session import RoutingSession
+from app.services.import_jobs import ImportJobs
+from app.services.result_cache import ResultCache
+import app.models  # noqa: F401  (registers the tables on Base)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Session factory bound to an empty database file with every table created."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'inventory.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    yield sessionmaker(class_=RoutingSession, bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    """A session on the test database."""
+    with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def client(session_factory, monkeypatch):
+    """API client on the test database.
+
+    The app's session factories are bound to it, and it gets empty result
+    caches and its own import job queue. Startup and shutdown events are
+    not run.
+    """
+    from app.api import computers
+    from app.main import app
+    from app.services import equipment_service
+
+    engine = session_factory.kw["bind"]
+    # Each TestClient request runs on its own event loop, so no pooling
+    async_engine = create_async_engine(
+        async_database_url(engine.url.render_as_string(hide_password=False)),
+        poolclass=NullPool,
+    )
+    monkeypatch.setitem(SessionLocal.kw, "bind", engine)
+    monkeypatch.setitem(AsyncSessionLocal.kw, "bind", async_engine)
+    monkeypatch.setattr(computers, "list_cache", ResultCache())
+    monkeypatch.setattr(equipment_service, "identifier_cache", ResultCache())
+
+    jobs = ImportJobs(workers=1, session_factory=session_factory)
+    monkeypatch.setattr(computers, "import_jobs", jobs)
+
+    yield TestClient(app)
+    jobs.shutdown()
@@ -0,0 +1,121 @@
+"""Tests for the bulk create, update, delete and restore endpoints."""
+
+import pytest
+
+from app.models import EquipmentType
+from app.schemas import EquipmentCreate
+from app.services.equipment_service import EquipmentService
+
+URL = "/api/v1/computers"
+
+
+@pytest.fixture
+def fleet(db):
+    """PC-0001 (SN-A), PC-0002 (SN-B) and MON-0001 (SN-C)."""
+    service = EquipmentService(db)
+    for equipment_type, serial_number in (
+        (EquipmentType.PC, "SN-A"), (EquipmentType.PC, "SN-B"), (EquipmentType.MONITOR, "SN-C"),
+    ):
+        service.create(EquipmentCreate(equipment_type=equipment_type, serial_number=serial_number))
+    return db
+
+
+def outcomes(response):
+    """(equipment_id, status, error) per item, checking the counts add up."""
+    assert response.status_code == 200, response.text
+    body = response.json()
+    results = body["results"]
+    assert [result["index"] for result in results] == list(range(len(results)))
+    assert body["failed"] == sum(result["status"] == "failed" for result in results)
+    assert body["succeeded"] == len(results) - body["failed"]
+    return [(result["equipment_id"], result["status"], result["error"]) for result in results]
+
+
+def detail(client, identifier):
+    """A record as the detail endpoint returns it."""
+    return client.get(f"{URL}/{identifier}").json()
+
+
+def test_bulk_create_fails_only_duplicate_serials(fleet, client):
+    response = client.post(f"{URL}/bulk", json=[
+        {"equipment_type": "PC", "serial_number": "SN-NEW"},
+        {"equipment_type": "PC", "serial_number": "SN-A"},
+        {"equipment_type": "Monitor"},
+        {"equipment_type": "PC", "serial_number": "SN-NEW"},
+        {"equipment_type": "PC", "location": "Berlin"},
+    ])
+
+    assert outcomes(response) == [
+        ("PC-0003", "created", None),
+        (None, "failed", "Serial number 'SN-A' already exists"),
+        ("MON-0002", "created", None),
+        (None, "failed", "Serial number 'SN-NEW' already exists"),
+        ("PC-0004", "created", None),
+    ]
+    assert detail(client, "PC-0004")["location"] == "Berlin"
+
+
+def test_bulk_update_fails_items_individually(fleet, client):
+    response = client.patch(f"{URL}/bulk", json=[
+        {"identifier": "PC-0001", "location": "Berlin"},
+        {"identifier": "PC-0009", "location": "Paris"},
+        {"identifier": "SN-A", "location": "London"},
+        {"identifier": "PC-0002", "serial_number": "SN-C"},
+        {"identifier": "MON-0001", "serial_number": "SN-D", "notes": "relabelled"},
+        {"identifier": "PC-0002", "serial_number": "SN-D"},
+    ])
+
+    assert outcomes(response) == [
+        ("PC-0001", "updated", None),
+        (None, "failed", "Equipment not found"),
+        ("PC-0001", "failed", "Equipment appears more than once in this request"),
+        ("PC-0002", "failed", "Serial number 'SN-C' already exists"),
+        ("MON-0001", "updated", None),
+        ("PC-0002", "failed", "Serial number 'SN-D' already exists"),
+    ]
+    assert detail(client, "PC-0001")["location"] == "Berlin"
+    assert detail(client, "PC-0002")["serial_number"] == "SN-B"
+    monitor = detail(client, "SN-D")
+    assert (monitor["equipment_id"], monitor["notes"]) == ("MON-0001", "relabelled")
+
+
+def test_bulk_update_keeps_a_records_own_serial(fleet, client):
+    response = client.patch(f"{URL}/bulk", json=[
+        {"identifier": "PC-0001", "serial_number": "SN-A", "notes": "same serial"},
+    ])
+    assert outcomes(response) == [("PC-0001", "updated", None)]
+
+
+def test_bulk_delete_and_restore_fail_items_individually(fleet, client):
+    response = client.post(f"{URL}/bulk/delete", json={
+        "identifiers": ["PC-0001", "nope", "SN-A", "SN-C"],
+    })
+    assert outcomes(response) == [
+        ("PC-0001", "deleted", None),
+        (None, "failed", "Equipment not found"),
+        ("PC-0001", "failed", "Equipment appears more than once in this request"),
+        ("MON-0001", "deleted", None),
+    ]
+    # Deleted records are no longer found for deletion
+    response = client.post(f"{URL}/bulk/delete", json={"identifiers": ["PC-0001"]})
+    assert outcomes(response) == [(None, "failed", "Equipment not found")]
+
+    response = client.post(f"{URL}/bulk/restore", json={
+        "identifiers": ["PC-0001", "PC-0002", "nope"],
+    })
+    assert outcomes(response) == [
+        ("PC-0001", "restored", None),
+        ("PC-0002", "failed", "Equipment is not deleted"),
+        (None, "failed", "Equipment not found"),
+    ]
+    assert [item["equipment_id"] for item in client.get(URL).json()] == ["PC-0001", "PC-0002"]
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("post", "/bulk", []),
+    ("patch", "/bulk", []),
+    ("post", "/bulk/delete", {"identifiers": []}),
+    ("patch", "/bulk", [{"identifier": "", "notes": "x"}]),
+])
+def test_empty_requests_are_rejected(client, method, path, body):
+    assert getattr(client, method)(URL + path, json=body).status_code == 422
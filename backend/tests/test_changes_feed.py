@@ -0,0 +1,83 @@
+"""Tests for the GET /computers/changes delta sync feed."""
+
+import pytest
+
+from app.models import EquipmentType
+from app.schemas import EquipmentCreate
+from app.services.equipment_service import EquipmentService
+
+URL = "/api/v1/computers"
+
+
+@pytest.fixture
+def fleet(db):
+    """PC-0001 to PC-0005."""
+    service = EquipmentService(db)
+    for num in range(5):
+        service.create(EquipmentCreate(equipment_type=EquipmentType.PC, serial_number=f"SN-{num}"))
+    return db
+
+
+def drain(client, since=None, limit=2):
+    """Follow the feed from since until has_more is false; returns (items, cursor)."""
+    items = []
+    while True:
+        response = client.get(f"{URL}/changes", params={"since": since, "limit": limit})
+        assert response.status_code == 200, response.text
+        body = response.json()
+        items += body["items"]
+        since = body["cursor"]
+        if not body["has_more"]:
+            return items, since
+
+
+def test_feed_lists_every_record_in_change_order(fleet, client):
+    items, cursor = drain(client)
+
+    assert [item["equipment_id"] for item in items] == [f"PC-{num:04d}" for num in range(1, 6)]
+    seqs = [item["change_seq"] for item in items]
+    assert seqs == sorted(seqs) and len(set(seqs)) == 5
+
+    # Nothing new: an empty page and the same cursor
+    assert drain(client, cursor) == ([], cursor)
+
+
+def test_feed_resumes_after_the_cursor(fleet, client):
+    _, cursor = drain(client)
+
+    assert client.put(f"{URL}/PC-0004", json={"notes": "moved"}).status_code == 200
+    assert client.delete(f"{URL}/PC-0002").status_code == 204
+    assert client.post(f"{URL}/bulk", json=[{"equipment_type": "Monitor"}]).status_code == 200
+    assert client.patch(f"{URL}/bulk", json=[{"identifier": "PC-0004", "location": "Berlin"}]).status_code == 200
+
+    items, _ = drain(client, cursor, limit=1)
+
+    # A record written again moves to its latest change
+    assert [(item["equipment_id"], item["is_deleted"]) for item in items] == [
+        ("PC-0002", True), ("MON-0001", False), ("PC-0004", False),
+    ]
+    assert (items[-1]["notes"], items[-1]["location"]) == ("moved", "Berlin")
+
+
+def test_pages_split_records_of_one_bulk_write(fleet, client):
+    _, cursor = drain(client)
+    response = client.post(f"{URL}/bulk", json=[{"equipment_type": "Scanner"}] * 3)
+    assert response.status_code == 200
+
+    items, _ = drain(client, cursor, limit=1)
+
+    assert [item["equipment_id"] for item in items] == ["SCN-0001", "SCN-0002", "SCN-0003"]
+
+
+def test_restore_reappears_in_the_feed(fleet, client):
+    assert client.post(f"{URL}/bulk/delete", json={"identifiers": ["PC-0001", "PC-0003"]}).status_code == 200
+    _, cursor = drain(client)
+
+    assert client.post(f"{URL}/PC-0003/restore").status_code == 200
+
+    items, _ = drain(client, cursor)
+    assert [(item["equipment_id"], item["is_deleted"]) for item in items] == [("PC-0003", False)]
+
+
+def test_malformed_cursor_is_rejected(fleet, client):
+    assert client.get(f"{URL}/changes", params={"since": "garbage"}).status_code == 400
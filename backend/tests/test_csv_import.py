@@ -0,0 +1,112 @@
+"""Tests for the chunked CSV import engine.
+
+The expected results are those the original row-by-row import (one
+lookup and commit per row) produced for the same file and records.
+"""
+
+import pytest
+from sqlalchemy import select
+
+from app.models import Equipment, EquipmentType
+from app.schemas import EquipmentCreate
+from app.services.csv_service import CSVService
+from app.services.equipment_service import EquipmentService
+
+CSV = (
+    "Equipment ID,Equipment Type,Serial Number,Model,Location,CPU Score,Notes\n"
+    ",PC,SN-NEW1,OptiPlex 7090,,,first\n"    # 2: created
+    ",Monitor,SN-NEW2,P2419H,,,superseded\n"  # 3: skipped, row 7 has the same key
+    "PC-0001,,,,Berlin,,\n"                   # 4: updated, matched by equipment ID
+    ",PC,SN-C,,London,,back\n"                # 5: restored
+    ",Scanner,,ScanJet,,,\n"                  # 6: created, keyed by its row
+    ",Monitor,SN-NEW2,U2720Q,,,last\n"        # 7: created
+    ",,SN-NEW3,,,,\n"                         # 8: failed, no type
+    ",Tablet,SN-NEW4,,,,\n"                   # 9: failed, unknown type
+    ",Printer,SN-NEW5,LaserJet,,,\n"          # 10: created
+    ",Monitor,SN-B,,,,again\n"                # 11: updated, matched by serial number
+    ",PC,SN-NEW6,,,99999999999999999999,\n"   # 12: failed when written
+)
+
+BASELINE_COUNTS = {"total_rows": 11, "created": 4, "updated": 2, "restored": 1, "failed": 3}
+
+BASELINE_ERRORS = [
+    (8, "SN-NEW3", "Missing required field: Equipment Type"),
+    (9, "SN-NEW4", "Invalid Equipment Type: Tablet"),
+    (12, "SN-NEW6", "Python int too large to convert to SQLite INTEGER"),
+]
+
+# (equipment_id, serial_number, model, location, notes, is_deleted)
+BASELINE_RECORDS = [
+    ("MON-0001", "SN-B", None, None, "again", False),
+    ("MON-0002", "SN-NEW2", "U2720Q", None, "last", False),
+    ("PC-0001", "SN-A", None, "Berlin", None, False),
+    ("PC-0002", "SN-C", None, "London", "back", False),
+    ("PC-0003", "SN-NEW1", "OptiPlex 7090", None, "first", False),
+    ("PRN-0001", "SN-NEW5", "LaserJet", None, None, False),
+    ("SCN-0001", None, "ScanJet", None, None, False),
+]
+
+
+@pytest.fixture
+def seeded(db):
+    """PC-0001 (SN-A), MON-0001 (SN-B) and the soft-deleted PC-0002 (SN-C)."""
+    service = EquipmentService(db)
+    service.create(EquipmentCreate(equipment_type=EquipmentType.PC, serial_number="SN-A"))
+    service.create(EquipmentCreate(equipment_type=EquipmentType.MONITOR, serial_number="SN-B"))
+    service.soft_delete(
+        service.create(EquipmentCreate(equipment_type=EquipmentType.PC, serial_number="SN-C"))
+    )
+    return db
+
+
+def records(session_factory):
+    """Every record as committed, ordered by equipment ID."""
+    with session_factory() as session:
+        return [
+            (e.equipment_id, e.serial_number, e.model, e.location, e.notes, e.is_deleted)
+            for e in session.scalars(select(Equipment).order_by(Equipment.equipment_id))
+        ]
+
+
+@pytest.mark.parametrize("chunk_size", [500, 2])
+def test_import_matches_row_by_row_import(seeded, session_factory, chunk_size):
+    result = CSVService(seeded, chunk_size=chunk_size).import_from_csv(CSV)
+
+    assert result.model_dump(exclude={"errors"}) == BASELINE_COUNTS
+    assert [(e.row, e.serial_number, e.error) for e in result.errors] == BASELINE_ERRORS
+    assert records(session_factory) == BASELINE_RECORDS
+
+
+def test_last_occurrence_of_a_key_wins_whole(db, session_factory):
+    # The earlier row is dropped, not merged: its location is never written
+    csv = (
+        "Equipment Type,Serial Number,Location,Notes\n"
+        "PC,SN-1,Berlin,first\n"
+        "PC,SN-1,,second\n"
+    )
+    result = CSVService(db).import_from_csv(csv)
+
+    assert (result.total_rows, result.created, result.failed) == (2, 1, 0)
+    assert records(session_factory) == [("PC-0001", "SN-1", None, None, "second", False)]
+
+
+def test_failed_bulk_write_is_replayed_row_by_row(seeded, session_factory, monkeypatch):
+    replays = []
+    replay = CSVService._replay_operations
+
+    def record_replay(self, operations, originals, result):
+        replays.append(len(operations))
+        replay(self, operations, originals, result)
+
+    monkeypatch.setattr(CSVService, "_replay_operations", record_replay)
+
+    result = CSVService(seeded).import_from_csv(CSV)
+
+    # The chunk's five inserts and three updates, replayed once; only the
+    # row that cannot be written fails
+    assert replays == [8]
+    assert [e.row for e in result.errors if "SQLite INTEGER" in e.error] == [12]
+    assert records(session_factory) == BASELINE_RECORDS
+
+    # The rollback returned the IDs reserved for the chunk
+    assert EquipmentService(seeded).generate_equipment_id(EquipmentType.PC) == ("PC-0004", 4)
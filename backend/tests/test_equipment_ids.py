@@ -0,0 +1,97 @@
+"""Tests for equipment ID allocation through equipment_id_sequence."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import insert, select
+
+from app.models import Equipment, EquipmentIdSequence, EquipmentType
+from app.services.equipment_service import EquipmentService
+
+
+def sequence_value(session_factory, equipment_type):
+    """A type's committed last_value, or None if it has no sequence row."""
+    with session_factory() as session:
+        return session.scalar(
+            select(EquipmentIdSequence.last_value)
+            .where(EquipmentIdSequence.equipment_type == equipment_type)
+        )
+
+
+def test_first_reservation_starts_after_highest_existing_id(db, session_factory):
+    # Records from before the sequence table, with a gap
+    db.execute(insert(Equipment), [
+        {"equipment_id": f"PC-{num:04d}", "equipment_id_num": num, "equipment_type": EquipmentType.PC}
+        for num in (1, 2, 7)
+    ])
+    db.commit()
+    assert sequence_value(session_factory, EquipmentType.PC) is None
+
+    service = EquipmentService(db)
+    assert service.reserve_equipment_ids(EquipmentType.PC, 3) == [
+        ("PC-0008", 8), ("PC-0009", 9), ("PC-0010", 10),
+    ]
+    assert service.reserve_equipment_ids(EquipmentType.MONITOR, 1) == [("MON-0001", 1)]
+    db.commit()
+
+    assert sequence_value(session_factory, EquipmentType.PC) == 10
+    assert sequence_value(session_factory, EquipmentType.MONITOR) == 1
+
+
+def test_released_and_rolled_back_ids_are_handed_out_again(db):
+    service = EquipmentService(db)
+
+    # The unused tail of a block goes back before the transaction ends
+    assert [num for _, num in service.reserve_equipment_ids(EquipmentType.PC, 5)] == [1, 2, 3, 4, 5]
+    service.release_equipment_ids(EquipmentType.PC, 2)
+    db.commit()
+
+    # A rollback returns the whole block
+    assert [num for _, num in service.reserve_equipment_ids(EquipmentType.PC, 3)] == [4, 5, 6]
+    db.rollback()
+
+    assert service.generate_equipment_id(EquipmentType.PC) == ("PC-0004", 4)
+
+
+def test_losing_the_race_to_create_a_sequence_retries(session_factory, monkeypatch):
+    with session_factory() as first, session_factory() as second:
+        service = EquipmentService(second)
+        advance = service._advance_id_sequence
+        calls = []
+
+        def advance_after_race(equipment_type, count):
+            calls.append(count)
+            if len(calls) == 1:
+                # The other session creates the row between this session's
+                # update finding none and its insert
+                EquipmentService(first).reserve_equipment_ids(equipment_type, 2)
+                first.commit()
+                return None
+            return advance(equipment_type, count)
+
+        monkeypatch.setattr(service, "_advance_id_sequence", advance_after_race)
+
+        # The insert fails on the other session's row, inside its savepoint
+        assert service.reserve_equipment_ids(EquipmentType.SCANNER, 3) == [
+            ("SCN-0003", 3), ("SCN-0004", 4), ("SCN-0005", 5),
+        ]
+        second.commit()
+
+    assert calls == [3, 3]
+    assert sequence_value(session_factory, EquipmentType.SCANNER) == 5
+
+
+def test_concurrent_reservations_never_overlap(session_factory):
+    def reserve(count):
+        with session_factory() as session:
+            ids = EquipmentService(session).reserve_equipment_ids(EquipmentType.PRINTER, count)
+            session.commit()
+            return ids
+
+    counts = [1, 2, 3, 4] * 5
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        blocks = list(pool.map(reserve, counts))
+
+    nums = sorted(num for block in blocks for _, num in block)
+    assert nums == list(range(1, sum(counts) + 1))
+    for block in blocks:
+        assert [num for _, num in block] == list(range(block[0][1], block[0][1] + len(block)))
@@ -0,0 +1,75 @@
+"""Tests for conditional GETs against the equipment change generation."""
+
+import pytest
+
+from app.api import computers
+from app.api.negotiation import COLUMNS_JSON
+from app.models import EquipmentType
+from app.schemas import EquipmentCreate
+from app.services.equipment_service import EquipmentService
+
+URL = "/api/v1/computers"
+
+
+@pytest.fixture
+def fleet(db):
+    """PC-0001 and PC-0002."""
+    service = EquipmentService(db)
+    for serial_number in ("SN-1", "SN-2"):
+        service.create(EquipmentCreate(equipment_type=EquipmentType.PC, serial_number=serial_number))
+    return db
+
+
+@pytest.mark.parametrize("path", ["", "/PC-0001", "/PC-0001/history", "/stats"])
+def test_matching_etag_gets_304(fleet, client, path):
+    first = client.get(URL + path)
+    etag = first.headers["ETag"]
+
+    response = client.get(URL + path, headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("header", ["W/{etag}", '"0-stale", {etag}', "*"])
+def test_if_none_match_uses_weak_comparison_and_lists(fleet, client, header):
+    etag = client.get(URL).headers["ETag"]
+
+    response = client.get(URL, headers={"If-None-Match": header.format(etag=etag)})
+    assert response.status_code == 304
+
+
+def test_304_skips_the_list_query(fleet, client, monkeypatch):
+    etag = client.get(URL).headers["ETag"]
+
+    async def fail(*args, **kwargs):
+        raise AssertionError("list was queried")
+
+    monkeypatch.setattr(computers, "_query_list", fail)
+    assert client.get(URL, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_write_changes_the_etag(fleet, client):
+    list_etag = client.get(URL).headers["ETag"]
+    detail_etag = client.get(f"{URL}/PC-0002").headers["ETag"]
+
+    assert client.put(f"{URL}/PC-0001", json={"notes": "moved"}).status_code == 200
+
+    for path, etag in (("", list_etag), ("/PC-0002", detail_etag)):
+        response = client.get(URL + path, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+    assert client.get(URL).json()[0]["notes"] == "moved"
+
+
+def test_etag_depends_on_query_and_media_type(fleet, client):
+    etag = client.get(URL).headers["ETag"]
+
+    assert client.get(URL, params={"sort_by": "serial_number"}).headers["ETag"] != etag
+
+    columnar = {"Accept": COLUMNS_JSON}
+    response = client.get(URL, headers=columnar)
+    assert "Accept" in [name.strip() for name in response.headers["Vary"].split(",")]
+    assert response.headers["ETag"] != etag
+    assert client.get(URL, headers=dict(columnar, **{"If-None-Match": etag})).status_code == 200
@@ -0,0 +1,126 @@
+"""Tests for background import jobs and the import endpoints that run them."""
+
+import sqlite3
+import threading
+from concurrent.futures import wait
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.api import computers
+from app.models import Equipment
+from app.services.csv_service import IMPORT_CHUNK_SIZE
+from app.services.import_jobs import DATABASE_BUSY_ERROR, ImportJob
+
+URL = "/api/v1/computers/import"
+
+
+def csv(rows, tag="SN"):
+    """A CSV file of new PCs with serial numbers tag-000000 onwards."""
+    return "Equipment Type,Serial Number\n" + "".join(f"PC,{tag}-{num:06d}\n" for num in range(rows))
+
+
+def submit(client, content):
+    """Submit a file as an import job, returning its status."""
+    response = client.post(f"{URL}/jobs", files={"file": ("fleet.csv", content, "text/csv")})
+    assert response.status_code == 202, response.text
+    return response.json()
+
+
+def record_count(session_factory):
+    """Number of equipment records committed."""
+    with session_factory() as session:
+        return session.scalar(select(func.count(Equipment.id)))
+
+
+@pytest.fixture
+def paused(monkeypatch):
+    """Holds a running job after its first imported chunk until resume is set."""
+    reached, resume = threading.Event(), threading.Event()
+    report = ImportJob.report
+
+    def pause_after_first_chunk(self):
+        if self.rows_imported and not reached.is_set():
+            reached.set()
+            resume.wait(10)
+        report(self)
+
+    monkeypatch.setattr(ImportJob, "report", pause_after_first_chunk)
+    yield reached, resume
+    resume.set()
+
+
+def test_job_imports_the_file(client, session_factory):
+    job = submit(client, csv(3))
+    wait([computers.import_jobs.get(job["job_id"]).future])
+
+    status = client.get(f"{URL}/jobs/{job['job_id']}").json()
+    assert (status["status"], status["rows_imported"], status["created"]) == ("completed", 3, 3)
+    assert record_count(session_factory) == 3
+
+
+def test_cancel_stops_running_and_queued_jobs(client, session_factory, paused):
+    reached, resume = paused
+    running = submit(client, csv(IMPORT_CHUNK_SIZE * 3, "A"))
+    assert reached.wait(10)
+    queued = submit(client, csv(5, "B"))
+
+    # A queued job is cancelled at once; a running one after its chunk
+    assert client.post(f"{URL}/jobs/{queued['job_id']}/cancel").json()["status"] == "cancelled"
+    assert client.post(f"{URL}/jobs/{running['job_id']}/cancel").json()["status"] == "running"
+    resume.set()
+    wait([computers.import_jobs.get(running["job_id"]).future])
+
+    status = client.get(f"{URL}/jobs/{running['job_id']}").json()
+    assert status["status"] == "cancelled"
+    assert (status["rows_imported"], status["result"]["created"]) == (IMPORT_CHUNK_SIZE, IMPORT_CHUNK_SIZE)
+    # The imported chunk is kept
+    assert record_count(session_factory) == IMPORT_CHUNK_SIZE
+
+    # Finished jobs are left as they are
+    assert client.post(f"{URL}/jobs/{running['job_id']}/cancel").json()["status"] == "cancelled"
+    assert client.post(f"{URL}/jobs/unknown/cancel").status_code == 404
+
+
+def test_full_queue_refuses_jobs_but_not_direct_imports(client, monkeypatch):
+    monkeypatch.setattr(computers.import_jobs, "max_pending", 0)
+
+    response = client.post(f"{URL}/jobs", files={"file": ("fleet.csv", csv(2), "text/csv")})
+    assert response.status_code == 429
+
+    response = client.post(URL, files={"file": ("fleet.csv", csv(2), "text/csv")})
+    assert (response.status_code, response.json()["created"]) == (200, 2)
+
+
+@pytest.fixture
+def impatient_jobs(client, session_factory, monkeypatch):
+    """Import jobs give up on a lock after 0.1 seconds rather than SQLite's default 5."""
+    engine = create_engine(
+        session_factory.kw["bind"].url,
+        connect_args={"check_same_thread": False, "timeout": 0.1},
+    )
+    monkeypatch.setattr(
+        computers.import_jobs, "session_factory", sessionmaker(**dict(session_factory.kw, bind=engine)),
+    )
+    yield
+    engine.dispose()
+
+
+def test_lock_timeout_gets_503(client, session_factory, impatient_jobs):
+    other = sqlite3.connect(session_factory.kw["bind"].url.database, isolation_level=None)
+    other.execute("BEGIN IMMEDIATE")
+    try:
+        response = client.post(URL, files={"file": ("fleet.csv", csv(2), "text/csv")})
+    finally:
+        other.execute("ROLLBACK")
+        other.close()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"]
+    assert response.json()["detail"] == DATABASE_BUSY_ERROR
+
+    # Nothing was written, and the same file imports once the lock is gone
+    assert record_count(session_factory) == 0
+    response = client.post(URL, files={"file": ("fleet.csv", csv(2), "text/csv")})
+    assert (response.status_code, response.json()["created"]) == (200, 2)
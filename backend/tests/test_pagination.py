@@ -0,0 +1,85 @@
+"""Tests for keyset pagination of GET /computers."""
+
+import pytest
+
+from app.models import EquipmentType
+from app.schemas import EquipmentCreate
+from app.services.equipment_service import EquipmentService
+
+URL = "/api/v1/computers"
+
+# Repeated and missing values, so pages split ties and NULLs
+LOCATIONS = ["Berlin", None, "London", "Berlin", None, "Paris", "London"]
+CPU_SCORES = [120, None, 95, 120, 300, None, 95]
+
+
+@pytest.fixture
+def fleet(db):
+    """Fourteen records across two types, with repeated and missing sort values."""
+    service = EquipmentService(db)
+    for num in range(14):
+        service.create(EquipmentCreate(
+            equipment_type=EquipmentType.PC if num % 2 else EquipmentType.MONITOR,
+            serial_number=f"SN-{num:02d}",
+            location=LOCATIONS[num % len(LOCATIONS)],
+            cpu_score=CPU_SCORES[num % len(CPU_SCORES)],
+        ))
+    return db
+
+
+def pages(client, limit, **params):
+    """Follow X-Next-Cursor from the first page to the last, returning each page's IDs."""
+    result = []
+    cursor = None
+    while True:
+        response = client.get(URL, params=dict(params, limit=limit, cursor=cursor))
+        assert response.status_code == 200, response.text
+        assert response.headers["X-Total-Count"] == "14"
+        result.append([item["equipment_id"] for item in response.json()])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return result
+
+
+@pytest.mark.parametrize("sort_by", ["equipment_id", "location", "cpu_score", "created_at"])
+@pytest.mark.parametrize("sort_order", ["asc", "desc"])
+def test_pages_follow_the_unpaginated_order(fleet, client, sort_by, sort_order):
+    params = {"sort_by": sort_by, "sort_order": sort_order}
+    everything = [item["equipment_id"] for item in client.get(URL, params=params).json()]
+
+    result = pages(client, 4, **params)
+
+    assert [len(page) for page in result] == [4, 4, 4, 2]
+    assert [equipment_id for page in result for equipment_id in page] == everything
+
+
+def test_filtered_pages_stop_on_the_last_match(fleet, client):
+    response = client.get(URL, params={"location": "Berlin", "limit": 2, "sort_by": "cpu_score"})
+
+    assert response.headers["X-Total-Count"] == "4"
+    assert len(response.json()) == 2
+    cursor = response.headers["X-Next-Cursor"]
+
+    last = client.get(URL, params={
+        "location": "Berlin", "limit": 2, "sort_by": "cpu_score", "cursor": cursor,
+    })
+    assert len(last.json()) == 2
+    assert "X-Next-Cursor" not in last.headers
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "eyJzIjoxfQ"])
+def test_malformed_cursor_is_rejected(fleet, client, cursor):
+    response = client.get(URL, params={"limit": 4, "cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_cursor_for_another_sort_is_rejected(fleet, client):
+    cursor = client.get(URL, params={"limit": 4, "sort_by": "location"}).headers["X-Next-Cursor"]
+
+    response = client.get(URL, params={"limit": 4, "sort_by": "cpu_score", "cursor": cursor})
+    assert response.status_code == 400
+
+    response = client.get(URL, params={
+        "limit": 4, "sort_by": "location", "sort_order": "desc", "cursor": cursor,
+    })
+    assert response.status_code == 400
@@ -0,0 +1,71 @@
+"""Tests for the generation-keyed list and identifier caches."""
+
+import pytest
+
+from app.api import computers
+from app.models import EquipmentType
+from app.schemas import BulkUpdateItem, EquipmentCreate
+from app.services import equipment_service
+from app.services.equipment_service import EquipmentService
+
+URL = "/api/v1/computers"
+
+
+@pytest.fixture
+def fleet(db):
+    """PC-0001 (SN-1) and PC-0002 (SN-2)."""
+    service = EquipmentService(db)
+    for serial_number in ("SN-1", "SN-2"):
+        service.create(EquipmentCreate(equipment_type=EquipmentType.PC, serial_number=serial_number))
+    return db
+
+
+def test_repeated_list_is_served_from_the_cache(fleet, client):
+    first = client.get(URL, params={"sort_by": "serial_number"})
+    second = client.get(URL, params={"sort_by": "serial_number"})
+
+    assert second.content == first.content
+    assert computers.list_cache.stats()["hits"] == 1
+    # A different query is cached separately
+    client.get(URL, params={"sort_by": "serial_number", "sort_order": "desc"})
+    assert computers.list_cache.stats()["entries"] == 2
+
+
+def test_api_write_invalidates_the_list(fleet, client):
+    assert [item["notes"] for item in client.get(URL).json()] == [None, None]
+
+    assert client.put(f"{URL}/PC-0002", json={"notes": "moved"}).status_code == 200
+
+    assert [item["notes"] for item in client.get(URL).json()] == [None, "moved"]
+    assert computers.list_cache.stats()["invalidations"] == 1
+
+
+def test_write_from_another_session_invalidates_the_list(fleet, client, session_factory):
+    client.get(URL)
+
+    # As another worker would: the generation it bumps lives in the database
+    with session_factory() as other:
+        service = EquipmentService(other)
+        service.soft_delete(service.get_by_identifier("PC-0001"))
+
+    assert [item["equipment_id"] for item in client.get(URL).json()] == ["PC-0002"]
+    assert computers.list_cache.stats()["hits"] == 0
+
+
+def test_identifier_cache_follows_writes(fleet, client, session_factory):
+    cache = equipment_service.identifier_cache
+    assert client.get(f"{URL}/SN-1").json()["equipment_id"] == "PC-0001"
+    assert client.get(f"{URL}/SN-1").status_code == 200
+    assert cache.stats()["hits"] == 1
+
+    with session_factory() as other:
+        result = EquipmentService(other).bulk_update([
+            BulkUpdateItem(identifier="PC-0001", serial_number="SN-9", location="Berlin"),
+        ])
+        assert result.failed == 0
+
+    # The cached record is dropped, not served under its old serial number
+    assert client.get(f"{URL}/SN-1").status_code == 404
+    detail = client.get(f"{URL}/SN-9").json()
+    assert (detail["equipment_id"], detail["location"]) == ("PC-0001", "Berlin")
+    assert cache.stats()["invalidations"] == 1
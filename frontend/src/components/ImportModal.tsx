@@ -3,15 +3,29 @@
  */
 
 import { useState, useRef } from 'react';
-import type { ImportResult } from '../types/equipment';
+import type { ImportJobStatus, ImportResult } from '../types/equipment';
 
 interface ImportModalProps {
-  onImport: (file: File) => Promise<ImportResult>;
+  onImport: (
+    file: File,
+    onProgress: (status: ImportJobStatus) => void
+  ) => Promise<ImportResult>;
+  onCancelImport: (jobId: string) => Promise<void>;
   onClose: () => void;
 }
 
-export default function ImportModal({ onImport, onClose }: ImportModalProps) {
+/**
+ * Describe how far an import job has got.
+ */
+function progressText(progress: ImportJobStatus): string {
+  if (progress.status === 'queued') return 'Waiting for other imports to finish...';
+  if (progress.rows_to_import === null) return `Reading file: ${progress.rows_parsed} rows`;
+  return `Imported ${progress.rows_imported} of ${progress.rows_to_import} rows`;
+}
+
+export default function ImportModal({ onImport, onCancelImport, onClose }: ImportModalProps) {
   const [importing, setImporting] = useState(false);
+  const [progress, setProgress] = useState<ImportJobStatus | null>(null);
   const [result, setResult] = useState<ImportResult | null>(null);
   const [error, setError] = useState<string | null>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
@@ -29,12 +43,22 @@ export default function ImportModal({ onImport, onClose }: ImportModalProps) {
       setImporting(true);
       setError(null);
       setResult(null);
-      const importResult = await onImport(file);
+      const importResult = await onImport(file, setProgress);
       setResult(importResult);
     } catch (err) {
       setError(err instanceof Error ? err.message : 'Import failed');
     } finally {
       setImporting(false);
+      setProgress(null);
+    }
+  };
+
+  const handleStopImport = async () => {
+    if (!progress) return;
+    try {
+      await onCancelImport(progress.job_id);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Failed to stop import');
     }
   };
 
@@ -65,12 +89,20 @@ export default function ImportModal({ onImport, onClose }: ImportModalProps) {
               style={{ display: 'none' }}
             />
 
+            {progress && <p style={{ marginBottom: 16 }}>{progressText(progress)}</p>}
+
             {error && <div className="error" style={{ marginBottom: 16 }}>{error}</div>}
 
             <div className="modal-actions">
-              <button onClick={onClose} className="secondary">
-                Cancel
-              </button>
+              {progress ? (
+                <button onClick={handleStopImport} className="secondary">
+                  Stop Import
+                </button>
+              ) : (
+                <button onClick={onClose} className="secondary">
+                  Cancel
+                </button>
+              )}
               <button
                 onClick={handleSelectFile}
                 className="primary"
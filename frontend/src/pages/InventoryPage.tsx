@@ -2,15 +2,17 @@
  * InventoryPage - main page combining equipment list, detail view, and actions.
  */
 
-import { useState, useEffect, useCallback, useMemo } from 'react';
+import { useState, useEffect, useCallback, useMemo, useRef } from 'react';
 import type {
   Equipment,
   EquipmentListItem,
   EquipmentFilters,
   EquipmentCreate,
   EquipmentUpdate,
+  EquipmentChangeEvent,
   AssignmentHistoryItem,
   ImportResult,
+  ImportJobStatus,
 } from '../types/equipment';
 import {
   listEquipment,
@@ -21,6 +23,8 @@ import {
   getEquipmentHistory,
   exportEquipment,
   importEquipment,
+  cancelImportJob,
+  subscribeToEquipmentChanges,
 } from '../services/api';
 import EquipmentList from '../components/EquipmentList';
 import EquipmentDetail from '../components/EquipmentDetail';
@@ -36,6 +40,18 @@ import { useColumnWidths } from '../hooks/useColumnWidths';
 import { getVisibleColumns } from '../utils/columns';
 import { filterEquipment, validateRegex } from '../utils/search';
 
+/**
+ * Keep only the changed fields a list row already carries.
+ */
+function pickListFields(
+  item: EquipmentListItem,
+  fields: Partial<Equipment>
+): Partial<EquipmentListItem> {
+  return Object.fromEntries(
+    Object.entries(fields).filter(([key]) => key in item)
+  ) as Partial<EquipmentListItem>;
+}
+
 export default function InventoryPage() {
   // State
   const [equipment, setEquipment] = useState<EquipmentListItem[]>([]);
@@ -127,6 +143,36 @@ export default function InventoryPage() {
     loadEquipment();
   }, [loadEquipment]);
 
+  // Apply live changes: patch listed rows in place, reload for new rows
+  const reloadTimer = useRef<ReturnType<typeof setTimeout> | null>(null);
+  useEffect(() => {
+    const scheduleReload = () => {
+      if (reloadTimer.current) clearTimeout(reloadTimer.current);
+      reloadTimer.current = setTimeout(loadEquipment, 500);
+    };
+    const handleChange = (event: EquipmentChangeEvent) => {
+      if (event.op === 'create' || event.op === 'restore') {
+        scheduleReload();
+        return;
+      }
+      setEquipment((items) => {
+        if (event.op === 'delete' && !filters.include_deleted) {
+          return items.filter((item) => item.equipment_id !== event.equipment_id);
+        }
+        return items.map((item) =>
+          item.equipment_id === event.equipment_id
+            ? { ...item, ...pickListFields(item, event.fields) }
+            : item
+        );
+      });
+    };
+    const unsubscribe = subscribeToEquipmentChanges(handleChange);
+    return () => {
+      unsubscribe();
+      if (reloadTimer.current) clearTimeout(reloadTimer.current);
+    };
+  }, [loadEquipment, filters.include_deleted]);
+
   // Select equipment to view details
   const handleSelect = async (equipmentId: string) => {
     try {
@@ -219,12 +265,19 @@ export default function InventoryPage() {
   };
 
   // Import from CSV
-  const handleImport = async (file: File): Promise<ImportResult> => {
-    const result = await importEquipment(file);
+  const handleImport = async (
+    file: File,
+    onProgress: (status: ImportJobStatus) => void
+  ): Promise<ImportResult> => {
+    const result = await importEquipment(file, onProgress);
     loadEquipment();
     return result;
   };
 
+  const handleCancelImport = async (jobId: string) => {
+    await cancelImportJob(jobId);
+  };
+
   // Open reassignment modal
   const handleOpenReassign = async (equipmentId: string) => {
     try {
@@ -374,6 +427,7 @@ export default function InventoryPage() {
       {showImport && (
         <ImportModal
           onImport={handleImport}
+          onCancelImport={handleCancelImport}
           onClose={() => setShowImport(false)}
         />
       )}
@@ -10,7 +10,15 @@ import type {
   EquipmentUpdate,
   EquipmentFilters,
   AssignmentHistoryItem,
+  HistoryBatchResult,
+  AssignmentPeriod,
+  EquipmentChanges,
+  EquipmentChangeEvent,
   ImportResult,
+  ImportJobStatus,
+  ExportFormat,
+  ExportCompression,
+  FleetStats,
   ApiError,
 } from '../types/equipment';
 
@@ -65,18 +73,67 @@ function buildQueryString(filters: EquipmentFilters): string {
   if (filters.sort_by) params.append('sort_by', filters.sort_by);
   if (filters.sort_order) params.append('sort_order', filters.sort_order);
   if (filters.include_deleted) params.append('include_deleted', 'true');
+  if (filters.view?.length) params.append('view', filters.view.join(','));
+  if (filters.fields?.length) params.append('fields', filters.fields.join(','));
 
   const queryString = params.toString();
   return queryString ? `?${queryString}` : '';
 }
 
+/**
+ * Columnar list layout: field names once, an array of values per field.
+ */
+const COLUMNS_MEDIA_TYPE = 'application/vnd.equipment.columns+json';
+
+interface ColumnarList {
+  count: number;
+  columns: Record<string, unknown[]>;
+}
+
+/**
+ * Expand a columnar list back into one object per item.
+ */
+function fromColumns<T>(list: ColumnarList): T[] {
+  const entries = Object.entries(list.columns);
+  return Array.from({ length: list.count }, (_, index) =>
+    Object.fromEntries(entries.map(([field, values]) => [field, values[index]])) as T
+  );
+}
+
 // Equipment API methods
 
 export async function listEquipment(
   filters: EquipmentFilters = {}
 ): Promise<EquipmentListItem[]> {
   const query = buildQueryString(filters);
-  return fetchApi<EquipmentListItem[]>(`/computers${query}`);
+  // Columnar lists are about a third of the size of an array of objects
+  const list = await fetchApi<ColumnarList>(`/computers${query}`, {
+    headers: { Accept: COLUMNS_MEDIA_TYPE },
+  });
+  return fromColumns<EquipmentListItem>(list);
+}
+
+/**
+ * Full-text search on the server, best matches first.
+ */
+export async function searchEquipment(
+  query: string,
+  limit = 50,
+  offset = 0
+): Promise<EquipmentListItem[]> {
+  const params = new URLSearchParams({
+    q: query,
+    limit: limit.toString(),
+    offset: offset.toString(),
+  });
+  return fetchApi<EquipmentListItem[]>(`/computers/search?${params.toString()}`);
+}
+
+/**
+ * Fleet counts and total cost by status, type, location and usage type.
+ */
+export async function getFleetStats(): Promise<FleetStats> {
+  return fetchApi<FleetStats>('/computers/stats');
 }
 
 export async function getEquipment(identifier: string): Promise<Equipment> {
@@ -122,6 +179,66 @@ export async function getEquipmentHistory(
   );
 }
 
+export async function getEquipmentHistoryBatch(
+  identifiers: string[]
+): Promise<HistoryBatchResult> {
+  return fetchApi<HistoryBatchResult>('/computers/history', {
+    method: 'POST',
+    body: JSON.stringify({ identifiers }),
+  });
+}
+
+export async function getEquipmentChanges(
+  since?: string | null,
+  limit?: number
+): Promise<EquipmentChanges> {
+  const params = new URLSearchParams();
+  if (since) params.set('since', since);
+  if (limit) params.set('limit', String(limit));
+  const query = params.toString();
+  return fetchApi<EquipmentChanges>(`/computers/changes${query ? `?${query}` : ''}`);
+}
+
+/**
+ * Subscribe to live change events. The browser reconnects on its own,
+ * resuming after the last event it received. Returns an unsubscribe function.
+ */
+export function subscribeToEquipmentChanges(
+  onChange: (event: EquipmentChangeEvent) => void
+): () => void {
+  const source = new EventSource(`${API_BASE_URL}/computers/stream`);
+  source.addEventListener('change', (message) => {
+    onChange(JSON.parse((message as MessageEvent<string>).data));
+  });
+  return () => source.close();
+}
+
+export async function getEquipmentAssignment(
+  identifier: string,
+  asOf?: string
+): Promise<AssignmentPeriod> {
+  const query = asOf ? `?as_of=${encodeURIComponent(asOf)}` : '';
+  return fetchApi<AssignmentPeriod>(
+    `/computers/${encodeURIComponent(identifier)}/assignment${query}`
+  );
+}
+
+// User API
+
+export async function getUserEquipment(
+  user: string,
+  asOf?: string
+): Promise<AssignmentPeriod[]> {
+  const query = asOf ? `?as_of=${encodeURIComponent(asOf)}` : '';
+  return fetchApi<AssignmentPeriod[]>(
+    `/users/${encodeURIComponent(user)}/equipment${query}`
+  );
+}
+
+export async function getUserHistory(user: string): Promise<AssignmentPeriod[]> {
+  return fetchApi<AssignmentPeriod[]>(`/users/${encodeURIComponent(user)}/history`);
+}
+
 // Admin API
 
 export async function listDeletedEquipment(): Promise<EquipmentListItem[]> {
@@ -130,13 +247,24 @@ export async function listDeletedEquipment(): Promise<EquipmentListItem[]> {
 
 // Import/Export API
 
-export async function exportEquipment(includeDeleted = false): Promise<void> {
-  const query = includeDeleted ? '?include_deleted=true' : '';
+export async function exportEquipment(
+  includeDeleted = false,
+  format: ExportFormat = 'csv',
+  compression?: ExportCompression
+): Promise<void> {
+  const params = new URLSearchParams();
+  if (includeDeleted) params.set('include_deleted', 'true');
+  if (format !== 'csv') params.set('format', format);
+  if (compression) params.set('compression', compression);
+  const query = params.toString() ? `?${params.toString()}` : '';
   const url = `${API_BASE_URL}/computers/export${query}`;
 
   const response = await fetch(url);
   if (!response.ok) {
-    throw new Error('Export failed');
+    const error: ApiError = await response.json().catch(() => ({
+      detail: 'Export failed',
+    }));
+    throw new Error(error.detail);
   }
 
   // Trigger download
@@ -156,11 +284,11 @@ export async function exportEquipment(includeDeleted = false): Promise<void> {
   window.URL.revokeObjectURL(downloadUrl);
 }
 
-export async function importEquipment(file: File): Promise<ImportResult> {
+export async function submitImportJob(file: File): Promise<ImportJobStatus> {
   const formData = new FormData();
   formData.append('file', file);
 
-  const response = await fetch(`${API_BASE_URL}/computers/import`, {
+  const response = await fetch(`${API_BASE_URL}/computers/import/jobs`, {
     method: 'POST',
     body: formData,
   });
@@ -174,3 +302,42 @@ export async function importEquipment(file: File): Promise<ImportResult> {
 
   return response.json();
 }
+
+export async function getImportJob(jobId: string): Promise<ImportJobStatus> {
+  return fetchApi<ImportJobStatus>(`/computers/import/jobs/${encodeURIComponent(jobId)}`);
+}
+
+export async function cancelImportJob(jobId: string): Promise<ImportJobStatus> {
+  return fetchApi<ImportJobStatus>(
+    `/computers/import/jobs/${encodeURIComponent(jobId)}/cancel`,
+    { method: 'POST' }
+  );
+}
+
+const IMPORT_POLL_INTERVAL_MS = 1000;
+
+/**
+ * Import a CSV file as a background job, polling until it finishes.
+ * onProgress receives every status seen along the way.
+ */
+export async function importEquipment(
+  file: File,
+  onProgress?: (status: ImportJobStatus) => void
+): Promise<ImportResult> {
+  let status = await submitImportJob(file);
+  onProgress?.(status);
+  while (status.status === 'queued' || status.status === 'running') {
+    await new Promise((resolve) => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+    status = await getImportJob(status.job_id);
+    onProgress?.(status);
+  }
+
+  // A job stopped part way returns what it imported before stopping
+  if (status.status === 'cancelled' && !status.result) {
+    throw new Error('Import was stopped before it started');
+  }
+  if (status.status === 'failed' || !status.result) {
+    throw new Error(status.error || 'Import failed');
+  }
+  return status.result;
+}
@@ -1,3 +1,5 @@
+import type { ViewGroupKey } from './viewGroups';
+
 // Equipment types matching OpenAPI schemas
 
 export type EquipmentType = 'PC' | 'Monitor' | 'Scanner' | 'Printer';
@@ -46,6 +48,9 @@ export interface EquipmentListItem {
   assignment_date: string | null;
   usage_type: UsageType | null;
   ip_address: string | null;
+
+  // Present only when listed with include=history
+  assignment_history?: AssignmentHistoryItem[];
 }
 
 // Full equipment record
@@ -175,6 +180,50 @@ export interface AssignmentHistoryItem {
   created_at: string;
 }
 
+// Batch assignment history (POST /computers/history)
+export interface EquipmentHistory {
+  identifier: string;
+  equipment_id: string;
+  history: AssignmentHistoryItem[];
+}
+
+export interface HistoryBatchResult {
+  items: EquipmentHistory[];
+  not_found: string[];
+}
+
+// A period during which equipment was assigned (end_date null while current)
+export interface AssignmentPeriod {
+  equipment_id: string;
+  user: string | null;
+  usage_type: UsageType | null;
+  equipment_name: string | null;
+  start_date: string | null;
+  end_date: string | null;
+}
+
+// Changes feed (GET /computers/changes); deleted records are tombstones
+export interface EquipmentChange extends Equipment {
+  change_seq: number;
+}
+
+export interface EquipmentChanges {
+  items: EquipmentChange[];
+  cursor: string | null;
+  has_more: boolean;
+}
+
+// Live change event (GET /computers/stream); fields holds the new values
+export type ChangeOp = 'create' | 'update' | 'delete' | 'restore';
+
+export interface EquipmentChangeEvent {
+  op: ChangeOp;
+  id: number;
+  equipment_id: string;
+  change_seq: number;
+  fields: Partial<Equipment>;
+}
+
 // Import result
 export interface ImportResult {
   total_rows: number;
@@ -185,12 +234,53 @@ export interface ImportResult {
   errors: ImportError[];
 }
 
+// Export file formats (GET /computers/export); arrow and parquet need pyarrow on the server
+export type ExportFormat = 'csv' | 'ndjson' | 'arrow' | 'parquet';
+export type ExportCompression = 'gzip' | 'zstd';
+
+// Background import job (POST /computers/import/jobs)
+export type ImportJobState = 'queued' | 'running' | 'completed' | 'failed' | 'cancelled';
+
+export interface ImportJobStatus {
+  job_id: string;
+  status: ImportJobState;
+  filename: string;
+  submitted_at: string;
+  started_at: string | null;
+  finished_at: string | null;
+  rows_parsed: number;
+  rows_to_import: number | null;
+  rows_imported: number;
+  created: number;
+  updated: number;
+  restored: number;
+  failed: number;
+  error: string | null;
+  result: ImportResult | null;
+}
+
 export interface ImportError {
   row: number;
   serial_number: string;
   error: string;
 }
 
+// Fleet statistics (GET /computers/stats); costs are decimal strings
+export interface StatsGroup {
+  value: string | null;
+  count: number;
+  total_cost: string;
+}
+
+export interface FleetStats {
+  total: number;
+  total_cost: string;
+  by_status: StatsGroup[];
+  by_equipment_type: StatsGroup[];
+  by_location: StatsGroup[];
+  by_usage_type: StatsGroup[];
+}
+
 // API Error
 export interface ApiError {
   detail: string;
@@ -209,4 +299,7 @@ export interface EquipmentFilters {
   sort_by?: 'equipment_id' | 'equipment_name' | 'model' | 'primary_user' | 'status' | 'overall_rating' | 'created_at' | 'computer_subtype' | 'manufacturer' | 'location' | 'cpu_model' | 'ram' | 'storage' | 'operating_system' | 'serial_number' | 'cpu_score' | 'score_2d' | 'score_3d' | 'memory_score' | 'disk_score' | 'assignment_date' | 'usage_type';
   sort_order?: 'asc' | 'desc';
   include_deleted?: boolean;
+  // Sparse fieldsets: view groups and/or extra fields to return
+  view?: ViewGroupKey[];
+  fields?: string[];
 }